@@ -23,10 +23,14 @@ CREATE TABLE IF NOT EXISTS memories (
 );
 
 CREATE INDEX IF NOT EXISTS idx_memories_layer ON memories(layer);
-CREATE INDEX IF NOT EXISTS idx_memories_kind ON memories(kind);
 CREATE INDEX IF NOT EXISTS idx_memories_updated_at ON memories(updated_at);
 CREATE INDEX IF NOT EXISTS idx_memories_importance ON memories(importance_score);
 CREATE INDEX IF NOT EXISTS idx_memories_reuse_count ON memories(reuse_count);
+CREATE INDEX IF NOT EXISTS idx_memories_project_layer_updated ON memories(json_extract(scope_json, '$.project_id'), layer, updated_at);
+CREATE INDEX IF NOT EXISTS idx_memories_decay_due ON memories(layer, COALESCE(json_extract(integrity_json, '$.last_decay_at'), updated_at));
+CREATE INDEX IF NOT EXISTS idx_memories_session_updated ON memories(json_extract(source_json, '$.session_id'), updated_at);
+CREATE INDEX IF NOT EXISTS idx_memories_project_updated ON memories(json_extract(scope_json, '$.project_id'), updated_at);
+CREATE INDEX IF NOT EXISTS idx_memories_kind_updated ON memories(kind, updated_at);
 
 CREATE TABLE IF NOT EXISTS memory_refs (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -88,7 +92,7 @@ BEGIN
   DELETE FROM memories_fts WHERE id = old.id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF id, summary, body_text, tags_json ON memories
 BEGIN
   DELETE FROM memories_fts WHERE id = old.id;
   INSERT INTO memories_fts(id, summary, body_text, tags)
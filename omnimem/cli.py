@@ -34,6 +34,7 @@ from .adapters import (
 from .core import (
     KIND_SET,
     LAYER_SET,
+    _sqlite_connect,
     analyze_profile_drift,
     apply_decay,
     build_user_profile,
@@ -2518,7 +2519,7 @@ def _doctor_sync_history(paths, *, limit: int = 24) -> dict[str, Any]:
         "last_event_age_s": None,
     }
     try:
-        with sqlite3.connect(paths.sqlite_path, timeout=1.2) as conn:
+        with _sqlite_connect(paths.sqlite_path, timeout=1.2) as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 """
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from contextlib import contextmanager, nullcontext
+import atexit
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+import functools
 import hashlib
+import heapq
+import itertools
 import json
 import math
 import mimetypes
 import os
 import re
+import shutil
 import sqlite3
 import subprocess
 import tempfile
@@ -23,6 +29,11 @@ try:  # pragma: no cover
 except Exception:  # pragma: no cover
     fcntl = None  # type: ignore[assignment]
 
+try:  # pragma: no cover
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 SCHEMA_VERSION = "0.1.0"
 LAYER_SET = {"instant", "short", "long", "archive"}
 # Keep KIND_SET permissive for internal instrumentation (e.g. retrieve traces) while
@@ -42,6 +53,8 @@ EVENT_SET = {
     "memory.feedback",
     "memory.prune",
 }
+# Session ids used by OmniMem itself; never compressed or distilled as user sessions.
+INTERNAL_SESSION_IDS = frozenset({"system", "webui-session"})
 
 
 @dataclass
@@ -52,8 +65,29 @@ class MemoryPaths:
     sqlite_path: Path
 
 
+# (epoch second, formatted) for utc_now; replaced as a whole tuple so readers never see a torn pair.
+_UTC_NOW_CACHE: tuple[int, datetime, str] = (-1, datetime.min, "")
+
+
+def _utc_now_second() -> tuple[datetime, str]:
+    """Current UTC time truncated to the second, as (datetime, ISO string).
+
+    Second resolution, so bursts of writes/events within one second share one datetime and one
+    formatted string (same value as `datetime.now(timezone.utc).replace(microsecond=0)`).
+    """
+    global _UTC_NOW_CACHE
+    sec = int(time.time())
+    cached = _UTC_NOW_CACHE
+    if cached[0] == sec:
+        return cached[1], cached[2]
+    dt = datetime.fromtimestamp(sec, timezone.utc)
+    text = dt.isoformat()
+    _UTC_NOW_CACHE = (sec, dt, text)
+    return dt, text
+
+
 def utc_now() -> str:
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    return _utc_now_second()[1]
 
 
 def make_id() -> str:
@@ -64,8 +98,43 @@ def sha256_text(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+# Thread count for overlapping many small markdown reads (verify, reindex).
+_MARKDOWN_IO_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+
+def _read_text_fast(path: Path | str) -> str:
+    """`path.read_text(encoding="utf-8")` without the buffered text-IO stack.
+
+    Markdown bodies are small and read whole, so a raw unbuffered read plus one decode avoids
+    the BufferedReader/TextIOWrapper setup; newlines are translated as universal-newline mode does.
+    """
+    with open(path, "rb", buffering=0) as f:
+        text = f.read().decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 import threading
 
+_REPO_LOCK_POLL_MIN_S = 0.005
+_REPO_LOCK_POLL_MAX_S = 0.12
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_absolute_path_key(raw: str) -> str:
+    return str(Path(raw).expanduser().resolve())
+
+
+def _resolved_path_key(raw: str) -> str:
+    # expanduser().resolve() walks the path with a syscall per component; homes don't move
+    # under a running process, so resolve each absolute spelling once. Relative paths depend
+    # on the cwd and are resolved every time.
+    if os.path.isabs(raw) or raw.startswith("~"):
+        return _resolve_absolute_path_key(raw)
+    return str(Path(raw).resolve())
+
+
 @contextmanager
 def repo_lock(root: Path, timeout_s: float = 12.0):
     """
@@ -74,43 +143,49 @@ def repo_lock(root: Path, timeout_s: float = 12.0):
     This prevents two processes (WebUI/daemon/CLI) from mutating JSONL/SQLite/Git state
     concurrently, which is a common source of sync conflicts and corrupted indexes.
     """
-    key = str(root.expanduser().resolve())
-    
+    key = _resolved_path_key(str(root))
+
     # Thread-local storage to track reentrancy per-thread
-    if not hasattr(_REPO_LOCK_LOCAL, "depths"):
-        _REPO_LOCK_LOCAL.depths = {}
-        
-    depth = _REPO_LOCK_LOCAL.depths.get(key, 0)
+    depths = getattr(_REPO_LOCK_LOCAL, "depths", None)
+    if depths is None:
+        depths = _REPO_LOCK_LOCAL.depths = {}
+
+    depth = depths.get(key, 0)
     if depth > 0:
-        _REPO_LOCK_LOCAL.depths[key] = depth + 1
+        depths[key] = depth + 1
         try:
             yield
         finally:
-            _REPO_LOCK_LOCAL.depths[key] = max(0, _REPO_LOCK_LOCAL.depths.get(key, 1) - 1)
+            depths[key] = depth
         return
-        
+
     lock_path = root / "runtime" / "omnimem.lock"
     lock_path.parent.mkdir(parents=True, exist_ok=True)
     if fcntl is None:  # pragma: no cover
         yield
         return
     fd = os.open(str(lock_path), os.O_CREAT | os.O_RDWR, 0o600)
-    start = time.time()
+    deadline = time.monotonic() + timeout_s
+    # Short holds (one event append) are the common case: start polling at a few ms and back off
+    # to the old 120ms step, instead of always paying a full step after a brief contention.
+    delay = _REPO_LOCK_POLL_MIN_S
     try:
-        _REPO_LOCK_LOCAL.depths[key] = 1
+        depths[key] = 1
         while True:
             try:
                 fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
                 break
             except BlockingIOError:
-                if (time.time() - start) >= timeout_s:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     raise TimeoutError(
                         f"omnimem home is busy (lock: {lock_path}); stop other omnimem processes (webui/daemon) and retry"
                     )
-                time.sleep(0.12)
+                time.sleep(min(delay, remaining))
+                delay = min(_REPO_LOCK_POLL_MAX_S, delay * 2)
         yield
     finally:
-        _REPO_LOCK_LOCAL.depths[key] = 0
+        depths[key] = 0
         try:
             fcntl.flock(fd, fcntl.LOCK_UN)
         finally:
@@ -124,19 +199,124 @@ _SYSTEM_MEMORY_READY: set[str] = set()
 # Per-home guard for best-effort auto-weave triggers.
 _AUTO_WEAVE_LAST_TRY: dict[str, float] = {}
 
+def _tune_conn(conn: sqlite3.Connection) -> None:
+    # The database runs in WAL mode (set once by ensure_storage and persisted in the file), where
+    # synchronous=NORMAL stays crash-safe and drops the fsync from every commit.
+    try:
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        # Scans like apply_decay touch every row; a larger page cache plus mmap reads pages
+        # straight from the OS cache instead of a pread per page. Both grow lazily.
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA mmap_size = 268435456")
+    except sqlite3.DatabaseError:
+        pass
+
+
+class _CachedConn:
+    __slots__ = ("conn", "ident", "pid", "busy")
+
+    def __init__(self, conn: sqlite3.Connection, ident: tuple[int, int]) -> None:
+        self.conn = conn
+        self.ident = ident
+        self.pid = os.getpid()
+        self.busy = False
+
+
+# Per-thread tuned connections, keyed by database path (most recently used last).
+_SQLITE_CONN_LOCAL = threading.local()
+_SQLITE_CONN_CACHE_MAX = 4
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def close_cached_connections() -> None:
+    """Close this thread's cached SQLite connections (e.g. before deleting a database file)."""
+    cache = getattr(_SQLITE_CONN_LOCAL, "conns", None)
+    if not cache:
+        return
+    for entry in cache.values():
+        if not entry.busy:
+            _close_quietly(entry.conn)
+    cache.clear()
+
+
+atexit.register(close_cached_connections)
+
+
 @contextmanager
 def _sqlite_connect(db_path: Path, *, timeout: float | None = None):
-    kwargs: dict[str, Any] = {}
-    if timeout is not None:
-        kwargs["timeout"] = float(timeout)
-    conn = sqlite3.connect(db_path, **kwargs)
+    """Yield a tuned connection, reusing this thread's cached one for `db_path` when possible.
+
+    A reused connection is reset to what a fresh one would look like (no row factory, foreign
+    keys off, requested busy timeout) and uncommitted work is rolled back on exit, matching the
+    old close-per-call behaviour. Nested use, a replaced database file or a fork fall back to a
+    fresh connection.
+    """
+    cache: dict[str, _CachedConn] | None = getattr(_SQLITE_CONN_LOCAL, "conns", None)
+    if cache is None:
+        cache = _SQLITE_CONN_LOCAL.conns = {}
+    key = str(db_path)
+    wait_s = 5.0 if timeout is None else float(timeout)
+    ident = _db_file_identity(db_path)
+    entry = cache.get(key)
+    nested = entry is not None and entry.busy
+    if nested:
+        entry = None
+    elif entry is not None:
+        cache.pop(key)
+        if entry.ident != ident or entry.pid != os.getpid():
+            if entry.pid == os.getpid():
+                _close_quietly(entry.conn)
+            entry = None
+        else:
+            try:
+                entry.conn.row_factory = None
+                entry.conn.execute(f"PRAGMA busy_timeout = {int(wait_s * 1000)}")
+                entry.conn.execute("PRAGMA foreign_keys = OFF")
+            except sqlite3.Error:
+                _close_quietly(entry.conn)
+                entry = None
+            else:
+                cache[key] = entry
+    if entry is not None:
+        conn = entry.conn
+    else:
+        conn = sqlite3.connect(db_path, timeout=wait_s, cached_statements=256)
+        _tune_conn(conn)
+        if ident is not None and not nested:
+            entry = _CachedConn(conn, ident)
+            cache[key] = entry
+            for old_key in [k for k, v in cache.items() if not v.busy and k != key][: max(0, len(cache) - _SQLITE_CONN_CACHE_MAX)]:
+                _close_quietly(cache.pop(old_key).conn)
+    if entry is None:
+        try:
+            yield conn
+        finally:
+            _close_quietly(conn)
+        return
+    entry.busy = True
+    ok = False
     try:
         yield conn
+        ok = True
     finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
+        entry.busy = False
+        if ok:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                ok = False
+        if not ok:
+            if cache.get(key) is entry:
+                cache.pop(key, None)
+            _close_quietly(conn)
 
 
 def parse_list_csv(raw: str | None) -> list[str]:
@@ -181,16 +361,22 @@ def load_config(path: Path | None) -> dict[str, Any]:
     }
 
 
+def _resolved_path(raw: str) -> Path:
+    # Expand "~" up front so a changed HOME is a different cache key, then resolve through the
+    # per-spelling cache behind _resolved_path_key.
+    return Path(_resolved_path_key(os.path.expanduser(raw)))
+
+
 def default_config_path() -> Path:
     env_home = os.getenv("OMNIMEM_HOME")
     if env_home:
-        return Path(env_home).expanduser().resolve() / "omnimem.config.json"
-    return Path.home().expanduser().resolve() / ".omnimem" / "omnimem.config.json"
+        return _resolved_path(env_home) / "omnimem.config.json"
+    return _resolved_path(os.fspath(Path.home())) / ".omnimem" / "omnimem.config.json"
 
 
 def load_config_with_path(path: Path | None) -> tuple[dict[str, Any], Path]:
     if path:
-        p = path.expanduser().resolve()
+        p = _resolved_path(os.fspath(path))
         if p.exists():
             return json.loads(p.read_text(encoding="utf-8")), p
         return load_config(None), p
@@ -201,11 +387,8 @@ def load_config_with_path(path: Path | None) -> tuple[dict[str, Any], Path]:
     return load_config(None), p
 
 
-def save_config(path: Path, cfg: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    data = (json.dumps(cfg, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
-
-    # Atomic write: avoid leaving a truncated config if the process is interrupted mid-write.
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write-fsync-rename: readers (and sync clients) see the old file or the new one, never a torn one."""
     tmp_fp: Path | None = None
     try:
         with tempfile.NamedTemporaryFile(
@@ -221,11 +404,12 @@ def save_config(path: Path, cfg: dict[str, Any]) -> None:
                 os.fsync(f.fileno())
             except Exception:
                 pass
-        os.replace(str(tmp_fp), str(path))
         try:
-            os.chmod(str(path), 0o600)
-        except Exception:
+            # Temp files are created 0600; keep the replaced file's permissions.
+            os.chmod(str(tmp_fp), os.stat(path).st_mode & 0o7777)
+        except OSError:
             pass
+        os.replace(str(tmp_fp), str(path))
     finally:
         if tmp_fp is not None and tmp_fp.exists():
             try:
@@ -234,17 +418,29 @@ def save_config(path: Path, cfg: dict[str, Any]) -> None:
                 pass
 
 
+def save_config(path: Path, cfg: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = (json.dumps(cfg, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+    # Atomic write: avoid leaving a truncated config if the process is interrupted mid-write.
+    _write_bytes_atomic(path, data)
+    try:
+        os.chmod(str(path), 0o600)
+    except Exception:
+        pass
+
+
 def resolve_paths(cfg: dict[str, Any]) -> MemoryPaths:
-    home = Path(cfg.get("home", Path.cwd())).expanduser().resolve()
+    home = _resolved_path(os.fspath(cfg.get("home", Path.cwd())))
     storage = cfg.get("storage", {})
-    markdown_root = Path(storage.get("markdown", home / "data" / "markdown")).expanduser().resolve()
-    jsonl_root = Path(storage.get("jsonl", home / "data" / "jsonl")).expanduser().resolve()
-    sqlite_path = Path(storage.get("sqlite", home / "data" / "omnimem.db")).expanduser().resolve()
+    markdown_root = _resolved_path(os.fspath(storage.get("markdown", home / "data" / "markdown")))
+    jsonl_root = _resolved_path(os.fspath(storage.get("jsonl", home / "data" / "jsonl")))
+    sqlite_path = _resolved_path(os.fspath(storage.get("sqlite", home / "data" / "omnimem.db")))
     return MemoryPaths(root=home, markdown_root=markdown_root, jsonl_root=jsonl_root, sqlite_path=sqlite_path)
 
 
 def _cache_key_for_paths(paths: MemoryPaths) -> str:
-    return str(paths.sqlite_path.expanduser().resolve())
+    return _resolved_path_key(str(paths.sqlite_path))
 
 
 def _schema_sql_text(schema_sql_path: Path) -> str:
@@ -257,13 +453,28 @@ def _schema_sql_text(schema_sql_path: Path) -> str:
     return txt
 
 
-_STORAGE_READY: set[str] = set()
+# Verified databases, keyed like `_cache_key_for_paths` and mapped to the (st_dev, st_ino) seen
+# at verification time, so a deleted or swapped-in database file is re-checked.
+_STORAGE_READY: dict[str, tuple[int, int]] = {}
+
+
+def _db_file_identity(db_path: Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
 
 def ensure_storage(paths: MemoryPaths, schema_sql_path: Path) -> None:
     key = _cache_key_for_paths(paths)
-    if key in _STORAGE_READY:
-        return
-        
+    ready = _STORAGE_READY.get(key)
+    if ready is not None:
+        if ready == _db_file_identity(paths.sqlite_path):
+            return
+        _STORAGE_READY.pop(key, None)
+        _SYSTEM_MEMORY_READY.discard(key)
+
     for layer in sorted(LAYER_SET):
         (paths.markdown_root / layer).mkdir(parents=True, exist_ok=True)
     paths.jsonl_root.mkdir(parents=True, exist_ok=True)
@@ -312,10 +523,14 @@ def ensure_storage(paths: MemoryPaths, schema_sql_path: Path) -> None:
         except sqlite3.OperationalError:
             pass
         _maybe_migrate_memories_table(conn)
+        _maybe_narrow_fts_update_trigger(conn)
         _maybe_repair_fk_targets(conn)
         _maybe_create_memory_links_table(conn)
-    
-    _STORAGE_READY.add(key)
+        _maybe_create_memory_query_indexes(conn)
+
+    ident = _db_file_identity(paths.sqlite_path)
+    if ident is not None:
+        _STORAGE_READY[key] = ident
 
 
 def _maybe_create_memory_links_table(conn: sqlite3.Connection) -> None:
@@ -346,6 +561,78 @@ def _maybe_create_memory_links_table(conn: sqlite3.Connection) -> None:
     )
 
 
+# Query-shaped indexes added after the original schema; kept in sync with db/schema.sql.
+# Expression indexes (not generated columns) so existing databases need no table rebuild; queries
+# must spell the expression exactly the same way for the planner to use them.
+_MEMORY_QUERY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_memories_project_layer_updated"
+    " ON memories(json_extract(scope_json, '$.project_id'), layer, updated_at)",
+    # apply_decay's "due" test reads last_decay_at out of the index instead of parsing JSON per row.
+    "CREATE INDEX IF NOT EXISTS idx_memories_decay_due"
+    " ON memories(layer, COALESCE(json_extract(integrity_json, '$.last_decay_at'), updated_at))",
+    "CREATE INDEX IF NOT EXISTS idx_memories_session_updated"
+    " ON memories(json_extract(source_json, '$.session_id'), updated_at)",
+    # "Newest N for a project / of a kind" (brief, checkpoints) walk these in order and stop at the
+    # LIMIT. idx_memories_project_layer_updated cannot: with layer unconstrained between project and
+    # updated_at its rows come out per layer, leaving a temp B-tree sort. (kind, updated_at) also
+    # serves plain kind filters, replacing the old idx_memories_kind.
+    "CREATE INDEX IF NOT EXISTS idx_memories_project_updated"
+    " ON memories(json_extract(scope_json, '$.project_id'), updated_at)",
+    "CREATE INDEX IF NOT EXISTS idx_memories_kind_updated ON memories(kind, updated_at)",
+)
+
+
+def _scope_filter_sql(project_id: str, session_id: str, *, alias: str = "") -> tuple[str, list[Any]]:
+    """Return `AND ...` clauses (and args) for optional project/session filters.
+
+    Filters are only emitted when set, instead of `(expr = ? OR ? = '')`: the OR form makes the
+    planner evaluate json_extract on every row and hides the expression indexes above.
+    """
+    sql = ""
+    args: list[Any] = []
+    if project_id:
+        sql += f" AND json_extract({alias}scope_json, '$.project_id') = ?"
+        args.append(project_id)
+    if session_id:
+        sql += f" AND json_extract({alias}source_json, '$.session_id') = ?"
+        args.append(session_id)
+    return sql, args
+
+
+# Only the indexed columns re-sync FTS. Score/layer/integrity updates (reuse bumps, decay,
+# promotions) used to rewrite the FTS row, each time via a full scan on the UNINDEXED id.
+_MEMORIES_AU_TRIGGER_SQL = """
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF id, summary, body_text, tags_json ON memories
+BEGIN
+  DELETE FROM memories_fts WHERE id = old.id;
+  INSERT INTO memories_fts(id, summary, body_text, tags)
+  VALUES (new.id, new.summary, new.body_text, new.tags_json);
+END;
+"""
+
+
+def _maybe_narrow_fts_update_trigger(conn: sqlite3.Connection) -> None:
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'memories_au'").fetchone()
+    if not row or "AFTER UPDATE OF" in " ".join(str(row[0] or "").upper().split()):
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DROP TRIGGER IF EXISTS memories_au")
+        conn.execute(_MEMORIES_AU_TRIGGER_SQL)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _maybe_create_memory_query_indexes(conn: sqlite3.Connection) -> None:
+    for ddl in _MEMORY_QUERY_INDEXES:
+        conn.execute(ddl)
+    # Superseded by idx_memories_kind_updated (same leading column); one less index per write.
+    conn.execute("DROP INDEX IF EXISTS idx_memories_kind")
+    conn.commit()
+
+
 def _memories_table_sql(conn: sqlite3.Connection) -> str:
     row = conn.execute(
         "SELECT sql FROM sqlite_master WHERE type='table' AND name='memories'"
@@ -457,6 +744,12 @@ def _rebuild_memories_table(conn: sqlite3.Connection) -> None:
     kinds = ", ".join([f"'{k}'" for k in sorted(KIND_SET)])
     layers = ", ".join([f"'{l}'" for l in sorted(LAYER_SET)])
     conn.execute("PRAGMA foreign_keys = OFF")
+    # One-shot bulk copy: under WAL, synchronous=NORMAL skips the fsync at commit yet stays safe
+    # across OS crashes and power loss (OFF would not). Any crash mid-way rolls back to the intact
+    # old table, or at worst loses the copy's commit, and the migration runs again on the next
+    # ensure_storage.
+    prev_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+    conn.execute("PRAGMA synchronous = NORMAL")
     conn.execute("BEGIN")
     try:
         conn.execute("DROP TRIGGER IF EXISTS memories_ai")
@@ -506,10 +799,11 @@ def _rebuild_memories_table(conn: sqlite3.Connection) -> None:
         conn.execute("DROP TABLE memories_old")
 
         conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_layer ON memories(layer)")
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_kind ON memories(kind)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_updated_at ON memories(updated_at)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_importance ON memories(importance_score)")
         conn.execute("CREATE INDEX IF NOT EXISTS idx_memories_reuse_count ON memories(reuse_count)")
+        for ddl in _MEMORY_QUERY_INDEXES:
+            conn.execute(ddl)
 
         conn.execute(
             """
@@ -528,16 +822,7 @@ def _rebuild_memories_table(conn: sqlite3.Connection) -> None:
             END;
             """
         )
-        conn.execute(
-            """
-            CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories
-            BEGIN
-              DELETE FROM memories_fts WHERE id = old.id;
-              INSERT INTO memories_fts(id, summary, body_text, tags)
-              VALUES (new.id, new.summary, new.body_text, new.tags_json);
-            END;
-            """
-        )
+        conn.execute(_MEMORIES_AU_TRIGGER_SQL)
         # Rebuild FTS table to be safe.
         conn.execute("DELETE FROM memories_fts")
         conn.execute(
@@ -548,6 +833,7 @@ def _rebuild_memories_table(conn: sqlite3.Connection) -> None:
         conn.execute("ROLLBACK")
         raise
     finally:
+        conn.execute(f"PRAGMA synchronous = {int(prev_sync)}")
         conn.execute("PRAGMA foreign_keys = ON")
 
 
@@ -559,46 +845,50 @@ def ensure_system_memory(paths: MemoryPaths, schema_sql_path: Path) -> str:
     ensure_storage(paths, schema_sql_path)
     rel_path = "archive/system/system000.md"
     md_path = paths.markdown_root / rel_path
+    body: str | None = None
     if not md_path.exists():
         md_path.parent.mkdir(parents=True, exist_ok=True)
         body = "# system\n\nreserved memory for system audit events\n"
         md_path.write_text(body, encoding="utf-8")
-    else:
-        body = md_path.read_text(encoding="utf-8")
 
     with _sqlite_connect(paths.sqlite_path) as conn:
         conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute(
-            """
-            INSERT OR IGNORE INTO memories(
-              id, schema_version, created_at, updated_at, layer, kind, summary, body_md_path, body_text,
-              tags_json, importance_score, confidence_score, stability_score, reuse_count, volatility_score,
-              cred_refs_json, source_json, scope_json, integrity_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                system_id,
-                SCHEMA_VERSION,
-                utc_now(),
-                utc_now(),
-                "archive",
-                "summary",
-                "system",
-                rel_path,
-                body,
-                "[]",
-                1.0,
-                1.0,
-                1.0,
-                0,
-                0.0,
-                "[]",
-                '{"tool":"system","session_id":"system"}',
-                '{"project_id":"global","workspace":""}',
-                json.dumps({"content_sha256": sha256_text(body), "envelope_version": 1}),
-            ),
-        )
-        conn.commit()
+        # The row normally exists already; skip reading/hashing the body for a no-op INSERT OR IGNORE.
+        if conn.execute("SELECT 1 FROM memories WHERE id = ?", (system_id,)).fetchone() is None:
+            if body is None:
+                body = md_path.read_text(encoding="utf-8")
+            now = utc_now()
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO memories(
+                  id, schema_version, created_at, updated_at, layer, kind, summary, body_md_path, body_text,
+                  tags_json, importance_score, confidence_score, stability_score, reuse_count, volatility_score,
+                  cred_refs_json, source_json, scope_json, integrity_json
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    system_id,
+                    SCHEMA_VERSION,
+                    now,
+                    now,
+                    "archive",
+                    "summary",
+                    "system",
+                    rel_path,
+                    body,
+                    "[]",
+                    1.0,
+                    1.0,
+                    1.0,
+                    0,
+                    0.0,
+                    "[]",
+                    '{"tool":"system","session_id":"system"}',
+                    '{"project_id":"global","workspace":""}',
+                    _json_dumps({"content_sha256": sha256_text(body), "envelope_version": 1}),
+                ),
+            )
+            conn.commit()
 
     _SYSTEM_MEMORY_READY.add(key)
     return system_id
@@ -619,50 +909,111 @@ def write_markdown(paths: MemoryPaths, rel_path: str, content: str) -> Path:
     return full
 
 
-def append_jsonl(path: Path, obj: dict[str, Any]) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON for SQLite payload columns; uses orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_loads(text: str | bytes) -> Any:
+    """Parse JSON with orjson when installed, deferring to `json` for what orjson rejects (e.g. NaN)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+_JSONL_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+
+
+def append_jsonl(path: Path, obj: dict[str, Any] | str) -> None:
+    # One O_APPEND write per record: no text/buffer layers, and the whole line lands at EOF even
+    # when another process appends concurrently. The file is not kept open, since git checkouts
+    # and rebases replace it under us. A str is an already-encoded record (see _encode_event).
+    text = obj if isinstance(obj, str) else json.dumps(obj, ensure_ascii=False)
+    data = (text + "\n").encode("utf-8")
+    fd = os.open(str(path), _JSONL_APPEND_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
 
+_SQL_INSERT_MEMORY = """
+    INSERT OR REPLACE INTO memories(
+      id, schema_version, created_at, updated_at, layer, kind, summary, body_md_path, body_text,
+      tags_json, importance_score, confidence_score, stability_score, reuse_count, volatility_score,
+      cred_refs_json, source_json, scope_json, integrity_json
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_INSERT_MEMORY_REF = "INSERT INTO memory_refs(memory_id, ref_type, target, note) VALUES (?, ?, ?, ?)"
 
-def insert_memory(conn: sqlite3.Connection, envelope: dict[str, Any], body_text: str) -> None:
+
+def _memory_row(envelope: dict[str, Any], body_text: str) -> tuple[Any, ...]:
     sig = envelope["signals"]
-    conn.execute(
-        """
-        INSERT OR REPLACE INTO memories(
-          id, schema_version, created_at, updated_at, layer, kind, summary, body_md_path, body_text,
-          tags_json, importance_score, confidence_score, stability_score, reuse_count, volatility_score,
-          cred_refs_json, source_json, scope_json, integrity_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            envelope["id"],
-            envelope["schema_version"],
-            envelope["created_at"],
-            envelope["updated_at"],
-            envelope["layer"],
-            envelope["kind"],
-            envelope["summary"],
-            envelope["body_md_path"],
-            body_text,
-            json.dumps(envelope["tags"], ensure_ascii=False),
-            float(sig["importance_score"]),
-            float(sig["confidence_score"]),
-            float(sig["stability_score"]),
-            int(sig["reuse_count"]),
-            float(sig["volatility_score"]),
-            json.dumps(envelope["cred_refs"], ensure_ascii=False),
-            json.dumps(envelope["source"], ensure_ascii=False),
-            json.dumps(envelope["scope"], ensure_ascii=False),
-            json.dumps(envelope["integrity"], ensure_ascii=False),
-        ),
+    return (
+        envelope["id"],
+        envelope["schema_version"],
+        envelope["created_at"],
+        envelope["updated_at"],
+        envelope["layer"],
+        envelope["kind"],
+        envelope["summary"],
+        envelope["body_md_path"],
+        body_text,
+        _json_dumps(envelope["tags"]),
+        float(sig["importance_score"]),
+        float(sig["confidence_score"]),
+        float(sig["stability_score"]),
+        int(sig["reuse_count"]),
+        float(sig["volatility_score"]),
+        _json_dumps(envelope["cred_refs"]),
+        _json_dumps(envelope["source"]),
+        _json_dumps(envelope["scope"]),
+        _json_dumps(envelope["integrity"]),
     )
 
-    conn.execute("DELETE FROM memory_refs WHERE memory_id = ?", (envelope["id"],))
-    for ref in envelope["refs"]:
-        conn.execute(
-            "INSERT INTO memory_refs(memory_id, ref_type, target, note) VALUES (?, ?, ?, ?)",
-            (envelope["id"], ref.get("type", "memory"), ref.get("target", ""), ref.get("note")),
-        )
+
+def _memory_ref_rows(envelope: dict[str, Any]) -> list[tuple[Any, ...]]:
+    return [(envelope["id"], ref.get("type", "memory"), ref.get("target", ""), ref.get("note")) for ref in envelope["refs"]]
+
+
+def insert_memory(conn: sqlite3.Connection, envelope: dict[str, Any], body_text: str, *, fresh: bool = False) -> None:
+    """Insert (or replace) a memory row and its refs.
+
+    `fresh=True` is for callers that know no row with this id exists (a reset reindex seeing the
+    id for the first time): the DELETEs that clear a previous version are skipped.
+    """
+    row = _memory_row(envelope, body_text)
+    if not fresh:
+        # An explicit DELETE (unlike REPLACE's implicit one) fires memories_ad, so re-inserting an
+        # existing id does not leave a stale memories_fts row behind.
+        conn.execute("DELETE FROM memories WHERE id = ?", (envelope["id"],))
+    conn.execute(_SQL_INSERT_MEMORY, row)
+
+    if not fresh:
+        conn.execute("DELETE FROM memory_refs WHERE memory_id = ?", (envelope["id"],))
+    if envelope["refs"]:
+        conn.executemany(_SQL_INSERT_MEMORY_REF, _memory_ref_rows(envelope))
+
+
+_SQL_UPDATE_REUSE = """
+    UPDATE memories
+    SET reuse_count = reuse_count + ?,
+        stability_score = min(1.0, stability_score + (0.03 * ?)),
+        confidence_score = min(1.0, confidence_score + (0.01 * ?)),
+        volatility_score = max(0.0, volatility_score - (0.02 * ?)),
+        updated_at = ?
+    WHERE id = ?
+"""
 
 
 def bump_reuse_counts(
@@ -689,22 +1040,13 @@ def bump_reuse_counts(
     try:
         with _sqlite_connect(paths.sqlite_path) as conn:
             conn.execute("PRAGMA foreign_keys = ON")
-            n = 0
-            for mid in ids:
-                # Reuse should gently increase stability/confidence and reduce volatility.
-                cur = conn.execute(
-                    """
-                    UPDATE memories
-                    SET reuse_count = reuse_count + ?,
-                        stability_score = min(1.0, stability_score + (0.03 * ?)),
-                        confidence_score = min(1.0, confidence_score + (0.01 * ?)),
-                        volatility_score = max(0.0, volatility_score - (0.02 * ?)),
-                        updated_at = ?
-                    WHERE id = ?
-                    """,
-                    (delta, delta, delta, delta, when, mid),
-                )
-                n += int(cur.rowcount or 0)
+            # Reuse should gently increase stability/confidence and reduce volatility.
+            # One prepared statement for the whole batch; duplicate ids still bump once per mention.
+            cur = conn.executemany(
+                _SQL_UPDATE_REUSE,
+                [(delta, delta, delta, delta, when, mid) for mid in ids],
+            )
+            n = int(cur.rowcount or 0)
             conn.commit()
         log_system_event(
             paths,
@@ -717,6 +1059,20 @@ def bump_reuse_counts(
         return {"ok": False, "error": str(exc), "updated": 0}
 
 
+# last_decay_at is stamped by JSON1 in place; malformed or non-object integrity restarts from {}.
+_SQL_UPDATE_DECAY = """
+    UPDATE memories
+    SET confidence_score = ?,
+        stability_score = ?,
+        volatility_score = ?,
+        integrity_json = json_set(
+            CASE WHEN json_valid(integrity_json) AND json_type(integrity_json) = 'object'
+                 THEN integrity_json ELSE '{}' END,
+            '$.last_decay_at', ?)
+    WHERE id = ?
+"""
+
+
 def apply_decay(
     *,
     paths: MemoryPaths,
@@ -724,7 +1080,7 @@ def apply_decay(
     days: int = 14,
     limit: int = 200,
     project_id: str = "",
-    layers: list[str] | None = None,
+    layers: list[str] | tuple[str, ...] | None = None,
     dry_run: bool = True,
     tool: str = "omnimem",
     session_id: str = "system",
@@ -746,94 +1102,78 @@ def apply_decay(
             raise ValueError(f"invalid layer: {l}")
 
     now = datetime.now(timezone.utc).replace(microsecond=0)
+    now_iso = now.isoformat()
     cutoff = (now - timedelta(days=days)).isoformat()
     placeholders = ",".join(["?"] * len(layers))
+    # A plain equality (no "OR ? = ''") lets the project/layer/updated_at index drive the scan.
+    project_sql = "AND json_extract(scope_json, '$.project_id') = ?" if project_id else ""
+    project_params = (project_id,) if project_id else ()
 
     with _sqlite_connect(paths.sqlite_path) as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             f"""
-            SELECT id, layer, kind, summary, updated_at,
-                   importance_score, confidence_score, stability_score, reuse_count, volatility_score,
-                   integrity_json,
-                   COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id
+            SELECT id, layer, kind, updated_at,
+                   confidence_score, stability_score, reuse_count, volatility_score,
+                   COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id,
+                   (CAST(strftime('%s', ?) AS INTEGER) - CAST(strftime('%s', updated_at) AS INTEGER)) / 86400
+                     AS age_days
             FROM memories
             WHERE layer IN ({placeholders})
-              AND (json_extract(scope_json, '$.project_id') = ? OR ? = '')
+              {project_sql}
               AND COALESCE(json_extract(integrity_json, '$.last_decay_at'), updated_at) < ?
             ORDER BY updated_at ASC
             LIMIT ?
             """,
-            (*layers, project_id, project_id, cutoff, limit),
+            (now_iso, *layers, *project_params, cutoff, limit),
         ).fetchall()
 
         changes: list[dict[str, Any]] = []
+        updates: list[tuple[Any, ...]] = []
         moved = 0
         for r in rows:
-            try:
-                updated_at = datetime.fromisoformat(str(r["updated_at"]))
-            except Exception:
+            # Whole days since updated_at, computed by SQLite; NULL when the timestamp is unparseable.
+            if r["age_days"] is None:
                 continue
-            age_days = max(0, int((now - updated_at).total_seconds() // 86400))
-            if age_days < days:
+            age_days = max(0, int(r["age_days"]))
+            # At exactly `days` the age factor is 0 and nothing would change.
+            if age_days <= days:
                 continue
             reuse = int(r["reuse_count"] or 0)
             # Decay strength increases with age, but dampens with reuse.
-            age_factor = min(1.0, (age_days - days) / 30.0)
-            damp = 1.0 / (1.0 + (reuse / 6.0))
-            strength = age_factor * damp
-
-            old = {
-                "confidence": float(r["confidence_score"]),
-                "stability": float(r["stability_score"]),
-                "volatility": float(r["volatility_score"]),
-            }
-            new_conf = max(0.0, min(1.0, old["confidence"] - (0.02 * strength)))
-            new_stab = max(0.0, min(1.0, old["stability"] - (0.03 * strength)))
-            new_vol = max(0.0, min(1.0, old["volatility"] + (0.02 * strength)))
+            strength = min(1.0, (age_days - days) / 30.0) / (1.0 + (reuse / 6.0))
 
-            if (
-                abs(new_conf - old["confidence"]) < 1e-6
-                and abs(new_stab - old["stability"]) < 1e-6
-                and abs(new_vol - old["volatility"]) < 1e-6
-            ):
+            conf = float(r["confidence_score"])
+            stab = float(r["stability_score"])
+            vol = float(r["volatility_score"])
+            new_conf = max(0.0, min(1.0, conf - (0.02 * strength)))
+            new_stab = max(0.0, min(1.0, stab - (0.03 * strength)))
+            new_vol = max(0.0, min(1.0, vol + (0.02 * strength)))
+
+            if abs(new_conf - conf) < 1e-6 and abs(new_stab - stab) < 1e-6 and abs(new_vol - vol) < 1e-6:
                 continue
 
-            integrity = {}
-            try:
-                integrity = json.loads(r["integrity_json"] or "{}")
-            except Exception:
-                integrity = {}
-            integrity["last_decay_at"] = now.isoformat()
-
-            change = {
-                "id": r["id"],
-                "layer": r["layer"],
-                "kind": r["kind"],
-                "project_id": r["project_id"],
-                "updated_at": r["updated_at"],
-                "age_days": age_days,
-                "reuse_count": reuse,
-                "old": old,
-                "new": {"confidence": new_conf, "stability": new_stab, "volatility": new_vol},
-            }
-            changes.append(change)
+            changes.append(
+                {
+                    "id": r["id"],
+                    "layer": r["layer"],
+                    "kind": r["kind"],
+                    "project_id": r["project_id"],
+                    "updated_at": r["updated_at"],
+                    "age_days": age_days,
+                    "reuse_count": reuse,
+                    "old": {"confidence": conf, "stability": stab, "volatility": vol},
+                    "new": {"confidence": new_conf, "stability": new_stab, "volatility": new_vol},
+                }
+            )
 
             if not dry_run:
-                conn.execute(
-                    """
-                    UPDATE memories
-                    SET confidence_score = ?,
-                        stability_score = ?,
-                        volatility_score = ?,
-                        integrity_json = ?
-                    WHERE id = ?
-                    """,
-                    (new_conf, new_stab, new_vol, json.dumps(integrity, ensure_ascii=False), r["id"]),
-                )
-                moved += 1
+                updates.append((new_conf, new_stab, new_vol, now_iso, r["id"]))
 
         if not dry_run:
+            if updates:
+                conn.executemany(_SQL_UPDATE_DECAY, updates)
+                moved = len(updates)
             conn.commit()
 
     if not dry_run and changes:
@@ -1092,7 +1432,7 @@ def infer_adaptive_governance_thresholds(
     fb_counts = {"positive": 0, "negative": 0, "forget": 0, "correct": 0}
     for r in fb_rows:
         try:
-            p = json.loads(r["payload_json"] or "{}")
+            p = _json_loads(r["payload_json"] or "{}")
         except Exception:
             p = {}
         k = str((p or {}).get("feedback", "")).strip().lower()
@@ -1446,7 +1786,7 @@ def compress_session_context(
         layer_counts[layer] = layer_counts.get(layer, 0) + 1
         kind_counts[kind] = kind_counts.get(kind, 0) + 1
         try:
-            tags = json.loads(x.get("tags_json") or "[]")
+            tags = _json_loads(x.get("tags_json") or "[]")
         except Exception:
             tags = []
         for t in tags[:10]:
@@ -1558,7 +1898,7 @@ def compress_hot_sessions(
             (project_id, project_id, max_sessions * 3),
         ).fetchall()
 
-    sessions = [str(r["sid"]) for r in rows if str(r["sid"]).strip() and str(r["sid"]) not in {"system", "webui-session"}][:max_sessions]
+    sessions = [str(r["sid"]) for r in rows if str(r["sid"]).strip() and str(r["sid"]) not in INTERNAL_SESSION_IDS][:max_sessions]
     items: list[dict[str, Any]] = []
     for sid in sessions:
         try:
@@ -1772,7 +2112,7 @@ def trigger_reflective_summaries(
         g["retrieved_sum"] += retrieved
         g["latest_at"] = max(str(g.get("latest_at") or ""), str(r["updated_at"] or ""))
         try:
-            src = json.loads(r["source_json"] or "{}")
+            src = _json_loads(r["source_json"] or "{}")
             sid = str((src or {}).get("session_id") or "").strip()
             if sid:
                 g["sessions"].add(sid)
@@ -1939,7 +2279,7 @@ def build_temporal_memory_tree(
             (cutoff, project_id, project_id, max_sessions * 2),
         ).fetchall()
 
-        sessions = [str(r["sid"]).strip() for r in srows if str(r["sid"]).strip() and str(r["sid"]) not in {"system", "webui-session"}][:max_sessions]
+        sessions = [str(r["sid"]).strip() for r in srows if str(r["sid"]).strip() and str(r["sid"]) not in INTERNAL_SESSION_IDS][:max_sessions]
         temporal_links: list[dict[str, Any]] = []
         distill_links: list[dict[str, Any]] = []
 
@@ -2009,10 +2349,8 @@ def build_temporal_memory_tree(
                 "distill_links": len(distill_links),
             }
 
-        made = 0
-        for lk in temporal_links + distill_links:
-            insert_link(conn, lk)
-            made += 1
+        insert_links(conn, temporal_links + distill_links)
+        made = len(temporal_links) + len(distill_links)
         conn.commit()
 
     try:
@@ -2306,7 +2644,7 @@ def enhance_memory_summaries(
             continue
         tags = []
         try:
-            tags = [str(t).strip() for t in (json.loads(r["tags_json"] or "[]") or []) if str(t).strip()]
+            tags = [str(t).strip() for t in (_json_loads(r["tags_json"] or "[]") or []) if str(t).strip()]
         except Exception:
             tags = []
         candidates.append({"id": str(r["id"]), "old_summary": old, "new_summary": new, "tags": tags, "body_text": str(r["body_text"] or "")})
@@ -2446,28 +2784,117 @@ def build_raptor_digest(
     return out
 
 
-def insert_event(conn: sqlite3.Connection, evt: dict[str, Any]) -> None:
-    conn.execute(
-        "INSERT OR REPLACE INTO memory_events(event_id, event_type, event_time, memory_id, payload_json) VALUES (?, ?, ?, ?, ?)",
-        (evt["event_id"], evt["event_type"], evt["event_time"], evt["memory_id"], json.dumps(evt["payload"], ensure_ascii=False)),
+_SQL_INSERT_EVENT = (
+    "INSERT OR REPLACE INTO memory_events(event_id, event_type, event_time, memory_id, payload_json) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def _event_row(evt: dict[str, Any]) -> tuple[Any, ...]:
+    return (evt["event_id"], evt["event_type"], evt["event_time"], evt["memory_id"], _json_dumps(evt["payload"]))
+
+
+def insert_event(conn: sqlite3.Connection, evt: dict[str, Any], *, payload_json: str | None = None) -> None:
+    row = _event_row(evt) if payload_json is None else (evt["event_id"], evt["event_type"], evt["event_time"], evt["memory_id"], payload_json)
+    conn.execute(_SQL_INSERT_EVENT, row)
+
+
+def _encode_event(evt: dict[str, Any]) -> tuple[str, str]:
+    """Return `(jsonl_record, payload_json)` while serializing the payload only once.
+
+    The record is byte-for-byte `json.dumps(evt, ensure_ascii=False)`; the payload (which carries
+    the whole envelope on writes) is spliced in rather than encoded again for memory_events.
+    """
+    payload_json = json.dumps(evt["payload"], ensure_ascii=False)
+    if next(reversed(evt)) != "payload":
+        return json.dumps(evt, ensure_ascii=False), payload_json
+    head = json.dumps({k: v for k, v in evt.items() if k != "payload"}, ensure_ascii=False)
+    prefix = head[:-1] + ", " if len(evt) > 1 else "{"
+    return f'{prefix}"payload": {payload_json}}}', payload_json
+
+
+def _insert_event_rows(conn: sqlite3.Connection, rows: list[tuple[Any, ...]]) -> int:
+    """Insert buffered event rows in order; return how many were rejected.
+
+    The batch runs as one executemany under a savepoint. If any row violates a constraint the
+    savepoint is rolled back and the batch replayed row by row, so one bad line skips only itself.
+    """
+    if not rows:
+        return 0
+    conn.execute("SAVEPOINT reindex_events")
+    try:
+        conn.executemany(_SQL_INSERT_EVENT, rows)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO reindex_events")
+    else:
+        conn.execute("RELEASE reindex_events")
+        return 0
+    conn.execute("RELEASE reindex_events")
+    rejected = 0
+    for row in rows:
+        try:
+            conn.execute(_SQL_INSERT_EVENT, row)
+        except sqlite3.Error:
+            rejected += 1
+    return rejected
+
+
+def _insert_memory_rows(conn: sqlite3.Connection, rows: list[tuple[tuple[Any, ...], list[tuple[Any, ...]]]]) -> list[int]:
+    """Insert buffered fresh (memory row, ref rows) pairs; return the positions that were rejected.
+
+    Same shape as _insert_event_rows: one executemany per table under a savepoint, and on any
+    constraint error a replay one memory at a time, each with its refs, so a bad envelope skips
+    only itself.
+    """
+    if not rows:
+        return []
+    conn.execute("SAVEPOINT reindex_memories")
+    try:
+        conn.executemany(_SQL_INSERT_MEMORY, [row for row, _ in rows])
+        conn.executemany(_SQL_INSERT_MEMORY_REF, [ref for _, refs in rows for ref in refs])
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO reindex_memories")
+    else:
+        conn.execute("RELEASE reindex_memories")
+        return []
+    conn.execute("RELEASE reindex_memories")
+    rejected: list[int] = []
+    for pos, (row, refs) in enumerate(rows):
+        conn.execute("SAVEPOINT reindex_memory")
+        try:
+            conn.execute(_SQL_INSERT_MEMORY, row)
+            if refs:
+                conn.executemany(_SQL_INSERT_MEMORY_REF, refs)
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO reindex_memory")
+            rejected.append(pos)
+        conn.execute("RELEASE reindex_memory")
+    return rejected
+
+
+_SQL_INSERT_LINK = """
+    INSERT OR REPLACE INTO memory_links(created_at, src_id, dst_id, link_type, weight, reason)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def _link_row(link: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        str(link.get("created_at") or utc_now()),
+        str(link.get("src_id") or ""),
+        str(link.get("dst_id") or ""),
+        str(link.get("link_type") or "similar"),
+        float(link.get("weight") or 0.5),
+        str(link.get("reason") or ""),
     )
 
 
 def insert_link(conn: sqlite3.Connection, link: dict[str, Any]) -> None:
-    conn.execute(
-        """
-        INSERT OR REPLACE INTO memory_links(created_at, src_id, dst_id, link_type, weight, reason)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (
-            str(link.get("created_at") or utc_now()),
-            str(link.get("src_id") or ""),
-            str(link.get("dst_id") or ""),
-            str(link.get("link_type") or "similar"),
-            float(link.get("weight") or 0.5),
-            str(link.get("reason") or ""),
-        ),
-    )
+    conn.execute(_SQL_INSERT_LINK, _link_row(link))
+
+
+def insert_links(conn: sqlite3.Connection, links: list[dict[str, Any]]) -> None:
+    """insert_link for a batch: one prepared statement bound once per edge."""
+    conn.executemany(_SQL_INSERT_LINK, [_link_row(link) for link in links])
 
 
 def log_system_event(
@@ -2492,99 +2919,327 @@ def log_system_event(
         }
         # Most events are portable and are stored in JSONL so a device can rebuild its index from Git.
         # Some operational events (notably sync) are device-local and create unnecessary Git churn/conflicts.
+        payload_json: str | None = None
         if portable:
-            append_jsonl(event_file_path(paths, datetime.now(timezone.utc)), evt)
+            record, payload_json = _encode_event(evt)
+            append_jsonl(event_file_path(paths, datetime.now(timezone.utc)), record)
         with _sqlite_connect(paths.sqlite_path) as conn:
             conn.execute("PRAGMA foreign_keys = ON")
             try:
-                insert_event(conn, evt)
+                insert_event(conn, evt, payload_json=payload_json)
             except sqlite3.IntegrityError:
                 # If system memory was externally reset/reindexed while process cache says "ready",
                 # recover once by recreating system memory and retrying this event.
                 _SYSTEM_MEMORY_READY.discard(key)
                 evt["memory_id"] = ensure_system_memory(paths, schema_sql_path)
-                insert_event(conn, evt)
+                insert_event(conn, evt, payload_json=payload_json)
             conn.commit()
 
 
-def reindex_from_jsonl(paths: MemoryPaths, schema_sql_path: Path, reset: bool = True) -> dict[str, Any]:
+def reindex_from_jsonl(paths: MemoryPaths, schema_sql_path: Path, reset: bool = True, *, log_event: bool = True) -> dict[str, Any]:
     ensure_storage(paths, schema_sql_path)
-    system_id = ensure_system_memory(paths, schema_sql_path)
     files = sorted(paths.jsonl_root.glob("events-*.jsonl"))
+    return _reindex_jsonl_files(paths, schema_sql_path, files, reset=reset, log_event=log_event)
+
+
+def _jsonl_unreferenced_bodies(files: list[Path], rels: set[str]) -> set[str]:
+    """Return the markdown paths in `rels` that no envelope in `files` names as its body.
+
+    A byte scan for the JSON-quoted `"body_md_path": "<rel>"` pair, streamed line by line and
+    stopping once every path is found; records are written by json.dumps, so the spelling is fixed.
+    """
+    needles = {json.dumps({"body_md_path": rel}, ensure_ascii=False)[1:-1].encode("utf-8"): rel for rel in rels}
+    for fp in files:
+        if not needles:
+            break
+        try:
+            with fp.open("rb") as f:
+                for line in f:
+                    if b'"body_md_path"' not in line:
+                        continue
+                    for needle in [n for n in needles if n in line]:
+                        del needles[needle]
+                    if not needles:
+                        break
+        except OSError:
+            continue
+    return set(needles.values())
+
+
+def reindex_from_jsonl_partial(paths: MemoryPaths, schema_sql_path: Path, only: list[str], *, log_event: bool = True) -> dict[str, Any]:
+    """Re-apply only the event files a pull touched, plus every later month.
+
+    `only` holds repo-relative paths (e.g. `sync_git(...)["changed_paths"]`). Replaying from the
+    earliest changed month onward keeps "last envelope wins" ordering intact without a reset.
+    Changed Markdown bodies are re-read by that replay when an event in it references them (a
+    memory written on another device brings both); a body no replayed event names, an events
+    file the pull deleted, or a path we cannot map falls back to the full reset reindex.
+    `log_event=False` skips the closing reindex event, leaving it to the caller.
+    """
+    ensure_storage(paths, schema_sql_path)
+    try:
+        jsonl_rel = paths.jsonl_root.resolve().relative_to(paths.root.resolve()).as_posix() + "/"
+        md_rel = paths.markdown_root.resolve().relative_to(paths.root.resolve()).as_posix() + "/"
+    except ValueError:
+        return reindex_from_jsonl(paths, schema_sql_path, reset=True, log_event=log_event)
+
+    changed_names: set[str] = set()
+    changed_md: set[str] = set()
+    for rel in only:
+        rel = str(rel).replace("\\", "/")
+        if rel.startswith(md_rel):
+            changed_md.add(rel[len(md_rel) :])
+        elif rel.startswith(jsonl_rel):
+            name = rel[len(jsonl_rel) :]
+            if "/" not in name and name.startswith("events-") and name.endswith(".jsonl"):
+                changed_names.add(name)
+
+    files = sorted(paths.jsonl_root.glob("events-*.jsonl"))
+    if not changed_names <= {fp.name for fp in files}:
+        # The pull deleted an events file: only a reset drops the rows it had indexed.
+        return reindex_from_jsonl(paths, schema_sql_path, reset=True, log_event=log_event)
+    first = next((i for i, fp in enumerate(files) if fp.name in changed_names), None)
+    if changed_md and (first is None or _jsonl_unreferenced_bodies(files[first:], changed_md)):
+        return reindex_from_jsonl(paths, schema_sql_path, reset=True, log_event=log_event)
+    if first is None:
+        return {
+            "ok": True,
+            "reset": False,
+            "partial": True,
+            "jsonl_files": 0,
+            "events_parsed": 0,
+            "memories_indexed": 0,
+            "events_skipped": 0,
+        }
+    out = _reindex_jsonl_files(paths, schema_sql_path, files[first:], reset=False, log_event=log_event)
+    out["partial"] = True
+    return out
+
+
+def _drop_memories_fts_triggers(conn: sqlite3.Connection) -> list[str]:
+    """Drop the memories -> memories_fts sync triggers, returning their DDL for re-creation."""
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'memories'"
+        " AND name IN ('memories_ai', 'memories_ad', 'memories_au') ORDER BY name"
+    ).fetchall()
+    for name, _ in rows:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    return [str(sql) for _, sql in rows if sql]
+
+
+_REINDEX_EVENT_BATCH = 5000
+# Lines parsed ahead per block; a block's markdown bodies are prefetched on worker threads once
+# it needs at least _REINDEX_PREFETCH_MIN distinct files.
+_REINDEX_BLOCK_LINES = 512
+_REINDEX_PREFETCH_MIN = 8
+
+
+def _read_markdown_body(md_root: str, rel: str) -> str | None:
+    """Read `md_root/rel`, or None if it does not exist.
+
+    Opening directly and catching the miss costs one syscall where exists() + open cost two, and
+    os.path.join on a pre-stringified root skips building a Path per record.
+    """
+    try:
+        return _read_text_fast(os.path.join(md_root, rel))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _block_markdown_rels(events: list[dict[str, Any]]) -> list[str]:
+    rels: dict[str, None] = {}
+    for evt in events:
+        payload = evt.get("payload")
+        env = payload.get("envelope") if isinstance(payload, dict) else None
+        if isinstance(env, dict) and evt.get("event_type") in EVENT_SET:
+            rel = env.get("body_md_path")
+            if rel and isinstance(rel, str):
+                rels[rel] = None
+    return list(rels)
+
+
+def _reindex_jsonl_files(
+    paths: MemoryPaths, schema_sql_path: Path, files: list[Path], *, reset: bool, log_event: bool = True
+) -> dict[str, Any]:
+    system_id = ensure_system_memory(paths, schema_sql_path)
     parsed_events = 0
     indexed_memories = 0
     skipped_events = 0
 
-    with _sqlite_connect(paths.sqlite_path) as conn:
+    pool: ThreadPoolExecutor | None = None
+    md_root = str(paths.markdown_root)
+    with _sqlite_connect(paths.sqlite_path) as conn, ExitStack() as stack:
         conn.execute("PRAGMA foreign_keys = ON")
+        # One write transaction for the whole replay: take the write lock up front instead of
+        # upgrading mid-way, and pay a single commit at the end.
+        conn.execute("BEGIN IMMEDIATE")
+        fts_triggers: list[str] = []
         if reset:
+            # memories_fts keeps its own content and its delete trigger matches on an UNINDEXED id
+            # (a full FTS scan per row), so bulk-load with the triggers off and refill FTS once.
+            # The DDL is part of this transaction: any failure rolls the triggers back in too.
+            fts_triggers = _drop_memories_fts_triggers(conn)
             conn.execute("DELETE FROM memory_events")
             conn.execute("DELETE FROM memory_refs")
             conn.execute("DELETE FROM memory_links")
             conn.execute("DELETE FROM memories WHERE id != ?", (system_id,))
-
-        for fp in files:
-            for line in fp.read_text(encoding="utf-8").splitlines():
-                if not line.strip():
-                    continue
-                parsed_events += 1
-                try:
-                    evt = json.loads(line)
-                except json.JSONDecodeError:
+            conn.execute("DELETE FROM memories_fts")
+
+        # Event rows are buffered and written with executemany. So are memories seen for the first
+        # time after a reset; a re-seen id stays per-row because it replaces its refs and cascades.
+        pending_events: list[tuple[Any, ...]] = []
+        pending_ids: set[str] = set()
+        # [memory row, ref rows, position in pending_events of the event that carried it or None]
+        pending_memories: list[list[Any]] = []
+
+        def flush_memories() -> None:
+            nonlocal indexed_memories, skipped_events
+            rejected = _insert_memory_rows(conn, [(row, refs) for row, refs, _ in pending_memories])
+            dropped: list[int] = []
+            for pos in rejected:
+                indexed_memories -= 1
+                event_pos = pending_memories[pos][2]
+                # A carrier event whose own row failed to build was already counted as skipped.
+                if event_pos is not None:
+                    dropped.append(event_pos)
                     skipped_events += 1
-                    continue
-
-                memory_id = evt.get("memory_id", system_id)
-                if evt.get("event_type") not in EVENT_SET:
-                    skipped_events += 1
-                    continue
-
-                payload = evt.get("payload", {})
-                env = payload.get("envelope")
-                if isinstance(env, dict):
-                    rel = env.get("body_md_path", "")
-                    body = ""
-                    if rel:
-                        mdp = paths.markdown_root / rel
-                        if mdp.exists():
-                            body = mdp.read_text(encoding="utf-8")
-                    try:
-                        insert_memory(conn, env, body)
-                        indexed_memories += 1
-                    except Exception:
-                        skipped_events += 1
-                        continue
-
-                # Keep foreign key intact for system-level events or legacy lines.
-                evt["memory_id"] = memory_id if memory_id else system_id
-                try:
-                    insert_event(conn, evt)
-                except Exception:
-                    skipped_events += 1
-                    continue
-
-                # Rebuild graph edges from portable events.
-                if evt.get("event_type") == "memory.link":
-                    try:
-                        src_id = str(payload.get("src_id") or "")
-                        dst_id = str(payload.get("dst_id") or "")
-                        if src_id and dst_id:
-                            insert_link(
-                                conn,
-                                {
-                                    "created_at": evt.get("event_time") or utc_now(),
-                                    "src_id": src_id,
-                                    "dst_id": dst_id,
-                                    "link_type": str(payload.get("link_type") or "similar"),
-                                    "weight": float(payload.get("weight") or 0.5),
-                                    "reason": str(payload.get("reason") or ""),
-                                },
-                            )
-                    except Exception:
-                        # Don't fail reindex if a link line is malformed.
-                        pass
-
-        conn.commit()
+            for event_pos in reversed(dropped):
+                del pending_events[event_pos]
+            pending_memories.clear()
+
+        def flush_all() -> None:
+            nonlocal skipped_events
+            flush_memories()
+            skipped_events += _insert_event_rows(conn, pending_events)
+            pending_events.clear()
+            pending_ids.clear()
+        # After a reset the table holds only the system memory, so an id's first envelope in the
+        # replay needs none of insert_memory's replace-time DELETEs.
+        replayed_ids: set[str] = {str(system_id)}
+        for fp in files:
+            # Stream raw lines split on b"\n" only: monthly files stay out of memory, nothing is
+            # decoded up front (the JSON parser takes UTF-8 bytes), and U+2028 and friends inside
+            # unescaped (ensure_ascii=False) strings don't split a record.
+            with fp.open("rb") as f:
+                while True:
+                    block = list(itertools.islice(f, _REINDEX_BLOCK_LINES))
+                    if not block:
+                        break
+                    events: list[dict[str, Any]] = []
+                    for line in block:
+                        if not line.strip():
+                            continue
+                        parsed_events += 1
+                        try:
+                            evt = _json_loads(line)
+                        except ValueError:
+                            # JSONDecodeError, or a line that is not valid UTF-8.
+                            skipped_events += 1
+                            continue
+                        if not isinstance(evt, dict):
+                            skipped_events += 1
+                            continue
+                        events.append(evt)
+
+                    # Read this block's markdown bodies on worker threads while SQLite works through it.
+                    rels = _block_markdown_rels(events)
+                    bodies: dict[str, Future[str]] = {}
+                    if len(rels) >= _REINDEX_PREFETCH_MIN:
+                        if pool is None:
+                            pool = stack.enter_context(ThreadPoolExecutor(max_workers=_MARKDOWN_IO_WORKERS))
+                        bodies = {rel: pool.submit(_read_markdown_body, md_root, rel) for rel in rels}
+
+                    for evt in events:
+                        memory_id = evt.get("memory_id", system_id)
+                        if evt.get("event_type") not in EVENT_SET:
+                            skipped_events += 1
+                            continue
+
+                        payload = evt.get("payload", {})
+                        env = payload.get("envelope")
+                        buffered: list[Any] | None = None
+                        if isinstance(env, dict):
+                            if str(env.get("id")) in pending_ids:
+                                # insert_memory's DELETE cascades to this memory's events, and a buffered
+                                # event must not see a memory that did not exist yet when it was read.
+                                flush_all()
+                            rel = env.get("body_md_path", "")
+                            body = ""
+                            if rel:
+                                fut = bodies.get(rel) if isinstance(rel, str) else None
+                                body = (fut.result() if fut is not None else _read_markdown_body(md_root, rel)) or ""
+                            mem_key = str(env.get("id"))
+                            fresh = reset and mem_key not in replayed_ids
+                            replayed_ids.add(mem_key)
+                            if fresh and evt.get("event_type") != "memory.link":
+                                try:
+                                    buffered = [_memory_row(env, body), _memory_ref_rows(env), None]
+                                except Exception:
+                                    skipped_events += 1
+                                    continue
+                                pending_memories.append(buffered)
+                                indexed_memories += 1
+                            else:
+                                flush_memories()
+                                try:
+                                    insert_memory(conn, env, body, fresh=fresh)
+                                    indexed_memories += 1
+                                except Exception:
+                                    skipped_events += 1
+                                    continue
+
+                        # Keep foreign key intact for system-level events or legacy lines.
+                        evt["memory_id"] = memory_id if memory_id else system_id
+                        if evt.get("event_type") == "memory.link":
+                            # The edge below is only rebuilt if its event lands, so write this one now.
+                            flush_all()
+                            try:
+                                insert_event(conn, evt)
+                            except Exception:
+                                skipped_events += 1
+                                continue
+                        else:
+                            try:
+                                pending_events.append(_event_row(evt))
+                            except Exception:
+                                skipped_events += 1
+                                continue
+                            if buffered is not None:
+                                buffered[2] = len(pending_events) - 1
+                            pending_ids.add(str(evt["memory_id"]))
+                            if len(pending_events) >= _REINDEX_EVENT_BATCH or len(pending_memories) >= _REINDEX_EVENT_BATCH:
+                                flush_all()
+
+                        # Rebuild graph edges from portable events.
+                        if evt.get("event_type") == "memory.link":
+                            try:
+                                src_id = str(payload.get("src_id") or "")
+                                dst_id = str(payload.get("dst_id") or "")
+                                if src_id and dst_id:
+                                    insert_link(
+                                        conn,
+                                        {
+                                            "created_at": evt.get("event_time") or utc_now(),
+                                            "src_id": src_id,
+                                            "dst_id": dst_id,
+                                            "link_type": str(payload.get("link_type") or "similar"),
+                                            "weight": float(payload.get("weight") or 0.5),
+                                            "reason": str(payload.get("reason") or ""),
+                                        },
+                                    )
+                            except Exception:
+                                # Don't fail reindex if a link line is malformed.
+                                pass
+
+        flush_all()
+
+        if fts_triggers:
+            conn.execute(
+                "INSERT INTO memories_fts(id, summary, body_text, tags) SELECT id, summary, body_text, tags_json FROM memories"
+            )
+            for ddl in fts_triggers:
+                conn.execute(ddl)
+        conn.commit()
 
     result = {
         "ok": True,
@@ -2594,7 +3249,8 @@ def reindex_from_jsonl(paths: MemoryPaths, schema_sql_path: Path, reset: bool =
         "memories_indexed": indexed_memories,
         "events_skipped": skipped_events,
     }
-    log_system_event(paths, schema_sql_path, "memory.update", {"action": "reindex", **result})
+    if log_event:
+        log_system_event(paths, schema_sql_path, "memory.update", {"action": "reindex", **result})
     return result
 
 
@@ -2692,8 +3348,7 @@ def write_memory(
 
     with repo_lock(paths.root, timeout_s=30.0):
         ensure_storage(paths, schema_sql_path)
-        when_dt = datetime.now(timezone.utc)
-        when_iso = when_dt.replace(microsecond=0).isoformat()
+        when_dt, when_iso = _utc_now_second()
         mem_id = make_id()
         rel_path = md_rel_path(layer, mem_id, when_dt)
         body_md = f"# {summary}\n\n{body.strip()}\n"
@@ -2737,12 +3392,13 @@ def write_memory(
             },
         }
 
-        append_jsonl(event_file_path(paths, when_dt), evt)
+        record, payload_json = _encode_event(evt)
+        append_jsonl(event_file_path(paths, when_dt), record)
 
         with _sqlite_connect(paths.sqlite_path) as conn:
             conn.execute("PRAGMA foreign_keys = ON")
             insert_memory(conn, env, body_md)
-            insert_event(conn, evt)
+            insert_event(conn, evt, payload_json=payload_json)
             conn.commit()
 
         return {"memory": env, "event": evt}
@@ -2775,8 +3431,7 @@ def move_memory_layer(
 
     with repo_lock(paths.root, timeout_s=30.0):
         ensure_storage(paths, schema_sql_path)
-        when_dt = datetime.now(timezone.utc)
-        when_iso = when_dt.replace(microsecond=0).isoformat()
+        when_dt, when_iso = _utc_now_second()
 
         with _sqlite_connect(paths.sqlite_path) as conn:
             conn.row_factory = sqlite3.Row
@@ -2803,12 +3458,18 @@ def move_memory_layer(
             if not old_md.exists():
                 raise FileNotFoundError(f"markdown not found: {old_rel}")
 
-            body_md = old_md.read_text(encoding="utf-8")
             new_rel = md_rel_path(new_layer, memory_id, when_dt)
             new_md = paths.markdown_root / new_rel
             new_md.parent.mkdir(parents=True, exist_ok=True)
-            new_md.write_text(body_md, encoding="utf-8")
-            old_md.unlink(missing_ok=True)
+            try:
+                # Same filesystem (the normal case under markdown_root): move the inode, copy nothing.
+                os.replace(old_md, new_md)
+            except OSError:
+                body_md = old_md.read_text(encoding="utf-8")
+                new_md.write_text(body_md, encoding="utf-8")
+                old_md.unlink(missing_ok=True)
+            else:
+                body_md = _read_text_fast(new_md)
 
             # Keep created_at stable; only update updated_at, layer, and path.
             conn.execute(
@@ -2821,10 +3482,10 @@ def move_memory_layer(
                 (memory_id,),
             ).fetchall()
 
-            tags = json.loads(row["tags_json"] or "[]")
-            cred_refs = json.loads(row["cred_refs_json"] or "[]")
-            scope = json.loads(row["scope_json"] or "{}")
-            integrity = json.loads(row["integrity_json"] or "{}")
+            tags = _json_loads(row["tags_json"] or "[]")
+            cred_refs = _json_loads(row["cred_refs_json"] or "[]")
+            scope = _json_loads(row["scope_json"] or "{}")
+            integrity = _json_loads(row["integrity_json"] or "{}")
             # Recompute hash after move to be defensive (content should be identical).
             integrity["content_sha256"] = sha256_text(body_md)
 
@@ -2872,8 +3533,9 @@ def move_memory_layer(
                 },
             }
 
-            append_jsonl(event_file_path(paths, when_dt), evt)
-            insert_event(conn, evt)
+            record, payload_json = _encode_event(evt)
+            append_jsonl(event_file_path(paths, when_dt), record)
+            insert_event(conn, evt, payload_json=payload_json)
             conn.commit()
 
     return {
@@ -2917,8 +3579,7 @@ def update_memory_content(
 
     with repo_lock(paths.root, timeout_s=30.0):
         ensure_storage(paths, schema_sql_path)
-        when_dt = datetime.now(timezone.utc)
-        when_iso = when_dt.replace(microsecond=0).isoformat()
+        when_dt, when_iso = _utc_now_second()
         summary = str(summary or "").strip()
         if not summary:
             raise ValueError("summary must be non-empty")
@@ -2947,10 +3608,22 @@ def update_memory_content(
                 raise FileNotFoundError(f"markdown not found: {rel}")
 
             body_md = f"# {summary}\n\n{body}\n"
-            md_path.write_text(body_md, encoding="utf-8")
+            integrity = _json_loads(row["integrity_json"] or "{}")
+            content_sha256 = sha256_text(body_md)
+            if (
+                event_type == "memory.update"
+                and summary == row["summary"]
+                and body_md == row["body_text"]
+                and content_sha256 == integrity.get("content_sha256")
+                and tags == _json_loads(row["tags_json"] or "[]")
+                and md_path.read_bytes() == body_md.encode("utf-8")
+            ):
+                # Idempotent retry: the row, the markdown file and the hash already match, so skip the
+                # rewrite, the UPDATE and the event append instead of bumping updated_at for nothing.
+                return {"ok": True, "memory_id": memory_id, "updated_at": str(row["updated_at"]), "body_md_path": rel, "changed": False}
 
-            integrity = json.loads(row["integrity_json"] or "{}")
-            integrity["content_sha256"] = sha256_text(body_md)
+            md_path.write_text(body_md, encoding="utf-8")
+            integrity["content_sha256"] = content_sha256
             integrity["last_edit_at"] = when_iso
 
             conn.execute(
@@ -2967,8 +3640,8 @@ def update_memory_content(
                     summary,
                     when_iso,
                     body_md,
-                    json.dumps(tags, ensure_ascii=False),
-                    json.dumps(integrity, ensure_ascii=False),
+                    _json_dumps(tags),
+                    _json_dumps(integrity),
                     memory_id,
                 ),
             )
@@ -2978,9 +3651,9 @@ def update_memory_content(
                 (memory_id,),
             ).fetchall()
 
-            cred_refs = json.loads(row["cred_refs_json"] or "[]")
-            scope = json.loads(row["scope_json"] or "{}")
-            source = json.loads(row["source_json"] or "{}")
+            cred_refs = _json_loads(row["cred_refs_json"] or "[]")
+            scope = _json_loads(row["scope_json"] or "{}")
+            source = _json_loads(row["source_json"] or "{}")
 
             env = {
                 "id": memory_id,
@@ -3020,11 +3693,12 @@ def update_memory_content(
                 },
             }
 
-            append_jsonl(event_file_path(paths, when_dt), evt)
-            insert_event(conn, evt)
+            record, payload_json = _encode_event(evt)
+            append_jsonl(event_file_path(paths, when_dt), record)
+            insert_event(conn, evt, payload_json=payload_json)
             conn.commit()
 
-        return {"ok": True, "memory_id": memory_id, "updated_at": when_iso, "body_md_path": rel}
+        return {"ok": True, "memory_id": memory_id, "updated_at": when_iso, "body_md_path": rel, "changed": True}
 
 
 def _normalize_core_block_name(name: str) -> str:
@@ -3274,7 +3948,7 @@ def list_core_blocks(
     items: list[dict[str, Any]] = []
     for r in rows:
         try:
-            tags = [str(t).strip() for t in (json.loads(r["tags_json"] or "[]") or []) if str(t).strip()]
+            tags = [str(t).strip() for t in (_json_loads(r["tags_json"] or "[]") or []) if str(t).strip()]
         except Exception:
             tags = []
         priority = _core_block_priority_from_tags(tags)
@@ -3338,7 +4012,7 @@ def get_core_block(
     if m:
         content = str(m.group(1) or "").rstrip()
     try:
-        tags = [str(t).strip() for t in (json.loads(row["tags_json"] or "[]") or []) if str(t).strip()]
+        tags = [str(t).strip() for t in (_json_loads(row["tags_json"] or "[]") or []) if str(t).strip()]
     except Exception:
         tags = []
     priority = _core_block_priority_from_tags(tags)
@@ -3548,7 +4222,7 @@ def suggest_core_block_merges(
     grouped: dict[str, list[dict[str, Any]]] = {}
     for r in rows:
         try:
-            tags = [str(t).strip() for t in (json.loads(r["tags_json"] or "[]") or []) if str(t).strip()]
+            tags = [str(t).strip() for t in (_json_loads(r["tags_json"] or "[]") or []) if str(t).strip()]
         except Exception:
             tags = []
         topic = _core_block_topic_from_tags(tags)
@@ -3751,8 +4425,7 @@ def apply_memory_feedback(
 
     with repo_lock(paths.root, timeout_s=30.0):
         ensure_storage(paths, schema_sql_path)
-        when_dt = datetime.now(timezone.utc)
-        when_iso = when_dt.replace(microsecond=0).isoformat()
+        when_dt, when_iso = _utc_now_second()
 
         with _sqlite_connect(paths.sqlite_path) as conn:
             conn.row_factory = sqlite3.Row
@@ -3776,7 +4449,7 @@ def apply_memory_feedback(
             body_plain = (m.group(1) if m else body_md).strip()
             tags = []
             try:
-                tags = [str(x).strip() for x in (json.loads(row["tags_json"] or "[]") or []) if str(x).strip()]
+                tags = [str(x).strip() for x in (_json_loads(row["tags_json"] or "[]") or []) if str(x).strip()]
             except Exception:
                 tags = []
 
@@ -3823,7 +4496,7 @@ def apply_memory_feedback(
             if md_path.exists():
                 md_path.write_text(body_new_md, encoding="utf-8")
 
-            integrity = json.loads(row["integrity_json"] or "{}")
+            integrity = _json_loads(row["integrity_json"] or "{}")
             integrity["content_sha256"] = sha256_text(body_new_md)
             integrity["last_feedback_at"] = when_iso
             integrity["last_feedback"] = fb
@@ -3844,12 +4517,12 @@ def apply_memory_feedback(
                 (
                     when_iso,
                     body_new_md,
-                    json.dumps(tags, ensure_ascii=False),
+                    _json_dumps(tags),
                     conf,
                     stab,
                     reuse,
                     vol,
-                    json.dumps(integrity, ensure_ascii=False),
+                    _json_dumps(integrity),
                     memory_id,
                 ),
             )
@@ -3858,9 +4531,9 @@ def apply_memory_feedback(
                 "SELECT ref_type, target, note FROM memory_refs WHERE memory_id = ? ORDER BY id",
                 (memory_id,),
             ).fetchall()
-            cred_refs = json.loads(row["cred_refs_json"] or "[]")
-            scope = json.loads(row["scope_json"] or "{}")
-            source = json.loads(row["source_json"] or "{}")
+            cred_refs = _json_loads(row["cred_refs_json"] or "[]")
+            scope = _json_loads(row["scope_json"] or "{}")
+            source = _json_loads(row["source_json"] or "{}")
             env = {
                 "id": memory_id,
                 "schema_version": str(row["schema_version"]),
@@ -3898,8 +4571,9 @@ def apply_memory_feedback(
                     "envelope": env,
                 },
             }
-            append_jsonl(event_file_path(paths, when_dt), evt)
-            insert_event(conn, evt)
+            record, payload_json = _encode_event(evt)
+            append_jsonl(event_file_path(paths, when_dt), record)
+            insert_event(conn, evt, payload_json=payload_json)
             conn.commit()
 
     return {
@@ -3944,37 +4618,44 @@ def find_memories(
     return list(res.get("items") or [])
 
 
-def _normalize_fts_query(raw: str) -> str:
-    s = str(raw or "").strip()
-    if not s:
-        return ""
-    # Replace punctuation (including dots in versions) with spaces so FTS doesn't error.
-    s = re.sub(r"[^\w\u4e00-\u9fff]+", " ", s, flags=re.UNICODE)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+# Word runs of a search query. CJK ideographs are already \w; the explicit range is kept for clarity.
+_QUERY_WORD_RE = re.compile(r"[\w]+|[\u4e00-\u9fff]+")
+_FTS_OPERATORS = frozenset({"AND", "OR", "NOT"})
 
 
-def _query_tokens(raw: str, *, max_tokens: int = 12) -> list[str]:
-    s = str(raw or "")
-    toks = re.findall(r"[\w]+|[\u4e00-\u9fff]+", s, flags=re.UNICODE)
+def _tokens_from_words(words: list[str], max_tokens: int) -> list[str]:
     out: list[str] = []
-    for t in toks:
-        tt = t.strip()
-        if not tt:
-            continue
-        if tt.upper() in {"AND", "OR", "NOT"}:
+    for t in words:
+        # Operators are 2-3 letters; skip the upper() copy for everything longer.
+        if len(t) <= 3 and t.upper() in _FTS_OPERATORS:
             continue
-        out.append(tt)
+        out.append(t)
         if len(out) >= max_tokens:
             break
     return out
 
 
+def _normalize_fts_query(raw: str) -> str:
+    # Replace punctuation (including dots in versions) with spaces so FTS doesn't error: the
+    # result is exactly the query's word runs joined by single spaces.
+    return " ".join(_QUERY_WORD_RE.findall(str(raw or "")))
+
+
+def _query_tokens(raw: str, *, max_tokens: int = 12) -> list[str]:
+    return _tokens_from_words(_QUERY_WORD_RE.findall(str(raw or "")), max_tokens)
+
+
+def _query_terms(raw: str, *, max_tokens: int = 12) -> tuple[list[str], str]:
+    """Return `(_query_tokens(raw), _normalize_fts_query(raw))` from a single regex scan."""
+    words = _QUERY_WORD_RE.findall(str(raw or ""))
+    return _tokens_from_words(words, max_tokens), " ".join(words)
+
+
 def _signals_from_row(d: dict[str, Any]) -> dict[str, Any]:
     raw_tags = d.pop("tags_json", None)
     if raw_tags is not None and "tags" not in d:
         try:
-            d["tags"] = json.loads(raw_tags or "[]")
+            d["tags"] = _json_loads(raw_tags or "[]")
         except Exception:
             d["tags"] = []
     d["signals"] = {
@@ -3987,6 +4668,34 @@ def _signals_from_row(d: dict[str, Any]) -> dict[str, Any]:
     return d
 
 
+def _item_from_row(r: sqlite3.Row) -> dict[str, Any]:
+    """`_signals_from_row(dict(r))` for find_memories_ex's fixed projection, built directly.
+
+    Columns: id, layer, kind, summary, updated_at, body_md_path, project_id, session_id, the five
+    signal scores, then fts_rank for FTS rows. Key order matches the dict(r)-and-pop version.
+    """
+    d: dict[str, Any] = {
+        "id": r[0],
+        "layer": r[1],
+        "kind": r[2],
+        "summary": r[3],
+        "updated_at": r[4],
+        "body_md_path": r[5],
+        "project_id": r[6],
+        "session_id": r[7],
+    }
+    if len(r) > 13:
+        d["fts_rank"] = r[13]
+    d["signals"] = {
+        "importance_score": float(r[8] or 0.0),
+        "confidence_score": float(r[9] or 0.0),
+        "stability_score": float(r[10] or 0.0),
+        "reuse_count": int(r[11] or 0),
+        "volatility_score": float(r[12] or 0.0),
+    }
+    return d
+
+
 def _parse_iso_dt(raw: str) -> datetime:
     s = str(raw or "").strip()
     if not s:
@@ -4143,26 +4852,10 @@ def _fts_rows(
     project_id: str,
     session_id: str,
 ) -> list[sqlite3.Row]:
-    if layer:
-        return conn.execute(
-            """
-            SELECT m.id, m.layer, m.kind, m.summary, m.updated_at, m.body_md_path,
-                   COALESCE(json_extract(m.scope_json, '$.project_id'), '') AS project_id,
-                   COALESCE(json_extract(m.source_json, '$.session_id'), '') AS session_id,
-                   m.importance_score, m.confidence_score, m.stability_score, m.reuse_count, m.volatility_score,
-                   bm25(memories_fts) AS fts_rank
-            FROM memories_fts f
-            JOIN memories m ON m.id = f.id
-            WHERE f.memories_fts MATCH ? AND m.layer = ?
-              AND (json_extract(m.scope_json, '$.project_id') = ? OR ? = '')
-              AND (COALESCE(json_extract(m.source_json, '$.session_id'), '') = ? OR ? = '')
-            ORDER BY bm25(memories_fts), m.updated_at DESC
-            LIMIT ?
-            """,
-            (match_query, layer, project_id, project_id, session_id, session_id, limit),
-        ).fetchall()
+    scope_sql, scope_args = _scope_filter_sql(project_id, session_id, alias="m.")
+    layer_sql = " AND m.layer = ?" if layer else ""
     return conn.execute(
-        """
+        f"""
         SELECT m.id, m.layer, m.kind, m.summary, m.updated_at, m.body_md_path,
                COALESCE(json_extract(m.scope_json, '$.project_id'), '') AS project_id,
                COALESCE(json_extract(m.source_json, '$.session_id'), '') AS session_id,
@@ -4170,16 +4863,35 @@ def _fts_rows(
                bm25(memories_fts) AS fts_rank
         FROM memories_fts f
         JOIN memories m ON m.id = f.id
-        WHERE f.memories_fts MATCH ?
-          AND (json_extract(m.scope_json, '$.project_id') = ? OR ? = '')
-          AND (COALESCE(json_extract(m.source_json, '$.session_id'), '') = ? OR ? = '')
+        WHERE f.memories_fts MATCH ?{layer_sql}{scope_sql}
         ORDER BY bm25(memories_fts), m.updated_at DESC
         LIMIT ?
         """,
-        (match_query, project_id, project_id, session_id, session_id, limit),
+        (match_query, *([layer] if layer else []), *scope_args, limit),
     ).fetchall()
 
 
+# LIKE folds case for ASCII letters only, so token subsumption must compare the same way.
+_LIKE_CASEFOLD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _like_tokens(tokens: list[str]) -> list[str]:
+    """Drop OR'd LIKE tokens that cannot change the match set.
+
+    Every row matching `%abcd%` also matches `%abc%`, so the longer token (and any duplicate)
+    only adds two more substring scans per row to the fallback's full-table pass.
+    """
+    folded = [t.translate(_LIKE_CASEFOLD) for t in tokens]
+    kept: list[str] = []
+    seen: set[str] = set()
+    for t, f in zip(tokens, folded):
+        if f in seen or any(o != f and o in f for o in folded):
+            continue
+        seen.add(f)
+        kept.append(t)
+    return kept
+
+
 def _like_rows(
     conn: sqlite3.Connection,
     *,
@@ -4193,22 +4905,21 @@ def _like_rows(
         return []
     clauses: list[str] = []
     args: list[Any] = []
-    for t in tokens[:12]:
+    for t in _like_tokens(tokens[:12]):
         clauses.append("(summary LIKE ? OR body_text LIKE ?)")
         pat = f"%{t}%"
         args.extend([pat, pat])
     where_tokens = " OR ".join(clauses)
+    scope_sql, scope_args = _scope_filter_sql(project_id, session_id)
     sql = f"""
         SELECT id, layer, kind, summary, updated_at, body_md_path,
                COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id,
                COALESCE(json_extract(source_json, '$.session_id'), '') AS session_id,
                importance_score, confidence_score, stability_score, reuse_count, volatility_score
         FROM memories
-        WHERE ({where_tokens})
-          AND (json_extract(scope_json, '$.project_id') = ? OR ? = '')
-          AND (COALESCE(json_extract(source_json, '$.session_id'), '') = ? OR ? = '')
+        WHERE ({where_tokens}){scope_sql}
     """
-    args.extend([project_id, project_id, session_id, session_id])
+    args.extend(scope_args)
     if layer:
         sql += " AND layer = ?"
         args.append(layer)
@@ -4259,37 +4970,22 @@ def find_memories_ex(
         conn.row_factory = sqlite3.Row
 
         if not query:
-            if layer:
-                rows = conn.execute(
-                    """
-                    SELECT id, layer, kind, summary, updated_at, body_md_path,
-                           COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id,
-                           COALESCE(json_extract(source_json, '$.session_id'), '') AS session_id,
-                           importance_score, confidence_score, stability_score, reuse_count, volatility_score
-                    FROM memories
-                    WHERE layer = ? AND (json_extract(scope_json, '$.project_id') = ? OR ? = '')
-                      AND (COALESCE(json_extract(source_json, '$.session_id'), '') = ? OR ? = '')
-                    ORDER BY updated_at DESC
-                    LIMIT ?
-                    """,
-                    (layer, project_id, project_id, session_id, session_id, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT id, layer, kind, summary, updated_at, body_md_path,
-                           COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id,
-                           COALESCE(json_extract(source_json, '$.session_id'), '') AS session_id,
-                           importance_score, confidence_score, stability_score, reuse_count, volatility_score
-                    FROM memories
-                    WHERE (json_extract(scope_json, '$.project_id') = ? OR ? = '')
-                      AND (COALESCE(json_extract(source_json, '$.session_id'), '') = ? OR ? = '')
-                    ORDER BY updated_at DESC
-                    LIMIT ?
-                    """,
-                    (project_id, project_id, session_id, session_id, limit),
-                ).fetchall()
-            items = [_signals_from_row(dict(r)) for r in rows]
+            scope_sql, scope_args = _scope_filter_sql(project_id, session_id)
+            layer_sql = " AND layer = ?" if layer else ""
+            rows = conn.execute(
+                f"""
+                SELECT id, layer, kind, summary, updated_at, body_md_path,
+                       COALESCE(json_extract(scope_json, '$.project_id'), '') AS project_id,
+                       COALESCE(json_extract(source_json, '$.session_id'), '') AS session_id,
+                       importance_score, confidence_score, stability_score, reuse_count, volatility_score
+                FROM memories
+                WHERE 1 = 1{layer_sql}{scope_sql}
+                ORDER BY updated_at DESC
+                LIMIT ?
+                """,
+                (*([layer] if layer else []), *scope_args, limit),
+            ).fetchall()
+            items = [_item_from_row(r) for r in rows]
             reranked = _attach_cognitive_retrieval(
                 items,
                 strategy="recent",
@@ -4330,7 +5026,7 @@ def find_memories_ex(
             sem_rows = conn.execute(sql, tuple(sem_ids)).fetchall()
             if sem_rows:
                 tried.append({"strategy": "semantic_vector", "query_used": query})
-                items = [_signals_from_row(dict(r)) for r in sem_rows]
+                items = [_item_from_row(r) for r in sem_rows]
                 # We map the results back through cognitive retrieval to ensure they match constraints
                 reranked = _attach_cognitive_retrieval(
                     items,
@@ -4355,8 +5051,7 @@ def find_memories_ex(
                         "profile": {"enabled": p_enabled, "terms": len(p_terms), "tags": len(p_tags), "weight": float(profile_weight)},
                     }
 
-        tokens = _query_tokens(query)
-        normalized = _normalize_fts_query(query)
+        tokens, normalized = _query_terms(query)
         candidates: list[tuple[str, str]] = [("fts_raw", query)]
         if normalized and normalized != query:
             candidates.append(("fts_normalized", normalized))
@@ -4366,17 +5061,20 @@ def find_memories_ex(
             if pref:
                 candidates.append(("fts_or_prefix", " OR ".join(pref)))
 
+        seen_queries: set[str] = set()
         for strat, q in candidates:
             qq = str(q or "").strip()
-            if not qq:
+            # A single-word query makes fts_or identical to fts_raw; don't run the same MATCH twice.
+            if not qq or qq in seen_queries:
                 continue
+            seen_queries.add(qq)
             tried.append({"strategy": strat, "query_used": qq})
             try:
                 rows = _fts_rows(conn, match_query=qq, layer=layer, limit=limit, project_id=project_id, session_id=session_id)
             except sqlite3.OperationalError:
                 continue
             if rows:
-                items = [_signals_from_row(dict(r)) for r in rows]
+                items = [_item_from_row(r) for r in rows]
                 reranked = _attach_cognitive_retrieval(
                     items,
                     strategy=strat,
@@ -4403,7 +5101,7 @@ def find_memories_ex(
         ltoks = tokens or _query_tokens(normalized)
         tried.append({"strategy": "like_fallback", "query_used": " OR ".join(ltoks)})
         rows2 = _like_rows(conn, tokens=ltoks, layer=layer, limit=limit, project_id=project_id, session_id=session_id)
-        items2 = [_signals_from_row(dict(r)) for r in rows2]
+        items2 = [_item_from_row(r) for r in rows2]
         reranked2 = _attach_cognitive_retrieval(
             items2,
             strategy="like_fallback",
@@ -4614,7 +5312,7 @@ def _profile_term_tag_counts(rows: list[sqlite3.Row]) -> tuple[dict[str, int], d
     tag_counts: dict[str, int] = {}
     for r in rows:
         try:
-            tags = [str(t).strip().lower() for t in (json.loads(r["tags_json"] or "[]") or []) if str(t).strip()]
+            tags = [str(t).strip().lower() for t in (_json_loads(r["tags_json"] or "[]") or []) if str(t).strip()]
         except Exception:
             tags = []
         for t in tags:
@@ -4678,7 +5376,7 @@ def build_user_profile(
         kind_counts[kind] = kind_counts.get(kind, 0) + 1
 
         try:
-            tags = [str(t).strip().lower() for t in (json.loads(r["tags_json"] or "[]") or []) if str(t).strip()]
+            tags = [str(t).strip().lower() for t in (_json_loads(r["tags_json"] or "[]") or []) if str(t).strip()]
         except Exception:
             tags = []
         for t in tags:
@@ -5169,7 +5867,7 @@ def weave_links(
                 for r in rows:
                     tags = []
                     try:
-                        tags = json.loads(r["tags_json"] or "[]")
+                        tags = _json_loads(r["tags_json"] or "[]")
                     except Exception:
                         tags = []
                     blob = " ".join(
@@ -5226,10 +5924,10 @@ def weave_links(
                     conn_w.row_factory = sqlite3.Row
                     conn_w.execute("PRAGMA foreign_keys = ON")
                     conn_w.execute("PRAGMA busy_timeout = 8000")
-                    made = 0
                     system_id = ensure_system_memory(paths, schema_sql_path)
+                    event_rows: list[tuple[Any, ...]] = []
+                    records: list[str] = []
                     for link in proposed:
-                        insert_link(conn_w, link)
                         evt = {
                             "event_id": make_id(),
                             "event_type": "memory.link",
@@ -5245,9 +5943,17 @@ def weave_links(
                         }
                         # By default links are derived/heuristic: keep them device-local to avoid Git churn.
                         if portable:
-                            append_jsonl(event_file_path(paths, datetime.now(timezone.utc)), evt)
-                        insert_event(conn_w, evt)
-                        made += 1
+                            record, payload_json = _encode_event(evt)
+                            records.append(record)
+                            event_rows.append((evt["event_id"], evt["event_type"], evt["event_time"], evt["memory_id"], payload_json))
+                        else:
+                            event_rows.append(_event_row(evt))
+                    insert_links(conn_w, proposed)
+                    conn_w.executemany(_SQL_INSERT_EVENT, event_rows)
+                    if records:
+                        # One O_APPEND write for the whole batch of records.
+                        append_jsonl(event_file_path(paths, datetime.now(timezone.utc)), "\n".join(records))
+                    made = len(proposed)
                     conn_w.commit()
                 return {
                     "ok": True,
@@ -5803,26 +6509,27 @@ def build_brief(paths: MemoryPaths, schema_sql_path: Path, project_id: str, limi
     ensure_storage(paths, schema_sql_path)
     with _sqlite_connect(paths.sqlite_path) as conn:
         conn.row_factory = sqlite3.Row
+        scope_sql, scope_args = _scope_filter_sql(project_id, "")
         recent = conn.execute(
-            """
+            f"""
             SELECT id, layer, kind, summary, updated_at, body_md_path
             FROM memories
-            WHERE json_extract(scope_json, '$.project_id') = ? OR ? = ''
+            WHERE 1 = 1{scope_sql}
             ORDER BY updated_at DESC
             LIMIT ?
             """,
-            (project_id, project_id, limit),
+            (*scope_args, limit),
         ).fetchall()
 
         checkpoints = conn.execute(
-            """
+            f"""
             SELECT id, summary, updated_at
             FROM memories
-            WHERE kind = 'checkpoint' AND (json_extract(scope_json, '$.project_id') = ? OR ? = '')
+            WHERE kind = 'checkpoint'{scope_sql}
             ORDER BY updated_at DESC
             LIMIT 3
             """,
-            (project_id, project_id),
+            tuple(scope_args),
         ).fetchall()
 
     return {
@@ -5832,6 +6539,29 @@ def build_brief(paths: MemoryPaths, schema_sql_path: Path, project_id: str, limi
     }
 
 
+_VERIFY_PARALLEL_MIN_ROWS = 64
+
+
+def _verify_markdown_row(md_root: str, row: sqlite3.Row) -> str:
+    # Hash the file's bytes as read: for a body without "\r" they are exactly the UTF-8 that
+    # sha256_text() hashed at write time, so the decode/re-encode round trip is skipped. Only
+    # CR line endings need the universal-newline text path to match.
+    try:
+        with open(os.path.join(md_root, row["body_md_path"]), "rb", buffering=0) as f:
+            raw = f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return f"missing_markdown:{row['id']}:{row['body_md_path']}"
+    if b"\r" in raw:
+        try:
+            raw = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n").encode("utf-8")
+        except UnicodeDecodeError:
+            return f"hash_mismatch:{row['id']}"
+    expected = _json_loads(row["integrity_json"]).get("content_sha256", "")
+    if expected != hashlib.sha256(raw).hexdigest():
+        return f"hash_mismatch:{row['id']}"
+    return ""
+
+
 def verify_storage(paths: MemoryPaths, schema_sql_path: Path) -> dict[str, Any]:
     ensure_storage(paths, schema_sql_path)
     ensure_system_memory(paths, schema_sql_path)
@@ -5842,33 +6572,33 @@ def verify_storage(paths: MemoryPaths, schema_sql_path: Path) -> dict[str, Any]:
         table_count = conn.execute("SELECT count(*) FROM sqlite_master WHERE type IN ('table','view')").fetchone()[0]
         rows = conn.execute("SELECT id, body_md_path, integrity_json FROM memories ORDER BY updated_at DESC").fetchall()
 
-        checked = 0
-        for row in rows:
-            checked += 1
-            md_path = paths.markdown_root / row["body_md_path"]
-            if not md_path.exists():
-                issues.append(f"missing_markdown:{row['id']}:{row['body_md_path']}")
-                continue
-
-            data = md_path.read_text(encoding="utf-8")
-            expected = json.loads(row["integrity_json"]).get("content_sha256", "")
-            actual = sha256_text(data)
-            if expected != actual:
-                issues.append(f"hash_mismatch:{row['id']}")
+    # Markdown reads and hashing run off the connection and overlap across a few threads
+    # (file I/O and hashlib on larger bodies release the GIL); results keep row order.
+    checked = len(rows)
+    md_root = str(paths.markdown_root)
+    if checked >= _VERIFY_PARALLEL_MIN_ROWS:
+        with ThreadPoolExecutor(max_workers=_MARKDOWN_IO_WORKERS) as ex:
+            results = list(ex.map(lambda row: _verify_markdown_row(md_root, row), rows))
+    else:
+        results = [_verify_markdown_row(md_root, row) for row in rows]
+    issues.extend(x for x in results if x)
 
     jsonl_count = 0
     bad_jsonl = 0
     for fp in sorted(paths.jsonl_root.glob("events-*.jsonl")):
-        for line in fp.read_text(encoding="utf-8").splitlines():
-            if not line.strip():
-                continue
-            jsonl_count += 1
-            try:
-                obj = json.loads(line)
-                if obj.get("event_type") not in EVENT_SET:
+        # Same streaming as reindex: one line in memory at a time, split on b"\n" only.
+        with fp.open("rb", buffering=1 << 16) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                jsonl_count += 1
+                try:
+                    obj = _json_loads(line)
+                except ValueError:
+                    bad_jsonl += 1
+                    continue
+                if not isinstance(obj, dict) or obj.get("event_type") not in EVENT_SET:
                     bad_jsonl += 1
-            except json.JSONDecodeError:
-                bad_jsonl += 1
 
     if bad_jsonl:
         issues.append(f"jsonl_invalid_lines:{bad_jsonl}")
@@ -5896,28 +6626,52 @@ def verify_storage(paths: MemoryPaths, schema_sql_path: Path) -> dict[str, Any]:
     return result
 
 
-def _run_git(
-    paths: MemoryPaths,
-    args: list[str],
-    *,
-    check: bool = True,
-    env: dict[str, str] | None = None,
-) -> subprocess.CompletedProcess[str]:
+def _git_proc_env(env: dict[str, str] | None) -> dict[str, str]:
     proc_env = os.environ.copy()
     if env:
         for k, v in env.items():
             proc_env[str(k)] = str(v)
+    return proc_env
+
+
+@functools.lru_cache(maxsize=8)
+def _git_executable(search_path: str | None) -> str:
+    # An absolute executable with close_fds=False lets CPython spawn via posix_spawn instead of
+    # fork + closing every fd up to RLIMIT_NOFILE. Our own fds are non-inheritable (PEP 446).
+    return shutil.which("git", path=search_path) or "git"
+
+
+def _git_run_proc(
+    paths: MemoryPaths,
+    args: list[str],
+    *,
+    check: bool,
+    env: dict[str, str] | None,
+    text: bool,
+    capture: bool = True,
+) -> subprocess.CompletedProcess[Any]:
+    proc_env = _git_proc_env(env)
+    argv = [_git_executable(proc_env.get("PATH")), "-C", str(paths.root)]
+    if args and args[0] == "status":
+        # Status only takes .git/index.lock to persist refreshed stat data; skipping that keeps
+        # the daemon's polling from contending with its own (or the user's) index writers.
+        argv.append("--no-optional-locks")
     proc = subprocess.run(
-        ["git", "-C", str(paths.root), *args],
+        [*argv, *args],
         check=False,
-        capture_output=True,
-        text=True,
+        # stderr is always kept for error messages; stdout only when the caller reads it.
+        stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=text,
         env=proc_env,
+        close_fds=False,
     )
     if check and proc.returncode != 0:
         cmd = "git -C " + str(paths.root) + " " + " ".join(args)
-        out = (proc.stdout or "").strip()
-        err = (proc.stderr or "").strip()
+        out, err = proc.stdout or "", proc.stderr or ""
+        if not text:
+            out, err = out.decode("utf-8", "replace"), err.decode("utf-8", "replace")
+        out, err = out.strip(), err.strip()
         msg = f"{cmd} failed (exit {proc.returncode})"
         if out:
             msg += f"\nstdout:\n{out}"
@@ -5927,6 +6681,145 @@ def _run_git(
     return proc
 
 
+def _run_git(
+    paths: MemoryPaths,
+    args: list[str],
+    *,
+    check: bool = True,
+    env: dict[str, str] | None = None,
+    capture: bool = True,
+) -> subprocess.CompletedProcess[str]:
+    """Run git in the memory repo; `capture=False` discards stdout (`proc.stdout` is None)."""
+    return _git_run_proc(paths, args, check=check, env=env, text=True, capture=capture)
+
+
+def _run_git_bytes(
+    paths: MemoryPaths,
+    args: list[str],
+    *,
+    check: bool = True,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess[bytes]:
+    """`_run_git` for callers that only test or tokenize the output: no decode pass over it."""
+    return _git_run_proc(paths, args, check=check, env=env, text=False)
+
+
+class _GitCatFile:
+    """Long-running `git cat-file --batch` process for object/ref probes.
+
+    One process answers every lookup of a sync run instead of spawning `git rev-parse` /
+    `git show-ref` per question. Refs are re-resolved on every request, but the index is read
+    once, so index-stage names (`:2:path`) must not be reused across index updates.
+    """
+
+    def __init__(self, paths: MemoryPaths, *, env: dict[str, str] | None = None) -> None:
+        self.paths = paths
+        self.env = env
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "_GitCatFile":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _ensure_proc(self) -> subprocess.Popen[bytes]:
+        if self._proc is None:
+            proc_env = _git_proc_env(self.env)
+            self._proc = subprocess.Popen(
+                [_git_executable(proc_env.get("PATH")), "-C", str(self.paths.root), "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=proc_env,
+                close_fds=False,
+            )
+        return self._proc
+
+    def _lookup(self, rev: str) -> tuple[str, bytes] | None:
+        if not rev or "\n" in rev:
+            return None
+        with self._lock:
+            return self._lookup_locked(rev)
+
+    def _lookup_locked(self, rev: str) -> tuple[str, bytes] | None:
+        proc = self._ensure_proc()
+        assert proc.stdin is not None and proc.stdout is not None
+        try:
+            proc.stdin.write(rev.encode("utf-8") + b"\n")
+            proc.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            # Drop the dead process so a long-lived (shared) reader respawns on the next lookup.
+            self.close()
+            raise RuntimeError(f"git cat-file --batch exited unexpectedly ({exc})") from exc
+        header = proc.stdout.readline()
+        if not header:
+            self.close()
+            raise RuntimeError("git cat-file --batch exited unexpectedly")
+        parts = header.split()
+        if len(parts) != 3:
+            # "<rev> missing" / "<rev> ambiguous"
+            return None
+        size = int(parts[2])
+        data = proc.stdout.read(size)
+        proc.stdout.read(1)  # trailing LF after the object body
+        return parts[0].decode("ascii"), data
+
+    def resolve(self, rev: str) -> str:
+        hit = self._lookup(rev)
+        return hit[0] if hit else ""
+
+    def read(self, rev: str) -> bytes | None:
+        hit = self._lookup(rev)
+        return hit[1] if hit else None
+
+    def close(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+            proc.wait()
+        finally:
+            if proc.stdout is not None:
+                proc.stdout.close()
+
+
+# Repo root -> ref reader kept alive by `_git_cat_file_session` (the sync daemon holds one).
+_SHARED_GIT_CAT_FILES: dict[str, _GitCatFile] = {}
+
+
+@contextmanager
+def _git_cat_file_session(paths: MemoryPaths):
+    """Keep one `cat-file --batch` process serving the ref probes of every sync run in the block."""
+    key = str(paths.root)
+    if key in _SHARED_GIT_CAT_FILES:
+        yield _SHARED_GIT_CAT_FILES[key]
+        return
+    cat = _GitCatFile(paths)
+    _SHARED_GIT_CAT_FILES[key] = cat
+    try:
+        yield cat
+    finally:
+        _SHARED_GIT_CAT_FILES.pop(key, None)
+        cat.close()
+
+
+def _git_ref_reader(paths: MemoryPaths, env: dict[str, str] | None = None) -> Any:
+    """Context yielding a `_GitCatFile` for ref lookups: the session's if one is open, else a new one.
+
+    Only for refs/objects: a shared reader has a stale view of the index.
+    """
+    shared = _SHARED_GIT_CAT_FILES.get(str(paths.root))
+    return nullcontext(shared) if shared is not None else _GitCatFile(paths, env=env)
+
+
 def _load_oauth_access_token(token_file: str | None) -> str:
     raw = str(token_file or "").strip()
     if not raw:
@@ -5978,37 +6871,136 @@ def _git_askpass_env(token: str):
 
 def _ensure_git_repo(paths: MemoryPaths) -> None:
     if not (paths.root / ".git").exists():
-        _run_git(paths, ["init"])
+        _run_git(paths, ["init"], capture=False)
+
+
+# (step, repo root, *args) -> (signature of the git file the step depends on, step result).
+# Git rewrites .git/config and .git/index through lockfile + rename, so any change to them
+# shows up as a new inode; an unchanged signature means re-running the step is a no-op.
+_GIT_ENSURE_SEEN: dict[tuple[str, ...], tuple[tuple[int, int, int], Any]] = {}
+
+
+def _git_file_sig(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
 
 
-def _ensure_remote(paths: MemoryPaths, remote_name: str, remote_url: str | None) -> None:
-    remotes = _run_git(paths, ["remote"]).stdout.split()
+def _git_ensure_cached(key: tuple[str, ...], path: Path) -> tuple[bool, Any]:
+    hit = _GIT_ENSURE_SEEN.get(key)
+    if hit is not None and hit[0] == _git_file_sig(path):
+        return True, hit[1]
+    return False, None
+
+
+def _git_ensure_remember(key: tuple[str, ...], path: Path, result: Any) -> None:
+    sig = _git_file_sig(path)
+    if sig is None:
+        _GIT_ENSURE_SEEN.pop(key, None)
+    else:
+        _GIT_ENSURE_SEEN[key] = (sig, result)
+
+
+def _ensure_remote(paths: MemoryPaths, remote_name: str, remote_url: str | None) -> bool:
+    """Point `remote_name` at `remote_url` when given; return whether the remote is configured."""
+    key = ("remote", str(paths.root), remote_name, remote_url or "")
+    config = _git_dir(paths) / "config"
+    hit, configured = _git_ensure_cached(key, config)
+    if hit:
+        return bool(configured)
+    remotes = _run_git_bytes(paths, ["remote"]).stdout.split()
+    name = remote_name.encode("utf-8")
     if remote_url:
-        if remote_name in remotes:
-            _run_git(paths, ["remote", "set-url", remote_name, remote_url])
+        if name in remotes:
+            _run_git(paths, ["remote", "set-url", remote_name, remote_url], capture=False)
         else:
-            _run_git(paths, ["remote", "add", remote_name, remote_url])
+            _run_git(paths, ["remote", "add", remote_name, remote_url], capture=False)
+        configured = True
+    else:
+        configured = name in remotes
+    _git_ensure_remember(key, config, configured)
+    return configured
+
+
+_GIT_STATUS_ARGS = ["status", "--porcelain=v2", "-z", "--untracked-files=normal", "--no-renames"]
 
 
-def _git_has_head(paths: MemoryPaths) -> bool:
-    proc = _run_git(paths, ["rev-parse", "--verify", "HEAD"], check=False)
-    return proc.returncode == 0
+def _porcelain_v2_records(raw: str) -> list[tuple[str, str, str]]:
+    """Split `git status --porcelain=v2 -z` output into (kind, XY, path) records."""
+    out: list[tuple[str, str, str]] = []
+    parts = (raw or "").split("\x00")
+    i = 0
+    while i < len(parts):
+        rec = parts[i]
+        i += 1
+        if not rec or rec[0] == "#":
+            continue
+        kind = rec[0]
+        if kind == "1":
+            fields = rec.split(" ", 8)
+            if len(fields) == 9:
+                out.append((kind, fields[1], fields[8]))
+        elif kind == "2":
+            fields = rec.split(" ", 9)
+            if len(fields) == 10:
+                out.append((kind, fields[1], fields[9]))
+            i += 1  # rename records are followed by the original path
+        elif kind == "u":
+            fields = rec.split(" ", 10)
+            if len(fields) == 11:
+                out.append((kind, fields[1], fields[10]))
+        elif kind in {"?", "!"}:
+            out.append((kind, kind + kind, rec[2:]))
+    return out
 
 
-def _git_unmerged_paths(paths: MemoryPaths) -> list[str]:
-    proc = _run_git(paths, ["diff", "--name-only", "--diff-filter=U"], check=False)
-    items = [x.strip() for x in (proc.stdout or "").splitlines() if x.strip()]
-    return items
+def _parse_porcelain_v2(raw: str) -> tuple[bool, str]:
+    """Return (has_changes, short_detail) where detail mimics `git status --short` lines."""
+    records = _porcelain_v2_records(raw)
+    lines = [f"{xy.replace('.', ' ')} {path}" for _, xy, path in records]
+    return bool(records), "\n".join(lines).strip()
+
+
+def _git_unmerged_paths(paths: MemoryPaths, status_raw: str | None = None) -> list[str]:
+    if status_raw is None:
+        status_raw = _run_git(paths, _GIT_STATUS_ARGS, check=False).stdout or ""
+    return [path for kind, _, path in _porcelain_v2_records(status_raw) if kind == "u"]
+
+
+def _git_dir(paths: MemoryPaths) -> Path:
+    dot_git = paths.root / ".git"
+    if dot_git.is_file():
+        # Worktrees/submodules: ".git" is a "gitdir: <path>" pointer file.
+        try:
+            raw = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return dot_git
+        if raw.startswith("gitdir:"):
+            target = Path(raw[len("gitdir:") :].strip())
+            return target if target.is_absolute() else (paths.root / target)
+    return dot_git
 
 
 def _git_rebase_in_progress(paths: MemoryPaths) -> bool:
-    git_dir = paths.root / ".git"
+    git_dir = _git_dir(paths)
     return (git_dir / "rebase-apply").exists() or (git_dir / "rebase-merge").exists()
 
 
 def _git_merge_in_progress(paths: MemoryPaths) -> bool:
-    proc = _run_git(paths, ["rev-parse", "-q", "--verify", "MERGE_HEAD"], check=False)
-    return proc.returncode == 0
+    return (_git_dir(paths) / "MERGE_HEAD").exists()
+
+
+def _repo_busy(paths: MemoryPaths, status_raw: str) -> tuple[bool, str]:
+    """Check for an in-progress rebase/merge or unmerged index entries without spawning git."""
+    if _git_rebase_in_progress(paths):
+        return True, "rebase"
+    if _git_merge_in_progress(paths):
+        return True, "merge"
+    if _git_unmerged_paths(paths, status_raw):
+        return True, "unmerged"
+    return False, ""
 
 
 def _normalize_sync_include_layers(sync_include_layers: list[str] | None) -> list[str]:
@@ -6022,20 +7014,16 @@ def _normalize_sync_include_layers(sync_include_layers: list[str] | None) -> lis
     return out
 
 
-def _ensure_sync_gitignore(
-    paths: MemoryPaths,
-    *,
-    sync_include_layers: list[str] | None,
-    sync_include_jsonl: bool,
-) -> None:
-    """Keep the memory Git repo focused on shareable memory artifacts, not runtime/install files."""
-    include_layers = _normalize_sync_include_layers(sync_include_layers)
-    excluded_layers = [x for x in ["instant", "short", "long", "archive"] if x not in include_layers]
-    ignore_path = paths.root / ".gitignore"
-    start = "# OMNIMEM:SYNC:START"
-    end = "# OMNIMEM:SYNC:END"
+_SYNC_GITIGNORE_START = "# OMNIMEM:SYNC:START"
+_SYNC_GITIGNORE_END = "# OMNIMEM:SYNC:END"
+# .gitignore path -> (st_mtime_ns, st_size, block) of a file last seen carrying that exact block.
+_SYNC_GITIGNORE_SEEN: dict[str, tuple[int, int, str]] = {}
+
+
+@functools.lru_cache(maxsize=32)
+def _sync_gitignore_block(excluded_layers: tuple[str, ...], sync_include_jsonl: bool) -> str:
     block_lines = [
-        start,
+        _SYNC_GITIGNORE_START,
         "# Runtime / install artifacts (syncing these causes frequent conflicts).",
         "runtime/",
         "bin/",
@@ -6057,7 +7045,7 @@ def _ensure_sync_gitignore(
         "data/omnimemory.db-shm",
         "data/omnimemory.db-wal",
     ]
-    if not bool(sync_include_jsonl):
+    if not sync_include_jsonl:
         block_lines.extend(
             [
                 "",
@@ -6076,24 +7064,56 @@ def _ensure_sync_gitignore(
             block_lines.append(f"data/markdown/{lyr}/")
     block_lines.extend(
         [
-        end,
+        _SYNC_GITIGNORE_END,
         "",
     ])
+    return "\n".join(block_lines)
 
-    if ignore_path.exists():
-        txt = ignore_path.read_text(encoding="utf-8", errors="ignore")
-    else:
+
+def _ensure_sync_gitignore(
+    paths: MemoryPaths,
+    *,
+    sync_include_layers: list[str] | None,
+    sync_include_jsonl: bool,
+) -> None:
+    """Keep the memory Git repo focused on shareable memory artifacts, not runtime/install files."""
+    include_layers = _normalize_sync_include_layers(sync_include_layers)
+    excluded_layers = tuple(x for x in ["instant", "short", "long", "archive"] if x not in include_layers)
+    block = _sync_gitignore_block(excluded_layers, bool(sync_include_jsonl))
+    ignore_path = str(paths.root / ".gitignore")
+    start = _SYNC_GITIGNORE_START
+    end = _SYNC_GITIGNORE_END
+
+    # Steady state: the file has not changed since it was last seen carrying this block.
+    try:
+        st = os.stat(ignore_path)
+    except OSError:
+        st = None
+    if st is not None and _SYNC_GITIGNORE_SEEN.get(ignore_path) == (st.st_mtime_ns, st.st_size, block):
+        return
+
+    try:
+        with open(ignore_path, encoding="utf-8", errors="ignore") as f:
+            txt = f.read()
+    except FileNotFoundError:
         txt = ""
 
     if start in txt and end in txt:
         a = txt.index(start)
         b = txt.index(end) + len(end)
-        new_txt = (txt[:a] + "\n".join(block_lines).rstrip("\n") + txt[b:]).strip() + "\n"
+        new_txt = (txt[:a] + block.rstrip("\n") + txt[b:]).strip() + "\n"
     else:
-        new_txt = (txt.rstrip("\n") + ("\n" if txt.strip() else "")) + "\n".join(block_lines)
+        new_txt = (txt.rstrip("\n") + ("\n" if txt.strip() else "")) + block
 
     if new_txt != (txt if txt.endswith("\n") else txt + "\n"):
-        ignore_path.write_text(new_txt, encoding="utf-8")
+        with open(ignore_path, "w", encoding="utf-8") as f:
+            f.write(new_txt)
+        st = os.stat(ignore_path)
+    # Same racy-timestamp rule as the content walk: a just-written mtime may hide a same-tick edit.
+    if st is not None and time.time() - st.st_mtime_ns / 1e9 > _MTIME_RACY_WINDOW_S:
+        _SYNC_GITIGNORE_SEEN[ignore_path] = (st.st_mtime_ns, st.st_size, block)
+    else:
+        _SYNC_GITIGNORE_SEEN.pop(ignore_path, None)
 
 
 def _untrack_sync_ignored(
@@ -6103,65 +7123,148 @@ def _untrack_sync_ignored(
     sync_include_jsonl: bool,
 ) -> None:
     # If these were previously committed, .gitignore won't help; drop from index but keep local files.
-    _run_git(paths, ["rm", "-r", "--cached", "--ignore-unmatch", "runtime"], check=False)
-    for name in ["bin", "lib", "docs", "spec", "templates", "db", "__pycache__"]:
-        _run_git(paths, ["rm", "-r", "--cached", "--ignore-unmatch", name], check=False)
-    for name in ["data/omnimem.db", "data/omnimem.db-wal", "data/omnimem.db-shm"]:
-        _run_git(paths, ["rm", "--cached", "--ignore-unmatch", name], check=False)
-    for name in ["data/omnimemory.db", "data/omnimemory.db-wal", "data/omnimemory.db-shm"]:
-        _run_git(paths, ["rm", "--cached", "--ignore-unmatch", name], check=False)
+    # One `git rm` for every pathspec: --ignore-unmatch covers each of them, and -r is a no-op for
+    # plain files. git aborts the whole call on any bad path (a submodule, an unreadable entry),
+    # so a failure falls back to one call per path and only the bad one is skipped.
+    names = ["runtime", "bin", "lib", "docs", "spec", "templates", "db", "__pycache__"]
+    names += ["data/omnimem.db", "data/omnimem.db-wal", "data/omnimem.db-shm"]
+    names += ["data/omnimemory.db", "data/omnimemory.db-wal", "data/omnimemory.db-shm"]
     if not bool(sync_include_jsonl):
-        _run_git(paths, ["rm", "-r", "--cached", "--ignore-unmatch", "data/jsonl"], check=False)
+        names.append("data/jsonl")
     include_layers = _normalize_sync_include_layers(sync_include_layers)
-    excluded_layers = [x for x in ["instant", "short", "long", "archive"] if x not in include_layers]
-    for lyr in excluded_layers:
-        _run_git(paths, ["rm", "-r", "--cached", "--ignore-unmatch", f"data/markdown/{lyr}"], check=False)
+    names += [f"data/markdown/{x}" for x in ["instant", "short", "long", "archive"] if x not in include_layers]
+    # Once nothing matched, the index only needs another look after something rewrites it.
+    key = ("untrack", str(paths.root), *names)
+    index = _git_dir(paths) / "index"
+    if _git_ensure_cached(key, index)[0]:
+        return
+    rm = ["rm", "-r", "--cached", "--ignore-unmatch", "--"]
+    ok = _run_git(paths, [*rm, *names], check=False, capture=False).returncode == 0
+    if not ok:
+        ok = all([_run_git(paths, [*rm, name], check=False, capture=False).returncode == 0 for name in names])
+    if ok:
+        _git_ensure_remember(key, index, True)
+
+
+def _jsonl_union_rows(
+    blob: bytes, seen: set[str], seen_lines: set[bytes]
+) -> list[tuple[tuple[str, str], bytes]]:
+    """Parse one conflict stage into `((event_time, event_id), line)` rows sorted by key.
+
+    Events whose id is already in `seen` are dropped, so the first stage keeps precedence. Lines
+    already in `seen_lines` are skipped before parsing: both stages share most of their history.
+    Rows carry the original stripped line; the list is only sorted when the file is out of order.
+    """
+    rows: list[tuple[tuple[str, str], bytes]] = []
+    ordered = True
+    last: tuple[str, str] | None = None
+    for line in (blob or b"").split(b"\n"):
+        s = line.strip()
+        if not s or s in seen_lines:
+            continue
+        seen_lines.add(s)
+        try:
+            obj = _json_loads(s)
+        except ValueError:
+            continue
+        if not isinstance(obj, dict):
+            continue
+        eid = str(obj.get("event_id") or "")
+        if not eid:
+            eid = hashlib.sha256(s).hexdigest()
+        if eid in seen:
+            continue
+        seen.add(eid)
+        key = (str(obj.get("event_time") or ""), str(obj.get("event_id") or ""))
+        if last is not None and key < last:
+            ordered = False
+        last = key
+        rows.append((key, s))
+    if not ordered:
+        rows.sort(key=lambda r: r[0])
+    return rows
+
 
+def _jsonl_blob_terminated(blob: bytes) -> bytes:
+    if not blob.strip():
+        return b""
+    return blob if blob.endswith(b"\n") else blob + b"\n"
 
-def _parse_jsonl_union(stage2: str, stage3: str) -> str:
+
+def _parse_jsonl_union(stage2: bytes | str, stage3: bytes | str) -> bytes:
+    """Union two versions of an events JSONL file by event id, ordered by (event_time, event_id).
+
+    Works on raw bytes end to end (git blobs in, file bytes out); both JSON parsers take bytes.
+    When one side is empty (or both sides are identical) the other is kept verbatim.
+    """
+    blobs = [x.encode("utf-8") if isinstance(x, str) else (x or b"") for x in (stage2, stage3)]
+    if blobs[0] == blobs[1] or not blobs[1].strip():
+        return _jsonl_blob_terminated(blobs[0])
+    if not blobs[0].strip():
+        return _jsonl_blob_terminated(blobs[1])
     seen: set[str] = set()
-    rows: list[dict[str, Any]] = []
-    for blob in (stage2, stage3):
-        for line in (blob or "").splitlines():
-            s = line.strip()
-            if not s:
-                continue
-            try:
-                obj = json.loads(s)
-            except json.JSONDecodeError:
-                continue
-            eid = str(obj.get("event_id") or "")
-            if not eid:
-                eid = sha256_text(s)
-            if eid in seen:
-                continue
-            seen.add(eid)
-            rows.append(obj)
-    rows.sort(key=lambda o: (str(o.get("event_time") or ""), str(o.get("event_id") or "")))
-    return "\n".join(json.dumps(o, ensure_ascii=False) for o in rows) + ("\n" if rows else "")
+    seen_lines: set[bytes] = set()
+    rows2 = _jsonl_union_rows(blobs[0], seen, seen_lines)
+    rows3 = _jsonl_union_rows(blobs[1], seen, seen_lines)
+    # heapq.merge is stable across inputs, so ties keep stage2 first like a sort of rows2 + rows3.
+    out = [line for _, line in heapq.merge(rows2, rows3, key=lambda r: r[0])]
+    return b"\n".join(out) + (b"\n" if out else b"")
 
 
-def _auto_resolve_jsonl_conflicts(paths: MemoryPaths) -> bool:
-    unmerged = _git_unmerged_paths(paths)
+def _auto_resolve_jsonl_conflicts(paths: MemoryPaths, unmerged: list[str] | None = None) -> bool:
+    if unmerged is None:
+        unmerged = _git_unmerged_paths(paths)
     if not unmerged:
         return False
     if not all(p.startswith("data/jsonl/") and Path(p).name.startswith("events-") and p.endswith(".jsonl") for p in unmerged):
         return False
 
-    for rel in unmerged:
-        # Stage 2 = ours, stage 3 = theirs.
-        s2 = _run_git(paths, ["show", f":2:{rel}"], check=False).stdout or ""
-        s3 = _run_git(paths, ["show", f":3:{rel}"], check=False).stdout or ""
-        merged = _parse_jsonl_union(s2, s3)
+    # Stage 2 = ours, stage 3 = theirs. One cat-file process serves every stage blob, and all
+    # reads happen before the single `git add` below (it snapshots the index on first use).
+    with _GitCatFile(paths) as cat:
+        stages = [(rel, cat.read(f":2:{rel}") or b"", cat.read(f":3:{rel}") or b"") for rel in unmerged]
+    for rel, s2, s3 in stages:
         fp = paths.root / rel
         fp.parent.mkdir(parents=True, exist_ok=True)
-        fp.write_text(merged, encoding="utf-8")
-        _run_git(paths, ["add", rel])
+        _write_bytes_atomic(fp, _parse_jsonl_union(s2, s3))
+    _run_git(paths, ["add", "--", *unmerged], capture=False)
     return True
 
 
-SYNC_MODES = {"noop", "git", "github-status", "github-push", "github-pull", "github-bootstrap"}
-SYNC_ERROR_KINDS = {"auth", "network", "conflict", "unknown"}
+def _git_rebase_step(paths: MemoryPaths) -> str:
+    git_dir = _git_dir(paths)
+    for marker in (git_dir / "rebase-merge" / "msgnum", git_dir / "rebase-apply" / "next"):
+        try:
+            return marker.read_text(encoding="utf-8").strip()
+        except OSError:
+            continue
+    return ""
+
+
+def _drive_rebase_resolution(paths: MemoryPaths, g: Any) -> None:
+    """Auto-resolve JSONL conflicts and continue the rebase for as long as it makes progress.
+
+    Each round re-reads unmerged paths from one status call, resolves them in a single pass and
+    issues one `rebase --continue`; it stops as soon as the rebase stops advancing.
+    """
+    while True:
+        unmerged = _git_unmerged_paths(paths, g(_GIT_STATUS_ARGS, check=False).stdout or "")
+        if not unmerged or not _auto_resolve_jsonl_conflicts(paths, unmerged):
+            return
+        if not _git_rebase_in_progress(paths):
+            return
+        step = _git_rebase_step(paths)
+        cont = g(["rebase", "--continue"], check=False)
+        if cont.returncode == 0 or not _git_rebase_in_progress(paths):
+            return
+        if _git_rebase_step(paths) == step:
+            return
+
+
+SYNC_MODES = frozenset({"noop", "git", "github-status", "github-push", "github-pull", "github-bootstrap"})
+SYNC_ERROR_KINDS = frozenset({"auth", "network", "conflict", "unknown"})
+# Modes that touch the Git working tree and therefore need the repo lock.
+_GIT_MODES = SYNC_MODES - {"noop"}
 
 
 def sync_git(
@@ -6176,20 +7279,24 @@ def sync_git(
     sync_include_layers: list[str] | None = None,
     sync_include_jsonl: bool = True,
     log_event: bool = True,
+    include_detail: bool = True,
 ) -> dict[str, Any]:
     if mode not in SYNC_MODES:
         raise ValueError("mode must be one of: noop, git, github-status, github-push, github-pull, github-bootstrap")
 
     ensure_system_memory(paths, schema_sql_path)
 
+    # Files a pull brought in (None = unknown, e.g. first pull into an unborn branch).
+    changed_paths: list[str] | None = None
+
     # Git operations and storage mutations must not interleave across processes.
-    lock_ctx = repo_lock(paths.root, timeout_s=30.0) if mode in {"git", "github-status", "github-push", "github-pull", "github-bootstrap"} else nullcontext()
+    lock_ctx = repo_lock(paths.root, timeout_s=30.0) if mode in _GIT_MODES else nullcontext()
     with lock_ctx:
         use_askpass, oauth_token = _should_use_github_oauth_askpass(remote_url, oauth_token_file)
         with _git_askpass_env(oauth_token if use_askpass else "") as git_env:
 
-            def _g(args: list[str], *, check: bool = True) -> subprocess.CompletedProcess[str]:
-                return _run_git(paths, args, check=check, env=git_env)
+            def _g(args: list[str], *, check: bool = True, capture: bool = True) -> subprocess.CompletedProcess[str]:
+                return _run_git(paths, args, check=check, env=git_env, capture=capture)
 
             if mode == "noop":
                 message = "sync noop"
@@ -6198,10 +7305,9 @@ def sync_git(
             elif mode in {"git", "github-status"}:
                 try:
                     _ensure_git_repo(paths)
-                    proc = _g(["status", "--short"])
+                    _, detail = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS).stdout)
                     message = "github status ok"
                     ok = True
-                    detail = proc.stdout.strip()
                 except Exception as exc:  # pragma: no cover
                     message = f"github status failed ({exc})"
                     ok = False
@@ -6209,7 +7315,7 @@ def sync_git(
             elif mode == "github-push":
                 try:
                     _ensure_git_repo(paths)
-                    _ensure_remote(paths, remote_name, remote_url)
+                    has_remote = _ensure_remote(paths, remote_name, remote_url)
                     _ensure_sync_gitignore(
                         paths,
                         sync_include_layers=sync_include_layers,
@@ -6220,25 +7326,31 @@ def sync_git(
                         sync_include_layers=sync_include_layers,
                         sync_include_jsonl=bool(sync_include_jsonl),
                     )
-                    if _git_rebase_in_progress(paths) or _git_merge_in_progress(paths) or _git_unmerged_paths(paths):
-                        st = _g(["status", "--short"], check=False).stdout.strip()
+                    status_proc = _g(_GIT_STATUS_ARGS, check=False)
+                    status_raw = status_proc.stdout or ""
+                    busy, _ = _repo_busy(paths, status_raw)
+                    if busy:
+                        _, st = _parse_porcelain_v2(status_raw)
                         raise RuntimeError(f"git repo has an in-progress merge/rebase or unmerged files; resolve first\n{st}")
 
-                    _g(["add", "-A"])
-                    commit_proc = _g(["commit", "-m", commit_message], check=False)
-                    if commit_proc.returncode != 0 and "nothing to commit" not in (commit_proc.stdout or "") + (commit_proc.stderr or ""):
-                        raise RuntimeError((commit_proc.stderr or "").strip() or (commit_proc.stdout or "").strip() or "git commit failed")
-                    if remote_url or remote_name in _g(["remote"]).stdout.split():
+                    # A clean status means `add -A` stages nothing and `commit` has nothing to commit.
+                    if status_proc.returncode != 0 or _parse_porcelain_v2(status_raw)[0]:
+                        _g(["add", "-A"], capture=False)
+                        commit_proc = _g(["commit", "-m", commit_message], check=False)
+                        if commit_proc.returncode != 0 and "nothing to commit" not in (commit_proc.stdout or "") + (commit_proc.stderr or ""):
+                            raise RuntimeError((commit_proc.stderr or "").strip() or (commit_proc.stdout or "").strip() or "git commit failed")
+                    if has_remote:
                         _g(["push", "-u", remote_name, branch])
                         message = "github push ok"
                     else:
                         message = "local commit ok; remote not configured"
                     ok = True
-                    detail = _g(["status", "--short"]).stdout.strip()
+                    # Failures always carry the status detail (it feeds error classification).
+                    detail = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS).stdout)[1] if include_detail else ""
                 except Exception as exc:  # pragma: no cover
                     message = f"github push failed ({exc})"
                     ok = False
-                    detail = _g(["status", "--short"], check=False).stdout.strip()
+                    _, detail = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS, check=False).stdout)
             elif mode == "github-pull":
                 try:
                     _ensure_git_repo(paths)
@@ -6254,53 +7366,57 @@ def sync_git(
                         sync_include_jsonl=bool(sync_include_jsonl),
                     )
 
-                    _g(["fetch", remote_name, branch])
+                    _g(["fetch", remote_name, branch], capture=False)
                     remote_ref = f"{remote_name}/{branch}"
-                    remote_ok = _g(
-                        ["show-ref", "--verify", "--quiet", f"refs/remotes/{remote_name}/{branch}"],
-                        check=False,
-                    ).returncode == 0
-                    if not remote_ok:
+                    with _git_ref_reader(paths, git_env) as cat:
+                        remote_sha = cat.resolve(f"refs/remotes/{remote_name}/{branch}")
+                        head_sha = cat.resolve("HEAD")
+                    if not remote_sha:
                         raise RuntimeError(f"remote branch not found after fetch: {remote_ref}")
 
-                    if not _git_has_head(paths):
-                        st = _g(["status", "--porcelain"], check=False).stdout or ""
-                        if st.strip():
-                            _g(["add", "-A"])
+                    message = "github pull ok"
+                    if head_sha == remote_sha and not _git_rebase_in_progress(paths):
+                        # Remote has not moved past us: rebase/merge would be a no-op.
+                        message = "github pull ok (up-to-date)"
+                        changed_paths = []
+                    elif not head_sha:
+                        has_changes, _ = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS, check=False).stdout)
+                        if has_changes:
+                            _g(["add", "-A"], capture=False)
                             cp = _g(["commit", "-m", "chore(memory): local snapshot (pre-pull)"], check=False)
                             if cp.returncode != 0 and "nothing to commit" not in (cp.stdout or "") + (cp.stderr or ""):
                                 raise RuntimeError((cp.stderr or "").strip() or (cp.stdout or "").strip() or "git commit failed")
                             _g(["merge", "--no-ff", "--allow-unrelated-histories", remote_ref])
                         else:
-                            _g(["checkout", "-B", branch, remote_ref])
+                            _g(["checkout", "-B", branch, remote_ref], capture=False)
                     else:
                         rebase_proc = _g(["rebase", "--autostash", remote_ref], check=False)
                         if rebase_proc.returncode != 0:
                             err_text = (rebase_proc.stdout or "") + "\n" + (rebase_proc.stderr or "")
                             if "unrelated histories" in err_text.lower() or "no common commits" in err_text.lower():
-                                _g(["rebase", "--abort"], check=False)
+                                _g(["rebase", "--abort"], check=False, capture=False)
                                 _g(["merge", "--no-ff", "--allow-unrelated-histories", remote_ref])
                             else:
-                                for _ in range(20):
-                                    if not _git_unmerged_paths(paths):
-                                        break
-                                    if not _auto_resolve_jsonl_conflicts(paths):
-                                        break
-                                    if _git_rebase_in_progress(paths):
-                                        cont = _g(["rebase", "--continue"], check=False)
-                                        if cont.returncode != 0:
-                                            break
-                                if _git_unmerged_paths(paths) or _git_rebase_in_progress(paths):
-                                    st2 = _g(["status", "--short"], check=False).stdout.strip()
+                                _drive_rebase_resolution(paths, _g)
+                                status_raw = _g(_GIT_STATUS_ARGS, check=False).stdout or ""
+                                if _git_unmerged_paths(paths, status_raw) or _git_rebase_in_progress(paths):
+                                    _, st2 = _parse_porcelain_v2(status_raw)
                                     raise RuntimeError(f"git pull/rebase has conflicts; manual resolution required\n{st2}")
 
-                    message = "github pull ok"
+                    if head_sha and changed_paths is None:
+                        with _git_ref_reader(paths, git_env) as cat:
+                            new_head = cat.resolve("HEAD")
+                        if new_head == head_sha:
+                            changed_paths = []
+                        elif new_head:
+                            diff_raw = _g(["diff", "--name-only", "-z", f"{head_sha}..{new_head}"]).stdout
+                            changed_paths = [x for x in diff_raw.split("\x00") if x]
                     ok = True
-                    detail = _g(["status", "--short"]).stdout.strip()
+                    detail = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS).stdout)[1] if include_detail else ""
                 except Exception as exc:  # pragma: no cover
                     message = f"github pull failed ({exc})"
                     ok = False
-                    detail = _g(["status", "--short"], check=False).stdout.strip()
+                    _, detail = _parse_porcelain_v2(_g(_GIT_STATUS_ARGS, check=False).stdout)
             elif mode == "github-bootstrap":
                 pull_out = sync_git(
                     paths,
@@ -6314,6 +7430,7 @@ def sync_git(
                     sync_include_layers=sync_include_layers,
                     sync_include_jsonl=bool(sync_include_jsonl),
                     log_event=False,
+                    include_detail=include_detail,
                 )
                 reindex_out = reindex_from_jsonl(paths, schema_sql_path, reset=True)
                 push_out = sync_git(
@@ -6328,6 +7445,7 @@ def sync_git(
                     sync_include_layers=sync_include_layers,
                     sync_include_jsonl=bool(sync_include_jsonl),
                     log_event=False,
+                    include_detail=include_detail,
                 )
                 ok = bool(pull_out.get("ok") and reindex_out.get("ok") and push_out.get("ok"))
                 message = "github bootstrap ok" if ok else "github bootstrap finished with errors"
@@ -6343,8 +7461,10 @@ def sync_git(
         )
 
     out: dict[str, Any] = {"ok": ok, "mode": mode, "message": message}
-    if mode in {"git", "github-status", "github-push", "github-pull", "github-bootstrap"}:
+    if mode in _GIT_MODES:
         out["detail"] = detail
+    if mode == "github-pull" and ok and changed_paths is not None:
+        out["changed_paths"] = changed_paths
     return out
 
 
@@ -6360,6 +7480,7 @@ def sync_placeholder(
     sync_include_layers: list[str] | None = None,
     sync_include_jsonl: bool = True,
     log_event: bool = True,
+    include_detail: bool = True,
 ) -> dict[str, Any]:
     # Backward-compatible alias for older callers/docs.
     return sync_git(
@@ -6374,32 +7495,105 @@ def sync_placeholder(
         sync_include_layers=sync_include_layers,
         sync_include_jsonl=bool(sync_include_jsonl),
         log_event=log_event,
+        include_detail=include_detail,
     )
 
 
+# dir path -> (dir st_mtime_ns, file names, subdir names). A directory's mtime only moves when
+# entries are added/removed/renamed, so an unchanged directory can skip readdir; files still need a
+# stat because in-place appends (JSONL) do not touch the parent directory.
+_MTIME_DIR_CACHE: dict[str, tuple[int, tuple[str, ...], tuple[str, ...]]] = {}
+# Listings taken while the directory mtime is this fresh may miss same-tick changes (git's "racy" rule).
+_MTIME_RACY_WINDOW_S = 2.0
+
+
+def _dir_listing(path: str, now: float) -> tuple[tuple[str, ...], tuple[str, ...]] | None:
+    try:
+        dir_mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        _MTIME_DIR_CACHE.pop(path, None)
+        return None
+    hit = _MTIME_DIR_CACHE.get(path)
+    if hit is not None and hit[0] == dir_mtime_ns:
+        return hit[1], hit[2]
+    files: list[str] = []
+    dirs: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        # Like os.walk(): symlinked directories are neither descended nor stat'ed.
+                        if not entry.is_symlink():
+                            dirs.append(entry.name)
+                    else:
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        _MTIME_DIR_CACHE.pop(path, None)
+        return None
+    listing = (tuple(files), tuple(dirs))
+    if now - dir_mtime_ns / 1e9 > _MTIME_RACY_WINDOW_S:
+        _MTIME_DIR_CACHE[path] = (dir_mtime_ns, *listing)
+    else:
+        _MTIME_DIR_CACHE.pop(path, None)
+    return listing
+
+
+_STAT_DIR_FD = os.stat in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+
+def _latest_file_mtime(base: str, files: tuple[str, ...]) -> float:
+    # Stat relative to an open directory fd where supported: the kernel resolves one component
+    # per file instead of re-walking the whole (layer/year/month) prefix every time.
+    latest = 0.0
+    fd = -1
+    if _STAT_DIR_FD and files:
+        try:
+            fd = os.open(base, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            fd = -1
+    try:
+        prefix = base + os.sep
+        for name in files:
+            try:
+                mt = (os.stat(name, dir_fd=fd) if fd >= 0 else os.stat(prefix + name)).st_mtime
+            except OSError:
+                continue
+            if mt > latest:
+                latest = mt
+    finally:
+        if fd >= 0:
+            os.close(fd)
+    return latest
+
+
 def latest_content_mtime(paths: MemoryPaths) -> float:
     latest = 0.0
-    for root in [paths.markdown_root, paths.jsonl_root]:
-        if not root.exists():
+    now = time.time()
+    stack = [str(paths.markdown_root), str(paths.jsonl_root)]
+    while stack:
+        base = stack.pop()
+        listing = _dir_listing(base, now)
+        if listing is None:
             continue
-        for base, _, files in os.walk(root):
-            for name in files:
-                p = Path(base) / name
-                try:
-                    mt = p.stat().st_mtime
-                except FileNotFoundError:
-                    continue
-                if mt > latest:
-                    latest = mt
+        files, dirs = listing
+        prefix = base + os.sep
+        mt = _latest_file_mtime(base, files)
+        if mt > latest:
+            latest = mt
+        stack.extend(prefix + name for name in dirs)
     return latest
 
 
 def _repo_has_pending_sync_changes(paths: MemoryPaths) -> bool:
     try:
-        proc = _run_git(paths, ["status", "--porcelain"], check=False)
+        proc = _run_git_bytes(paths, _GIT_STATUS_ARGS, check=False)
         if int(proc.returncode) != 0:
             return False
-        return bool((proc.stdout or "").strip())
+        # Without --branch/--show-stash every non-"#" record is a change; no need to decode paths.
+        return any(rec and not rec.startswith(b"#") for rec in (proc.stdout or b"").split(b"\x00"))
     except Exception:
         return False
 
@@ -6419,57 +7613,84 @@ def _daemon_should_attempt_push(
     return bool(current_seen > last_seen or repo_dirty)
 
 
-def classify_sync_error(message: str, detail: Any = "") -> str:
-    text = f"{message}\n{detail}".lower()
-
-    auth_hints = [
-        "authentication failed",
-        "fatal: authentication",
-        "bad credentials",
-        "permission denied (publickey)",
-        "could not read username",
-        "access denied",
-        "unauthorized",
-    ]
-    if any(x in text for x in auth_hints):
-        return "auth"
-
-    network_hints = [
-        "could not resolve host",
-        "network is unreachable",
-        "connection timed out",
-        "connection reset",
-        "failed to connect",
-        "temporary failure",
-        "name or service not known",
-        "proxy error",
-        "tls",
-        "ssl",
-    ]
-    if any(x in text for x in network_hints):
-        return "network"
-
-    conflict_hints = [
-        "conflict",
-        "merge conflict",
-        "could not apply",
-        "non-fast-forward",
-        "fetch first",
-        "needs merge",
-        "would be overwritten",
-        "rebase",
-    ]
-    if any(x in text for x in conflict_hints):
-        return "conflict"
-
+_SYNC_AUTH_HINTS = (
+    "authentication failed",
+    "fatal: authentication",
+    "bad credentials",
+    "permission denied (publickey)",
+    "could not read username",
+    "access denied",
+    "unauthorized",
+)
+_SYNC_NETWORK_HINTS = (
+    "could not resolve host",
+    "network is unreachable",
+    "connection timed out",
+    "connection reset",
+    "failed to connect",
+    "temporary failure",
+    "name or service not known",
+    "proxy error",
+    "tls",
+    "ssl",
+)
+_SYNC_CONFLICT_HINTS = (
+    "conflict",
+    "merge conflict",
+    "could not apply",
+    "non-fast-forward",
+    "fetch first",
+    "needs merge",
+    "would be overwritten",
+    "rebase",
+)
+
+
+def _hint_pattern(hints: tuple[str, ...]) -> re.Pattern[str]:
+    # Drop hints that contain a shorter hint of the same class ("merge conflict" vs "conflict"):
+    # they can never change the outcome, only lengthen the alternation.
+    kept = [h for h in hints if not any(o != h and o in h for o in hints)]
+    return re.compile("|".join(map(re.escape, kept)))
+
+
+# One pattern per class (not one combined pattern): the leftmost match of a combined
+# alternation would ignore the auth > network > conflict priority.
+_SYNC_ERROR_PATTERNS = (
+    ("auth", _hint_pattern(_SYNC_AUTH_HINTS)),
+    ("network", _hint_pattern(_SYNC_NETWORK_HINTS)),
+    ("conflict", _hint_pattern(_SYNC_CONFLICT_HINTS)),
+)
+
+
+# Larger texts (full status dumps) are classified uncached to keep the memo small.
+_SYNC_ERROR_CACHE_MAX_TEXT = 4096
+
+
+def _classify_sync_error_text(text: str) -> str:
+    text = text.lower()
+    for kind, pattern in _SYNC_ERROR_PATTERNS:
+        if pattern.search(text) is not None:
+            return kind
     return "unknown"
 
 
+_classify_sync_error_cached = functools.lru_cache(maxsize=256)(_classify_sync_error_text)
+
+
+def classify_sync_error(message: str, detail: Any = "") -> str:
+    # Retries during an outage keep producing the same message, so memoize by exact text.
+    text = f"{message}\n{detail}"
+    if len(text) > _SYNC_ERROR_CACHE_MAX_TEXT:
+        return _classify_sync_error_text(text)
+    return _classify_sync_error_cached(text)
+
+
 def should_retry_sync_error(error_kind: str) -> bool:
     # Authentication and merge-conflict failures usually require manual action.
     return error_kind in {"network", "unknown"}
 
 
+@functools.lru_cache(maxsize=8)
 def sync_error_hint(error_kind: str) -> str:
     if error_kind == "auth":
         return "Authentication failed. Verify credential refs/token/SSH key and run sync again."
@@ -6501,11 +7722,15 @@ def run_sync_with_retry(
     initial_backoff: int = 1,
     max_backoff: int = 8,
     sleep_fn=time.sleep,
+    include_detail: bool = True,
 ) -> dict[str, Any]:
     attempts = max(1, int(max_attempts))
     backoff = max(1, int(initial_backoff))
     cap = max(backoff, int(max_backoff))
     last_out: dict[str, Any] = {"ok": False, "mode": mode, "message": "sync retry not executed"}
+    # Only forward include_detail when it changes something, so runners written before the
+    # keyword existed (wrappers, test doubles) keep working with the default.
+    extra: dict[str, Any] = {} if include_detail else {"include_detail": False}
 
     for i in range(1, attempts + 1):
         try:
@@ -6520,6 +7745,7 @@ def run_sync_with_retry(
                 sync_include_layers=sync_include_layers,
                 sync_include_jsonl=bool(sync_include_jsonl),
                 log_event=False,
+                **extra,
             )
         except Exception as exc:  # pragma: no cover
             out = {"ok": False, "mode": mode, "message": f"sync runner error: {exc}"}
@@ -6600,363 +7826,12 @@ def run_sync_daemon(
     retry_max_backoff: int = 8,
     once: bool = False,
 ) -> dict[str, Any]:
-    ensure_storage(paths, schema_sql_path)
-    ensure_system_memory(paths, schema_sql_path)
-    last_seen = latest_content_mtime(paths)
-    last_pull = 0.0
-    last_push_attempt = 0.0
-    cycles = 0
-    pull_failures = 0
-    push_failures = 0
-    reindex_failures = 0
-    last_pull_result: dict[str, Any] = {}
-    last_push_result: dict[str, Any] = {}
-    last_reindex_result: dict[str, Any] = {}
-    weave_runs = 0
-    weave_failures = 0
-    last_weave = 0.0
-    last_weave_seen = last_seen
-    last_weave_result: dict[str, Any] = {}
-    maintenance_runs = 0
-    maintenance_failures = 0
-    last_maintenance = 0.0
-    last_maintenance_result: dict[str, Any] = {}
-    last_error_kind = "none"
-
-    while True:
-        cycles += 1
-        now = time.time()
-        want_weave = False
-
-        if now - last_pull >= pull_interval:
-            last_pull_result = run_sync_with_retry(
-                runner=sync_git,
-                paths=paths,
-                schema_sql_path=schema_sql_path,
-                mode="github-pull",
-                remote_name=remote_name,
-                branch=branch,
-                remote_url=remote_url,
-                oauth_token_file=oauth_token_file,
-                sync_include_layers=sync_include_layers,
-                sync_include_jsonl=bool(sync_include_jsonl),
-                max_attempts=retry_max_attempts,
-                initial_backoff=retry_initial_backoff,
-                max_backoff=retry_max_backoff,
-            )
-            if last_pull_result.get("ok"):
-                last_reindex_result = reindex_from_jsonl(paths, schema_sql_path, reset=True)
-                if not last_reindex_result.get("ok"):
-                    reindex_failures += 1
-                    last_error_kind = "unknown"
-                else:
-                    want_weave = True
-            else:
-                pull_failures += 1
-                last_error_kind = str(last_pull_result.get("error_kind", "unknown"))
-            last_pull = now
-            last_seen = latest_content_mtime(paths)
-
-        current_seen = latest_content_mtime(paths)
-        repo_dirty = _repo_has_pending_sync_changes(paths)
-        if _daemon_should_attempt_push(
-            now=now,
-            last_push_attempt=last_push_attempt,
-            scan_interval=scan_interval,
-            current_seen=current_seen,
-            last_seen=last_seen,
-            repo_dirty=repo_dirty,
-        ):
-            last_push_result = run_sync_with_retry(
-                runner=sync_git,
-                paths=paths,
-                schema_sql_path=schema_sql_path,
-                mode="github-push",
-                remote_name=remote_name,
-                branch=branch,
-                remote_url=remote_url,
-                oauth_token_file=oauth_token_file,
-                sync_include_layers=sync_include_layers,
-                sync_include_jsonl=bool(sync_include_jsonl),
-                max_attempts=retry_max_attempts,
-                initial_backoff=retry_initial_backoff,
-                max_backoff=retry_max_backoff,
-            )
-            if not last_push_result.get("ok"):
-                push_failures += 1
-                last_error_kind = str(last_push_result.get("error_kind", "unknown"))
-            last_seen = latest_content_mtime(paths)
-            last_push_attempt = now
-            want_weave = True
-
-        if weave_enabled:
-            weave_due = (now - last_weave) >= max(30, int(weave_interval))
-            changed_since_weave = current_seen > last_weave_seen
-            if (want_weave and weave_due) or (weave_due and changed_since_weave):
-                try:
-                    last_weave_result = weave_links(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        project_id="",
-                        limit=int(weave_limit),
-                        min_weight=float(weave_min_weight),
-                        max_per_src=int(weave_max_per_src),
-                        include_archive=bool(weave_include_archive),
-                        portable=False,
-                        max_wait_s=float(weave_max_wait_s),
-                        tool="daemon",
-                        session_id="system",
-                    )
-                    if last_weave_result.get("ok"):
-                        weave_runs += 1
-                        last_weave = time.time()
-                        last_weave_seen = latest_content_mtime(paths)
-                    else:
-                        weave_failures += 1
-                except Exception as exc:  # pragma: no cover
-                    weave_failures += 1
-                    last_weave_result = {"ok": False, "error": str(exc)}
+    """Backward-compatible entry point; the daemon loop lives in `omnimem.daemon`."""
+    from .daemon import run_sync_daemon as _run_sync_daemon
 
-        if maintenance_enabled and ((now - last_maintenance) >= max(60, int(maintenance_interval))):
-            try:
-                decay_out = apply_decay(
-                    paths=paths,
-                    schema_sql_path=schema_sql_path,
-                    days=int(maintenance_decay_days),
-                    limit=int(maintenance_decay_limit),
-                    project_id="",
-                    layers=["instant", "short", "long"],
-                    dry_run=False,
-                    tool="daemon",
-                    session_id="system",
-                )
-                prune_out = {"ok": True, "enabled": False, "count": 0, "deleted": 0}
-                if bool(maintenance_prune_enabled):
-                    prune_out = prune_memories(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        days=int(maintenance_prune_days),
-                        limit=int(maintenance_prune_limit),
-                        project_id="",
-                        session_id="",
-                        layers=list(maintenance_prune_layers or ["instant", "short"]),
-                        keep_kinds=list(maintenance_prune_keep_kinds or ["decision", "checkpoint"]),
-                        dry_run=False,
-                        tool="daemon",
-                        actor_session_id="system",
-                    )
-                cons_out = consolidate_memories(
-                    paths=paths,
-                    schema_sql_path=schema_sql_path,
-                    project_id="",
-                    session_id="",
-                    limit=int(maintenance_consolidate_limit),
-                    dry_run=False,
-                    adaptive=True,
-                    adaptive_days=14,
-                    adaptive_q_promote_imp=float(maintenance_adaptive_q_promote_imp),
-                    adaptive_q_promote_conf=float(maintenance_adaptive_q_promote_conf),
-                    adaptive_q_promote_stab=float(maintenance_adaptive_q_promote_stab),
-                    adaptive_q_promote_vol=float(maintenance_adaptive_q_promote_vol),
-                    adaptive_q_demote_vol=float(maintenance_adaptive_q_demote_vol),
-                    adaptive_q_demote_stab=float(maintenance_adaptive_q_demote_stab),
-                    adaptive_q_demote_reuse=float(maintenance_adaptive_q_demote_reuse),
-                    tool="daemon",
-                    actor_session_id="system",
-                )
-                comp_out = compress_hot_sessions(
-                    paths=paths,
-                    schema_sql_path=schema_sql_path,
-                    project_id="",
-                    max_sessions=int(maintenance_compress_sessions),
-                    per_session_limit=120,
-                    min_items=int(maintenance_compress_min_items),
-                    dry_run=False,
-                    tool="daemon",
-                    actor_session_id="system",
-                )
-                distill_items: list[dict[str, Any]] = []
-                if bool(maintenance_distill_enabled):
-                    with _sqlite_connect(paths.sqlite_path, timeout=6.0) as conn_d:
-                        conn_d.row_factory = sqlite3.Row
-                        srows = conn_d.execute(
-                            """
-                            SELECT COALESCE(json_extract(source_json, '$.session_id'), '') AS sid, COUNT(*) AS c
-                            FROM memories
-                            WHERE COALESCE(json_extract(source_json, '$.session_id'), '') != ''
-                              AND kind NOT IN ('retrieve')
-                            GROUP BY sid
-                            ORDER BY c DESC
-                            LIMIT ?
-                            """,
-                            (max(1, int(maintenance_distill_sessions)) * 3,),
-                        ).fetchall()
-                    ds = [
-                        str(r["sid"])
-                        for r in srows
-                        if str(r["sid"]).strip() and str(r["sid"]) not in {"system", "webui-session"}
-                    ][: max(1, int(maintenance_distill_sessions))]
-                    for sid in ds:
-                        try:
-                            d_out = distill_session_memory(
-                                paths=paths,
-                                schema_sql_path=schema_sql_path,
-                                project_id="",
-                                session_id=sid,
-                                limit=140,
-                                min_items=int(maintenance_distill_min_items),
-                                dry_run=False,
-                                semantic_layer="long",
-                                procedural_layer="short",
-                                tool="daemon",
-                                actor_session_id="system",
-                            )
-                            distill_items.append(d_out)
-                        except Exception as exc:  # pragma: no cover
-                            distill_items.append({"ok": False, "session_id": sid, "error": str(exc)})
-                tree_out = {"ok": True, "made": 0, "temporal_links": 0, "distill_links": 0}
-                if bool(maintenance_temporal_tree_enabled):
-                    tree_out = build_temporal_memory_tree(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        project_id="",
-                        days=int(maintenance_temporal_tree_days),
-                        max_sessions=max(6, int(maintenance_compress_sessions) * 4),
-                        per_session_limit=120,
-                        dry_run=False,
-                        tool="daemon",
-                        actor_session_id="system",
-                    )
-                rehearsal_out = {"ok": True, "selected_count": 0}
-                if bool(maintenance_rehearsal_enabled):
-                    rehearsal_out = rehearse_memory_traces(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        project_id="",
-                        days=int(maintenance_rehearsal_days),
-                        limit=int(maintenance_rehearsal_limit),
-                        dry_run=False,
-                        tool="daemon",
-                        actor_session_id="system",
-                    )
-                reflection_out = {"ok": True, "created_count": 0}
-                if bool(maintenance_reflection_enabled):
-                    reflection_out = trigger_reflective_summaries(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        project_id="",
-                        days=int(maintenance_reflection_days),
-                        limit=int(maintenance_reflection_limit),
-                        min_repeats=int(maintenance_reflection_min_repeats),
-                        max_avg_retrieved=float(maintenance_reflection_max_avg_retrieved),
-                        dry_run=False,
-                        tool="daemon",
-                        actor_session_id="system",
-                    )
-                last_maintenance_result = {
-                    "ok": bool(decay_out.get("ok") and prune_out.get("ok") and cons_out.get("ok") and comp_out.get("ok")),
-                    "decay": decay_out,
-                    "prune": {
-                        "enabled": bool(maintenance_prune_enabled),
-                        "days": int(maintenance_prune_days),
-                        "limit": int(maintenance_prune_limit),
-                        "layers": list(maintenance_prune_layers or ["instant", "short"]),
-                        "keep_kinds": list(maintenance_prune_keep_kinds or ["decision", "checkpoint"]),
-                        "candidates": int(prune_out.get("count", 0) or 0),
-                        "deleted": int(prune_out.get("deleted", 0) or 0),
-                        "ok": bool(prune_out.get("ok", True)),
-                    },
-                    "consolidate": {
-                        "promoted": len(cons_out.get("promoted") or []),
-                        "demoted": len(cons_out.get("demoted") or []),
-                        "errors": len(cons_out.get("errors") or []),
-                    },
-                    "compress": {
-                        "sessions": len(comp_out.get("sessions") or []),
-                        "compressed": len([x for x in (comp_out.get("items") or []) if x.get("compressed")]),
-                    },
-                    "distill": {
-                        "enabled": bool(maintenance_distill_enabled),
-                        "sessions": len(distill_items),
-                        "distilled": len([x for x in distill_items if x.get("distilled")]),
-                        "errors": len([x for x in distill_items if not x.get("ok")]),
-                    },
-                    "temporal_tree": {
-                        "enabled": bool(maintenance_temporal_tree_enabled),
-                        "days": int(maintenance_temporal_tree_days),
-                        "made": int(tree_out.get("made", 0) or 0),
-                        "temporal_links": int(tree_out.get("temporal_links", 0) or 0),
-                        "distill_links": int(tree_out.get("distill_links", 0) or 0),
-                        "ok": bool(tree_out.get("ok", True)),
-                    },
-                    "rehearsal": {
-                        "enabled": bool(maintenance_rehearsal_enabled),
-                        "days": int(maintenance_rehearsal_days),
-                        "limit": int(maintenance_rehearsal_limit),
-                        "selected": int(rehearsal_out.get("selected_count", 0) or len(rehearsal_out.get("selected") or [])),
-                        "ok": bool(rehearsal_out.get("ok", True)),
-                    },
-                    "reflection": {
-                        "enabled": bool(maintenance_reflection_enabled),
-                        "days": int(maintenance_reflection_days),
-                        "limit": int(maintenance_reflection_limit),
-                        "min_repeats": int(maintenance_reflection_min_repeats),
-                        "max_avg_retrieved": float(maintenance_reflection_max_avg_retrieved),
-                        "created": int(reflection_out.get("created_count", 0) or len(reflection_out.get("created") or [])),
-                        "ok": bool(reflection_out.get("ok", True)),
-                    },
-                }
-                maintenance_runs += 1
-                last_maintenance = time.time()
-            except Exception as exc:  # pragma: no cover
-                maintenance_failures += 1
-                last_maintenance_result = {"ok": False, "error": str(exc)}
-
-        if once:
-            break
-        time.sleep(max(1, scan_interval))
+    # The explicit keyword-only signature keeps typos failing here; forward it verbatim.
+    return _run_sync_daemon(**locals())
 
-    ok = pull_failures == 0 and push_failures == 0 and reindex_failures == 0
-    result = {
-        "ok": ok,
-        "cycles": cycles,
-        "mode": "once" if once else "daemon",
-        "pull_failures": pull_failures,
-        "push_failures": push_failures,
-        "reindex_failures": reindex_failures,
-        "last_pull": last_pull_result,
-        "last_push": last_push_result,
-        "last_reindex": last_reindex_result,
-        "weave": {
-            "enabled": bool(weave_enabled),
-            "interval": int(weave_interval),
-            "runs": weave_runs,
-            "failures": weave_failures,
-            "last_weave_at": last_weave,
-            "last_result": last_weave_result,
-        },
-        "maintenance": {
-            "enabled": bool(maintenance_enabled),
-            "interval": int(maintenance_interval),
-            "runs": maintenance_runs,
-            "failures": maintenance_failures,
-            "last_run_at": last_maintenance,
-            "last_result": last_maintenance_result,
-        },
-        "last_error_kind": last_error_kind,
-        "remediation_hint": sync_error_hint(last_error_kind),
-        "retry": {
-            "max_attempts": max(1, int(retry_max_attempts)),
-            "initial_backoff": max(1, int(retry_initial_backoff)),
-            "max_backoff": max(1, int(retry_max_backoff)),
-        },
-        "push_strategy": {
-            "mode": "mtime_or_dirty",
-            "push_check_interval": max(3, min(60, int(scan_interval))),
-        },
-    }
-    log_system_event(paths, schema_sql_path, "memory.sync", {"daemon": result}, portable=False)
-    return result
 
 # --- Semantic Search Extension Hook ---
 # This serves as a lightweight integration point for vector search.
@@ -4,168 +4,214 @@ import json
 import os
 import sqlite3
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable
 
+try:  # pragma: no cover
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None  # type: ignore[assignment,misc]
 
 from .core import (
+    INTERNAL_SESSION_IDS,
     MemoryPaths,
+    _daemon_should_attempt_push,
+    _git_cat_file_session,
+    _repo_has_pending_sync_changes,
     _sqlite_connect,
     apply_decay,
+    build_temporal_memory_tree,
+    classify_sync_error,
     compress_hot_sessions,
     compress_session_context,
     consolidate_memories,
+    distill_session_memory,
     ensure_storage,
+    ensure_system_memory,
+    latest_content_mtime,
     list_core_blocks,
     log_system_event,
     prune_memories,
+    rehearse_memory_traces,
+    reindex_from_jsonl,
+    reindex_from_jsonl_partial,
     resolve_paths,
+    run_sync_with_retry,
+    should_retry_sync_error,
+    sync_error_hint,
     sync_git,
+    trigger_reflective_summaries,
     update_memory_content,
     utc_now,
     verify_storage,
+    weave_links,
 )
 
-def _daemon_should_attempt_push(
-    *,
-    now: float,
-    last_push_attempt: float,
-    scan_interval: int,
-    current_seen: float,
-    last_seen: float,
-    repo_dirty: bool,
-) -> bool:
-    push_every = max(3, min(60, int(scan_interval)))
-    if now - float(last_push_attempt) < float(push_every):
-        return False
-    return bool(current_seen > last_seen or repo_dirty)
-
-
-def classify_sync_error(message: str, detail: Any = "") -> str:
-    text = f"{message}\n{detail}".lower()
-
-    auth_hints = [
-        "authentication failed",
-        "fatal: authentication",
-        "bad credentials",
-        "permission denied (publickey)",
-        "could not read username",
-        "access denied",
-        "unauthorized",
-    ]
-    if any(x in text for x in auth_hints):
-        return "auth"
-
-    network_hints = [
-        "could not resolve host",
-        "network is unreachable",
-        "connection timed out",
-        "connection reset",
-        "failed to connect",
-        "temporary failure",
-        "name or service not known",
-        "proxy error",
-        "tls",
-        "ssl",
-    ]
-    if any(x in text for x in network_hints):
-        return "network"
-
-    conflict_hints = [
-        "conflict",
-        "merge conflict",
-        "could not apply",
-        "non-fast-forward",
-        "fetch first",
-        "needs merge",
-        "would be overwritten",
-        "rebase",
-    ]
-    if any(x in text for x in conflict_hints):
-        return "conflict"
-
-    return "unknown"
-
-
-def should_retry_sync_error(error_kind: str) -> bool:
-    # Authentication and merge-conflict failures usually require manual action.
-    return error_kind in {"network", "unknown"}
-
-
-def sync_error_hint(error_kind: str) -> str:
-    if error_kind == "auth":
-        return "Authentication failed. Verify credential refs/token/SSH key and run sync again."
-    if error_kind == "network":
-        return "Network issue detected. Check connectivity/DNS/proxy, then retry sync."
-    if error_kind == "conflict":
-        return (
-            "Sync conflict detected. Run `omnimem sync --mode github-status`, resolve Git conflicts, "
-            "then run `omnimem sync --mode github-pull` and `omnimem sync --mode github-push`."
-        )
-    if error_kind == "unknown":
-        return "Unknown sync failure. Inspect logs and Git status, then retry with conservative settings."
-    return ""
-
-
-def run_sync_with_retry(
-    *,
-    runner,
-    paths: MemoryPaths,
-    schema_sql_path: Path,
-    mode: str,
-    remote_name: str,
-    branch: str,
-    remote_url: str | None,
-    oauth_token_file: str | None = None,
-    sync_include_layers: list[str] | None = None,
-    sync_include_jsonl: bool = True,
-    max_attempts: int = 3,
-    initial_backoff: int = 1,
-    max_backoff: int = 8,
-    sleep_fn=time.sleep,
-) -> dict[str, Any]:
-    attempts = max(1, int(max_attempts))
-    backoff = max(1, int(initial_backoff))
-    cap = max(backoff, int(max_backoff))
-    last_out: dict[str, Any] = {"ok": False, "mode": mode, "message": "sync retry not executed"}
 
-    for i in range(1, attempts + 1):
+_DECAY_LAYERS = ("instant", "short", "long")
+_PRUNE_LAYERS = ("instant", "short")
+_PRUNE_KEEP_KINDS = ("decision", "checkpoint")
+# Coalesce bursts (a memory write touches JSONL and Markdown) into one wakeup.
+_WATCH_DEBOUNCE_S = 0.5
+# Upper bound on how long an idle daemon trusts the content sentinel before walking the tree.
+_CONTENT_FULL_WALK_S = 60.0
+
+
+class _WakeOnChange(FileSystemEventHandler):  # type: ignore[misc,valid-type]
+    def __init__(self, wake: threading.Event) -> None:
+        super().__init__()
+        self.wake = wake
+
+    def on_any_event(self, event: Any) -> None:
+        self.wake.set()
+
+
+class _ContentWatcher:
+    """Edge-triggered wait on the memory content dirs (the `watch` extra); plain polling without watchdog."""
+
+    def __init__(self, roots: list[Path]) -> None:
+        self.roots = roots
+        self.wake = threading.Event()
+        self._observer: Any = None
+        # True while every root is under watch, i.e. a quiet wait really means "no changes".
+        self.live = False
+
+    def start(self) -> bool:
+        if Observer is None:
+            return False
         try:
-            out = runner(
-                paths,
-                schema_sql_path,
-                mode,
-                remote_name=remote_name,
-                branch=branch,
-                remote_url=remote_url,
-                oauth_token_file=oauth_token_file,
-                sync_include_layers=sync_include_layers,
-                sync_include_jsonl=bool(sync_include_jsonl),
-                log_event=False,
-            )
-        except Exception as exc:  # pragma: no cover
-            out = {"ok": False, "mode": mode, "message": f"sync runner error: {exc}"}
+            observer = Observer()
+            handler = _WakeOnChange(self.wake)
+            watched = 0
+            for root in self.roots:
+                if root.exists():
+                    observer.schedule(handler, str(root), recursive=True)
+                    watched += 1
+            observer.daemon = True
+            observer.start()
+        except Exception:  # pragma: no cover
+            return False
+        self._observer = observer
+        self.live = watched == len(self.roots)
+        return True
 
-        out = dict(out)
-        out["attempts"] = i
-        if out.get("ok"):
-            out["error_kind"] = "none"
-            out["retryable"] = False
-            return out
+    def wait(self, timeout: float) -> bool:
+        fired = self.wake.wait(timeout)
+        if fired:
+            time.sleep(_WATCH_DEBOUNCE_S)
+        self.wake.clear()
+        return fired
 
-        error_kind = classify_sync_error(str(out.get("message", "")), out.get("detail", ""))
-        out["error_kind"] = error_kind
-        out["retryable"] = should_retry_sync_error(error_kind)
-        last_out = out
-        if not out.get("retryable", False):
-            break
-        if i < attempts:
-            sleep_fn(backoff)
-            backoff = min(cap, backoff * 2)
+    def stop(self) -> None:
+        observer = self._observer
+        self._observer = None
+        self.live = False
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=2.0)
 
-    return last_out
+
+def _content_sentinel(paths: MemoryPaths) -> tuple[Any, ...]:
+    sig: list[Any] = []
+    for root in (paths.markdown_root, paths.jsonl_root):
+        try:
+            sig.append(root.stat().st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    try:
+        with os.scandir(paths.jsonl_root) as it:
+            for entry in it:
+                if entry.is_file():
+                    info = entry.stat()
+                    sig.append((entry.name, info.st_mtime_ns, info.st_size))
+    except OSError:
+        pass
+    return tuple(sig)
+
+
+class _ContentProbe:
+    """`latest_content_mtime` that skips the tree walk on idle cycles.
+
+    Every OmniMem write appends to a JSONL event file, so the root dir mtimes plus the stat of
+    the (few, flat) JSONL files tell whether anything changed. Hand edits to Markdown are only
+    seen by a full walk, forced by the watcher or at most `_CONTENT_FULL_WALK_S` apart. When a
+    live watcher stayed quiet, even the sentinel probe is skipped until the next periodic walk.
+    """
+
+    def __init__(self, paths: MemoryPaths) -> None:
+        self.paths = paths
+        self._sig: tuple[Any, ...] | None = None
+        self._value = 0.0
+        self._walked_at = 0.0
+
+    def scan(self, now: float, *, force: bool = False, quiet: bool = False) -> float:
+        if quiet and not force and self._sig is not None and now - self._walked_at < _CONTENT_FULL_WALK_S:
+            return self._value
+        sig = _content_sentinel(self.paths)
+        if force or sig != self._sig or now - self._walked_at >= _CONTENT_FULL_WALK_S:
+            self._value = latest_content_mtime(self.paths)
+            self._sig = sig
+            self._walked_at = now
+        return self._value
+
+    @property
+    def next_full_walk(self) -> float:
+        """When the periodic walk (the safety net for dropped watcher events) is next due."""
+        return self._walked_at + _CONTENT_FULL_WALK_S
+
+
+def _daemon_idle_timeout(now: float, wait_s: float, deadlines: list[float]) -> float:
+    """Sleep until the earliest timed job is due, but never less than one scan interval."""
+    return max(float(wait_s), min(deadlines, default=now) - now)
+
+
+def _reindex_after_pull(paths: MemoryPaths, schema_sql_path: Path, pull_result: dict[str, Any]) -> dict[str, Any]:
+    # No event here: this may run on a worker while push holds repo_lock, which log_system_event
+    # also takes. The loop logs the result once push is done (see _log_reindex).
+    changed = pull_result.get("changed_paths")
+    if isinstance(changed, list):
+        return reindex_from_jsonl_partial(paths, schema_sql_path, only=changed, log_event=False)
+    return reindex_from_jsonl(paths, schema_sql_path, reset=True, log_event=False)
+
+
+def _log_reindex(paths: MemoryPaths, schema_sql_path: Path, result: dict[str, Any]) -> None:
+    # Device-local: the push has already committed, so a portable append would leave the tree
+    # dirty and cost an extra commit next cycle.
+    log_system_event(paths, schema_sql_path, "memory.update", {"action": "reindex", **result}, portable=False)
+
+
+@dataclass
+class _DaemonState:
+    """Counters and last results carried across `run_sync_daemon` cycles."""
+
+    last_seen: float = 0.0
+    last_pull: float = 0.0
+    last_push_attempt: float = 0.0
+    cycles: int = 0
+    pull_failures: int = 0
+    push_failures: int = 0
+    reindex_failures: int = 0
+    last_pull_result: dict[str, Any] = field(default_factory=dict)
+    last_push_result: dict[str, Any] = field(default_factory=dict)
+    last_reindex_result: dict[str, Any] = field(default_factory=dict)
+    weave_runs: int = 0
+    weave_failures: int = 0
+    last_weave: float = 0.0
+    last_weave_seen: float = 0.0
+    last_weave_result: dict[str, Any] = field(default_factory=dict)
+    maintenance_runs: int = 0
+    maintenance_failures: int = 0
+    last_maintenance: float = 0.0
+    last_maintenance_result: dict[str, Any] = field(default_factory=dict)
+    last_error_kind: str = "none"
 
 
 def run_sync_daemon(
@@ -226,349 +272,441 @@ def run_sync_daemon(
 ) -> dict[str, Any]:
     ensure_storage(paths, schema_sql_path)
     ensure_system_memory(paths, schema_sql_path)
-    last_seen = latest_content_mtime(paths)
-    last_pull = 0.0
-    last_push_attempt = 0.0
-    cycles = 0
-    pull_failures = 0
-    push_failures = 0
-    reindex_failures = 0
-    last_pull_result: dict[str, Any] = {}
-    last_push_result: dict[str, Any] = {}
-    last_reindex_result: dict[str, Any] = {}
-    weave_runs = 0
-    weave_failures = 0
-    last_weave = 0.0
-    last_weave_seen = last_seen
-    last_weave_result: dict[str, Any] = {}
-    maintenance_runs = 0
-    maintenance_failures = 0
-    last_maintenance = 0.0
-    last_maintenance_result: dict[str, Any] = {}
-    last_error_kind = "none"
-
-    while True:
-        cycles += 1
-        now = time.time()
-        want_weave = False
-
-        if now - last_pull >= pull_interval:
-            last_pull_result = run_sync_with_retry(
-                runner=sync_git,
-                paths=paths,
-                schema_sql_path=schema_sql_path,
-                mode="github-pull",
-                remote_name=remote_name,
-                branch=branch,
-                remote_url=remote_url,
-                oauth_token_file=oauth_token_file,
-                sync_include_layers=sync_include_layers,
-                sync_include_jsonl=bool(sync_include_jsonl),
-                max_attempts=retry_max_attempts,
-                initial_backoff=retry_initial_backoff,
-                max_backoff=retry_max_backoff,
-            )
-            if last_pull_result.get("ok"):
-                last_reindex_result = reindex_from_jsonl(paths, schema_sql_path, reset=True)
-                if not last_reindex_result.get("ok"):
-                    reindex_failures += 1
-                    last_error_kind = "unknown"
-                else:
-                    want_weave = True
-            else:
-                pull_failures += 1
-                last_error_kind = str(last_pull_result.get("error_kind", "unknown"))
-            last_pull = now
-            last_seen = latest_content_mtime(paths)
-
-        current_seen = latest_content_mtime(paths)
-        repo_dirty = _repo_has_pending_sync_changes(paths)
-        if _daemon_should_attempt_push(
-            now=now,
-            last_push_attempt=last_push_attempt,
-            scan_interval=scan_interval,
-            current_seen=current_seen,
-            last_seen=last_seen,
-            repo_dirty=repo_dirty,
-        ):
-            last_push_result = run_sync_with_retry(
-                runner=sync_git,
-                paths=paths,
-                schema_sql_path=schema_sql_path,
-                mode="github-push",
-                remote_name=remote_name,
-                branch=branch,
-                remote_url=remote_url,
-                oauth_token_file=oauth_token_file,
-                sync_include_layers=sync_include_layers,
-                sync_include_jsonl=bool(sync_include_jsonl),
-                max_attempts=retry_max_attempts,
-                initial_backoff=retry_initial_backoff,
-                max_backoff=retry_max_backoff,
-            )
-            if not last_push_result.get("ok"):
-                push_failures += 1
-                last_error_kind = str(last_push_result.get("error_kind", "unknown"))
-            last_seen = latest_content_mtime(paths)
-            last_push_attempt = now
-            want_weave = True
-
-        if weave_enabled:
-            weave_due = (now - last_weave) >= max(30, int(weave_interval))
-            changed_since_weave = current_seen > last_weave_seen
-            if (want_weave and weave_due) or (weave_due and changed_since_weave):
-                try:
-                    last_weave_result = weave_links(
-                        paths=paths,
-                        schema_sql_path=schema_sql_path,
-                        project_id="",
-                        limit=int(weave_limit),
-                        min_weight=float(weave_min_weight),
-                        max_per_src=int(weave_max_per_src),
-                        include_archive=bool(weave_include_archive),
-                        portable=False,
-                        max_wait_s=float(weave_max_wait_s),
-                        tool="daemon",
-                        session_id="system",
-                    )
-                    if last_weave_result.get("ok"):
-                        weave_runs += 1
-                        last_weave = time.time()
-                        last_weave_seen = latest_content_mtime(paths)
-                    else:
-                        weave_failures += 1
-                except Exception as exc:  # pragma: no cover
-                    weave_failures += 1
-                    last_weave_result = {"ok": False, "error": str(exc)}
+    probe = _ContentProbe(paths)
+    st = _DaemonState(last_seen=probe.scan(time.time(), force=True))
+    st.last_weave_seen = st.last_seen
+    watcher = _ContentWatcher([paths.markdown_root, paths.jsonl_root])
 
-        if maintenance_enabled and ((now - last_maintenance) >= max(60, int(maintenance_interval))):
-            try:
-                decay_out = apply_decay(
-                    paths=paths,
-                    schema_sql_path=schema_sql_path,
-                    days=int(maintenance_decay_days),
-                    limit=int(maintenance_decay_limit),
-                    project_id="",
-                    layers=["instant", "short", "long"],
-                    dry_run=False,
-                    tool="daemon",
-                    session_id="system",
-                )
-                prune_out = {"ok": True, "enabled": False, "count": 0, "deleted": 0}
-                if bool(maintenance_prune_enabled):
-                    prune_out = prune_memories(
+    # Normalize loop-invariant knobs once instead of re-casting them every cycle.
+    wait_s = max(1, scan_interval)
+    weave_every = max(30, int(weave_interval))
+    maintenance_every = max(60, int(maintenance_interval))
+    weave_limit = int(weave_limit)
+    weave_min_weight = float(weave_min_weight)
+    weave_max_per_src = int(weave_max_per_src)
+    weave_max_wait_s = float(weave_max_wait_s)
+    weave_include_archive = bool(weave_include_archive)
+    maintenance_decay_days = int(maintenance_decay_days)
+    maintenance_decay_limit = int(maintenance_decay_limit)
+    maintenance_prune_enabled = bool(maintenance_prune_enabled)
+    maintenance_prune_days = int(maintenance_prune_days)
+    maintenance_prune_limit = int(maintenance_prune_limit)
+    prune_layers = tuple(maintenance_prune_layers or _PRUNE_LAYERS)
+    prune_keep_kinds = tuple(maintenance_prune_keep_kinds or _PRUNE_KEEP_KINDS)
+    maintenance_consolidate_limit = int(maintenance_consolidate_limit)
+    maintenance_compress_sessions = int(maintenance_compress_sessions)
+    maintenance_compress_min_items = int(maintenance_compress_min_items)
+    maintenance_distill_enabled = bool(maintenance_distill_enabled)
+    distill_sessions = max(1, int(maintenance_distill_sessions))
+    maintenance_distill_min_items = int(maintenance_distill_min_items)
+    maintenance_temporal_tree_enabled = bool(maintenance_temporal_tree_enabled)
+    maintenance_temporal_tree_days = int(maintenance_temporal_tree_days)
+    tree_max_sessions = max(6, maintenance_compress_sessions * 4)
+    maintenance_rehearsal_enabled = bool(maintenance_rehearsal_enabled)
+    maintenance_rehearsal_days = int(maintenance_rehearsal_days)
+    maintenance_rehearsal_limit = int(maintenance_rehearsal_limit)
+    maintenance_reflection_enabled = bool(maintenance_reflection_enabled)
+    maintenance_reflection_days = int(maintenance_reflection_days)
+    maintenance_reflection_limit = int(maintenance_reflection_limit)
+    maintenance_reflection_min_repeats = int(maintenance_reflection_min_repeats)
+    maintenance_reflection_max_avg_retrieved = float(maintenance_reflection_max_avg_retrieved)
+    maintenance_adaptive_q_promote_imp = float(maintenance_adaptive_q_promote_imp)
+    maintenance_adaptive_q_promote_conf = float(maintenance_adaptive_q_promote_conf)
+    maintenance_adaptive_q_promote_stab = float(maintenance_adaptive_q_promote_stab)
+    maintenance_adaptive_q_promote_vol = float(maintenance_adaptive_q_promote_vol)
+    maintenance_adaptive_q_demote_vol = float(maintenance_adaptive_q_demote_vol)
+    maintenance_adaptive_q_demote_stab = float(maintenance_adaptive_q_demote_stab)
+    maintenance_adaptive_q_demote_reuse = float(maintenance_adaptive_q_demote_reuse)
+
+    # The watcher thread and the long-lived `git cat-file --batch` (which answers every pull's
+    # ref probes) are torn down however the loop exits.
+    plumbing = ExitStack()
+    plumbing.callback(watcher.stop)
+    try:
+        if not once:
+            watcher.start()
+        plumbing.enter_context(_git_cat_file_session(paths))
+
+        woke = False
+        while True:
+            st.cycles += 1
+            now = time.time()
+            want_weave = False
+            quiet = watcher.live and not woke
+
+            pulled = False
+            pull_attempted = now - st.last_pull >= pull_interval
+            if pull_attempted:
+                # The fetch is network-bound and the content walk is disk-bound: overlap them.
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix="omnimem-pull") as pull_pool:
+                    pull_job = pull_pool.submit(
+                        run_sync_with_retry,
+                        runner=sync_git,
                         paths=paths,
                         schema_sql_path=schema_sql_path,
-                        days=int(maintenance_prune_days),
-                        limit=int(maintenance_prune_limit),
-                        project_id="",
-                        session_id="",
-                        layers=list(maintenance_prune_layers or ["instant", "short"]),
-                        keep_kinds=list(maintenance_prune_keep_kinds or ["decision", "checkpoint"]),
-                        dry_run=False,
-                        tool="daemon",
-                        actor_session_id="system",
+                        mode="github-pull",
+                        remote_name=remote_name,
+                        branch=branch,
+                        remote_url=remote_url,
+                        oauth_token_file=oauth_token_file,
+                        sync_include_layers=sync_include_layers,
+                        sync_include_jsonl=bool(sync_include_jsonl),
+                        max_attempts=retry_max_attempts,
+                        initial_backoff=retry_initial_backoff,
+                        max_backoff=retry_max_backoff,
+                        include_detail=False,
                     )
-                cons_out = consolidate_memories(
-                    paths=paths,
-                    schema_sql_path=schema_sql_path,
-                    project_id="",
-                    session_id="",
-                    limit=int(maintenance_consolidate_limit),
-                    dry_run=False,
-                    adaptive=True,
-                    adaptive_days=14,
-                    adaptive_q_promote_imp=float(maintenance_adaptive_q_promote_imp),
-                    adaptive_q_promote_conf=float(maintenance_adaptive_q_promote_conf),
-                    adaptive_q_promote_stab=float(maintenance_adaptive_q_promote_stab),
-                    adaptive_q_promote_vol=float(maintenance_adaptive_q_promote_vol),
-                    adaptive_q_demote_vol=float(maintenance_adaptive_q_demote_vol),
-                    adaptive_q_demote_stab=float(maintenance_adaptive_q_demote_stab),
-                    adaptive_q_demote_reuse=float(maintenance_adaptive_q_demote_reuse),
-                    tool="daemon",
-                    actor_session_id="system",
-                )
-                comp_out = compress_hot_sessions(
+                    current_seen = probe.scan(now, force=woke, quiet=quiet)
+                    st.last_pull_result = pull_job.result()
+                if st.last_pull_result.get("ok"):
+                    pulled = True
+                else:
+                    st.pull_failures += 1
+                    st.last_error_kind = str(st.last_pull_result.get("error_kind", "unknown"))
+                st.last_pull = now
+                if not pulled or st.last_pull_result.get("changed_paths") != []:
+                    # The pull may have rewritten files during the walk; rescan so the baseline
+                    # covers them and they are not mistaken for local edits.
+                    current_seen = probe.scan(time.time(), force=True)
+            else:
+                current_seen = probe.scan(now, force=woke, quiet=quiet)
+            # After a pull attempt the same scan becomes the new baseline.
+            if pull_attempted:
+                st.last_seen = current_seen
+            repo_dirty = _repo_has_pending_sync_changes(paths)
+            push_due = _daemon_should_attempt_push(
+                now=now,
+                last_push_attempt=st.last_push_attempt,
+                scan_interval=scan_interval,
+                current_seen=current_seen,
+                last_seen=st.last_seen,
+                repo_dirty=repo_dirty,
+            )
+            reindex_pool: ThreadPoolExecutor | None = None
+            reindex_job = None
+            if pulled:
+                if push_due:
+                    # Without its event, reindex writes only SQLite while push works on the Git tree,
+                    # so let them overlap instead of paying reindex + push back to back.
+                    reindex_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="omnimem-reindex")
+                    reindex_job = reindex_pool.submit(_reindex_after_pull, paths, schema_sql_path, st.last_pull_result)
+                else:
+                    st.last_reindex_result = _reindex_after_pull(paths, schema_sql_path, st.last_pull_result)
+            if push_due:
+                st.last_push_result = run_sync_with_retry(
+                    runner=sync_git,
                     paths=paths,
                     schema_sql_path=schema_sql_path,
-                    project_id="",
-                    max_sessions=int(maintenance_compress_sessions),
-                    per_session_limit=120,
-                    min_items=int(maintenance_compress_min_items),
-                    dry_run=False,
-                    tool="daemon",
-                    actor_session_id="system",
+                    mode="github-push",
+                    remote_name=remote_name,
+                    branch=branch,
+                    remote_url=remote_url,
+                    oauth_token_file=oauth_token_file,
+                    sync_include_layers=sync_include_layers,
+                    sync_include_jsonl=bool(sync_include_jsonl),
+                    max_attempts=retry_max_attempts,
+                    initial_backoff=retry_initial_backoff,
+                    max_backoff=retry_max_backoff,
+                    include_detail=False,
                 )
-                distill_items: list[dict[str, Any]] = []
-                if bool(maintenance_distill_enabled):
-                    with _sqlite_connect(paths.sqlite_path, timeout=6.0) as conn_d:
-                        conn_d.row_factory = sqlite3.Row
-                        srows = conn_d.execute(
-                            """
-                            SELECT COALESCE(json_extract(source_json, '$.session_id'), '') AS sid, COUNT(*) AS c
-                            FROM memories
-                            WHERE COALESCE(json_extract(source_json, '$.session_id'), '') != ''
-                              AND kind NOT IN ('retrieve')
-                            GROUP BY sid
-                            ORDER BY c DESC
-                            LIMIT ?
-                            """,
-                            (max(1, int(maintenance_distill_sessions)) * 3,),
-                        ).fetchall()
-                    ds = [
-                        str(r["sid"])
-                        for r in srows
-                        if str(r["sid"]).strip() and str(r["sid"]) not in {"system", "webui-session"}
-                    ][: max(1, int(maintenance_distill_sessions))]
-                    for sid in ds:
-                        try:
-                            d_out = distill_session_memory(
-                                paths=paths,
-                                schema_sql_path=schema_sql_path,
-                                project_id="",
-                                session_id=sid,
-                                limit=140,
-                                min_items=int(maintenance_distill_min_items),
-                                dry_run=False,
-                                semantic_layer="long",
-                                procedural_layer="short",
-                                tool="daemon",
-                                actor_session_id="system",
-                            )
-                            distill_items.append(d_out)
-                        except Exception as exc:  # pragma: no cover
-                            distill_items.append({"ok": False, "session_id": sid, "error": str(exc)})
-                tree_out = {"ok": True, "made": 0, "temporal_links": 0, "distill_links": 0}
-                if bool(maintenance_temporal_tree_enabled):
-                    tree_out = build_temporal_memory_tree(
+                if not st.last_push_result.get("ok"):
+                    st.push_failures += 1
+                    st.last_error_kind = str(st.last_push_result.get("error_kind", "unknown"))
+                st.last_push_attempt = now
+                want_weave = True
+            if reindex_pool is not None and reindex_job is not None:
+                try:
+                    st.last_reindex_result = reindex_job.result()
+                except Exception as exc:  # pragma: no cover
+                    st.last_reindex_result = {"ok": False, "error": str(exc)}
+                finally:
+                    reindex_pool.shutdown(wait=True)
+            if pulled:
+                if not st.last_reindex_result.get("ok"):
+                    st.reindex_failures += 1
+                    st.last_error_kind = "unknown"
+                else:
+                    _log_reindex(paths, schema_sql_path, st.last_reindex_result)
+                    want_weave = True
+            if pulled or push_due:
+                # Reindex/push write JSONL events of their own; absorb them into the baseline.
+                st.last_seen = probe.scan(time.time(), force=True)
+
+            if weave_enabled:
+                weave_due = (now - st.last_weave) >= weave_every
+                changed_since_weave = current_seen > st.last_weave_seen
+                if (want_weave and weave_due) or (weave_due and changed_since_weave):
+                    try:
+                        st.last_weave_result = weave_links(
+                            paths=paths,
+                            schema_sql_path=schema_sql_path,
+                            project_id="",
+                            limit=weave_limit,
+                            min_weight=weave_min_weight,
+                            max_per_src=weave_max_per_src,
+                            include_archive=weave_include_archive,
+                            portable=False,
+                            max_wait_s=weave_max_wait_s,
+                            tool="daemon",
+                            session_id="system",
+                        )
+                        if st.last_weave_result.get("ok"):
+                            st.weave_runs += 1
+                            st.last_weave = time.time()
+                            st.last_weave_seen = probe.scan(time.time(), force=True)
+                        else:
+                            st.weave_failures += 1
+                    except Exception as exc:  # pragma: no cover
+                        st.weave_failures += 1
+                        st.last_weave_result = {"ok": False, "error": str(exc)}
+
+            if maintenance_enabled and ((now - st.last_maintenance) >= maintenance_every):
+                try:
+                    decay_out = apply_decay(
                         paths=paths,
                         schema_sql_path=schema_sql_path,
+                        days=maintenance_decay_days,
+                        limit=maintenance_decay_limit,
                         project_id="",
-                        days=int(maintenance_temporal_tree_days),
-                        max_sessions=max(6, int(maintenance_compress_sessions) * 4),
-                        per_session_limit=120,
+                        layers=_DECAY_LAYERS,
                         dry_run=False,
                         tool="daemon",
-                        actor_session_id="system",
+                        session_id="system",
                     )
-                rehearsal_out = {"ok": True, "selected_count": 0}
-                if bool(maintenance_rehearsal_enabled):
-                    rehearsal_out = rehearse_memory_traces(
+                    prune_out = {"ok": True, "enabled": False, "count": 0, "deleted": 0}
+                    if maintenance_prune_enabled:
+                        prune_out = prune_memories(
+                            paths=paths,
+                            schema_sql_path=schema_sql_path,
+                            days=maintenance_prune_days,
+                            limit=maintenance_prune_limit,
+                            project_id="",
+                            session_id="",
+                            layers=list(prune_layers),
+                            keep_kinds=list(prune_keep_kinds),
+                            dry_run=False,
+                            tool="daemon",
+                            actor_session_id="system",
+                        )
+                    # Consolidate before the steps below so compress/distill/tree/rehearsal see its
+                    # promotions and demotions, and each run's results are deterministic.
+                    cons_out = consolidate_memories(
                         paths=paths,
                         schema_sql_path=schema_sql_path,
                         project_id="",
-                        days=int(maintenance_rehearsal_days),
-                        limit=int(maintenance_rehearsal_limit),
+                        session_id="",
+                        limit=maintenance_consolidate_limit,
                         dry_run=False,
+                        adaptive=True,
+                        adaptive_days=14,
+                        adaptive_q_promote_imp=maintenance_adaptive_q_promote_imp,
+                        adaptive_q_promote_conf=maintenance_adaptive_q_promote_conf,
+                        adaptive_q_promote_stab=maintenance_adaptive_q_promote_stab,
+                        adaptive_q_promote_vol=maintenance_adaptive_q_promote_vol,
+                        adaptive_q_demote_vol=maintenance_adaptive_q_demote_vol,
+                        adaptive_q_demote_stab=maintenance_adaptive_q_demote_stab,
+                        adaptive_q_demote_reuse=maintenance_adaptive_q_demote_reuse,
                         tool="daemon",
                         actor_session_id="system",
                     )
-                reflection_out = {"ok": True, "created_count": 0}
-                if bool(maintenance_reflection_enabled):
-                    reflection_out = trigger_reflective_summaries(
+                    comp_out = compress_hot_sessions(
                         paths=paths,
                         schema_sql_path=schema_sql_path,
                         project_id="",
-                        days=int(maintenance_reflection_days),
-                        limit=int(maintenance_reflection_limit),
-                        min_repeats=int(maintenance_reflection_min_repeats),
-                        max_avg_retrieved=float(maintenance_reflection_max_avg_retrieved),
+                        max_sessions=maintenance_compress_sessions,
+                        per_session_limit=120,
+                        min_items=maintenance_compress_min_items,
                         dry_run=False,
                         tool="daemon",
                         actor_session_id="system",
                     )
-                last_maintenance_result = {
-                    "ok": bool(decay_out.get("ok") and prune_out.get("ok") and cons_out.get("ok") and comp_out.get("ok")),
-                    "decay": decay_out,
-                    "prune": {
-                        "enabled": bool(maintenance_prune_enabled),
-                        "days": int(maintenance_prune_days),
-                        "limit": int(maintenance_prune_limit),
-                        "layers": list(maintenance_prune_layers or ["instant", "short"]),
-                        "keep_kinds": list(maintenance_prune_keep_kinds or ["decision", "checkpoint"]),
-                        "candidates": int(prune_out.get("count", 0) or 0),
-                        "deleted": int(prune_out.get("deleted", 0) or 0),
-                        "ok": bool(prune_out.get("ok", True)),
-                    },
-                    "consolidate": {
-                        "promoted": len(cons_out.get("promoted") or []),
-                        "demoted": len(cons_out.get("demoted") or []),
-                        "errors": len(cons_out.get("errors") or []),
-                    },
-                    "compress": {
-                        "sessions": len(comp_out.get("sessions") or []),
-                        "compressed": len([x for x in (comp_out.get("items") or []) if x.get("compressed")]),
-                    },
-                    "distill": {
-                        "enabled": bool(maintenance_distill_enabled),
-                        "sessions": len(distill_items),
-                        "distilled": len([x for x in distill_items if x.get("distilled")]),
-                        "errors": len([x for x in distill_items if not x.get("ok")]),
-                    },
-                    "temporal_tree": {
-                        "enabled": bool(maintenance_temporal_tree_enabled),
-                        "days": int(maintenance_temporal_tree_days),
-                        "made": int(tree_out.get("made", 0) or 0),
-                        "temporal_links": int(tree_out.get("temporal_links", 0) or 0),
-                        "distill_links": int(tree_out.get("distill_links", 0) or 0),
-                        "ok": bool(tree_out.get("ok", True)),
-                    },
-                    "rehearsal": {
-                        "enabled": bool(maintenance_rehearsal_enabled),
-                        "days": int(maintenance_rehearsal_days),
-                        "limit": int(maintenance_rehearsal_limit),
-                        "selected": int(rehearsal_out.get("selected_count", 0) or len(rehearsal_out.get("selected") or [])),
-                        "ok": bool(rehearsal_out.get("ok", True)),
-                    },
-                    "reflection": {
-                        "enabled": bool(maintenance_reflection_enabled),
-                        "days": int(maintenance_reflection_days),
-                        "limit": int(maintenance_reflection_limit),
-                        "min_repeats": int(maintenance_reflection_min_repeats),
-                        "max_avg_retrieved": float(maintenance_reflection_max_avg_retrieved),
-                        "created": int(reflection_out.get("created_count", 0) or len(reflection_out.get("created") or [])),
-                        "ok": bool(reflection_out.get("ok", True)),
-                    },
-                }
-                maintenance_runs += 1
-                last_maintenance = time.time()
-            except Exception as exc:  # pragma: no cover
-                maintenance_failures += 1
-                last_maintenance_result = {"ok": False, "error": str(exc)}
-
-        if once:
-            break
-        time.sleep(max(1, scan_interval))
-
-    ok = pull_failures == 0 and push_failures == 0 and reindex_failures == 0
+                    distill_items: list[dict[str, Any]] = []
+                    if maintenance_distill_enabled:
+                        with _sqlite_connect(paths.sqlite_path, timeout=6.0) as conn_d:
+                            conn_d.row_factory = sqlite3.Row
+                            srows = conn_d.execute(
+                                """
+                                SELECT COALESCE(json_extract(source_json, '$.session_id'), '') AS sid, COUNT(*) AS c
+                                FROM memories
+                                WHERE COALESCE(json_extract(source_json, '$.session_id'), '') != ''
+                                  AND kind NOT IN ('retrieve')
+                                GROUP BY sid
+                                ORDER BY c DESC
+                                LIMIT ?
+                                """,
+                                (distill_sessions * 3,),
+                            ).fetchall()
+                        ds = [
+                            str(r["sid"])
+                            for r in srows
+                            if str(r["sid"]).strip() and str(r["sid"]) not in INTERNAL_SESSION_IDS
+                        ][:distill_sessions]
+                        for sid in ds:
+                            try:
+                                d_out = distill_session_memory(
+                                    paths=paths,
+                                    schema_sql_path=schema_sql_path,
+                                    project_id="",
+                                    session_id=sid,
+                                    limit=140,
+                                    min_items=maintenance_distill_min_items,
+                                    dry_run=False,
+                                    semantic_layer="long",
+                                    procedural_layer="short",
+                                    tool="daemon",
+                                    actor_session_id="system",
+                                )
+                                distill_items.append(d_out)
+                            except Exception as exc:  # pragma: no cover
+                                distill_items.append({"ok": False, "session_id": sid, "error": str(exc)})
+                    tree_out = {"ok": True, "made": 0, "temporal_links": 0, "distill_links": 0}
+                    if maintenance_temporal_tree_enabled:
+                        tree_out = build_temporal_memory_tree(
+                            paths=paths,
+                            schema_sql_path=schema_sql_path,
+                            project_id="",
+                            days=maintenance_temporal_tree_days,
+                            max_sessions=tree_max_sessions,
+                            per_session_limit=120,
+                            dry_run=False,
+                            tool="daemon",
+                            actor_session_id="system",
+                        )
+                    rehearsal_out = {"ok": True, "selected_count": 0}
+                    if maintenance_rehearsal_enabled:
+                        rehearsal_out = rehearse_memory_traces(
+                            paths=paths,
+                            schema_sql_path=schema_sql_path,
+                            project_id="",
+                            days=maintenance_rehearsal_days,
+                            limit=maintenance_rehearsal_limit,
+                            dry_run=False,
+                            tool="daemon",
+                            actor_session_id="system",
+                        )
+                    reflection_out = {"ok": True, "created_count": 0}
+                    if maintenance_reflection_enabled:
+                        reflection_out = trigger_reflective_summaries(
+                            paths=paths,
+                            schema_sql_path=schema_sql_path,
+                            project_id="",
+                            days=maintenance_reflection_days,
+                            limit=maintenance_reflection_limit,
+                            min_repeats=maintenance_reflection_min_repeats,
+                            max_avg_retrieved=maintenance_reflection_max_avg_retrieved,
+                            dry_run=False,
+                            tool="daemon",
+                            actor_session_id="system",
+                        )
+                    st.last_maintenance_result = {
+                        "ok": bool(decay_out.get("ok") and prune_out.get("ok") and cons_out.get("ok") and comp_out.get("ok")),
+                        "decay": decay_out,
+                        "prune": {
+                            "enabled": maintenance_prune_enabled,
+                            "days": maintenance_prune_days,
+                            "limit": maintenance_prune_limit,
+                            "layers": list(prune_layers),
+                            "keep_kinds": list(prune_keep_kinds),
+                            "candidates": int(prune_out.get("count", 0) or 0),
+                            "deleted": int(prune_out.get("deleted", 0) or 0),
+                            "ok": bool(prune_out.get("ok", True)),
+                        },
+                        "consolidate": {
+                            "promoted": len(cons_out.get("promoted") or ()),
+                            "demoted": len(cons_out.get("demoted") or ()),
+                            "errors": len(cons_out.get("errors") or ()),
+                        },
+                        "compress": {
+                            "sessions": len(comp_out.get("sessions") or ()),
+                            "compressed": sum(1 for x in comp_out.get("items") or () if x.get("compressed")),
+                        },
+                        "distill": {
+                            "enabled": maintenance_distill_enabled,
+                            "sessions": len(distill_items),
+                            "distilled": sum(1 for x in distill_items if x.get("distilled")),
+                            "errors": sum(1 for x in distill_items if not x.get("ok")),
+                        },
+                        "temporal_tree": {
+                            "enabled": maintenance_temporal_tree_enabled,
+                            "days": maintenance_temporal_tree_days,
+                            "made": int(tree_out.get("made", 0) or 0),
+                            "temporal_links": int(tree_out.get("temporal_links", 0) or 0),
+                            "distill_links": int(tree_out.get("distill_links", 0) or 0),
+                            "ok": bool(tree_out.get("ok", True)),
+                        },
+                        "rehearsal": {
+                            "enabled": maintenance_rehearsal_enabled,
+                            "days": maintenance_rehearsal_days,
+                            "limit": maintenance_rehearsal_limit,
+                            "selected": int(rehearsal_out.get("selected_count", 0) or len(rehearsal_out.get("selected") or ())),
+                            "ok": bool(rehearsal_out.get("ok", True)),
+                        },
+                        "reflection": {
+                            "enabled": maintenance_reflection_enabled,
+                            "days": maintenance_reflection_days,
+                            "limit": maintenance_reflection_limit,
+                            "min_repeats": maintenance_reflection_min_repeats,
+                            "max_avg_retrieved": maintenance_reflection_max_avg_retrieved,
+                            "created": int(reflection_out.get("created_count", 0) or len(reflection_out.get("created") or ())),
+                            "ok": bool(reflection_out.get("ok", True)),
+                        },
+                    }
+                    st.maintenance_runs += 1
+                    st.last_maintenance = time.time()
+                except Exception as exc:  # pragma: no cover
+                    st.maintenance_failures += 1
+                    st.last_maintenance_result = {"ok": False, "error": str(exc)}
+
+            if once:
+                break
+            # Interval gates (pull/maintenance/weave) still apply, so a burst of edits only wakes the
+            # loop early; it does not force extra pulls. With nothing left to push and a live watcher
+            # to report edits, sleep straight through to the next timed job instead of polling, but
+            # wake for the periodic walk that catches edits whose watcher events were dropped.
+            timeout = float(wait_s)
+            pending = repo_dirty or current_seen > st.last_seen
+            if push_due and st.last_push_result.get("ok"):
+                pending = False
+            if watcher.live and not pending:
+                deadlines = [st.last_pull + pull_interval, probe.next_full_walk]
+                if weave_enabled and current_seen > st.last_weave_seen:
+                    deadlines.append(st.last_weave + weave_every)
+                if maintenance_enabled:
+                    deadlines.append(st.last_maintenance + maintenance_every)
+                timeout = _daemon_idle_timeout(time.time(), wait_s, deadlines)
+            woke = watcher.wait(timeout)
+    finally:
+        plumbing.close()
+
+    ok = st.pull_failures == 0 and st.push_failures == 0 and st.reindex_failures == 0
     result = {
         "ok": ok,
-        "cycles": cycles,
+        "cycles": st.cycles,
         "mode": "once" if once else "daemon",
-        "pull_failures": pull_failures,
-        "push_failures": push_failures,
-        "reindex_failures": reindex_failures,
-        "last_pull": last_pull_result,
-        "last_push": last_push_result,
-        "last_reindex": last_reindex_result,
+        "pull_failures": st.pull_failures,
+        "push_failures": st.push_failures,
+        "reindex_failures": st.reindex_failures,
+        "last_pull": st.last_pull_result,
+        "last_push": st.last_push_result,
+        "last_reindex": st.last_reindex_result,
         "weave": {
             "enabled": bool(weave_enabled),
             "interval": int(weave_interval),
-            "runs": weave_runs,
-            "failures": weave_failures,
-            "last_weave_at": last_weave,
-            "last_result": last_weave_result,
+            "runs": st.weave_runs,
+            "failures": st.weave_failures,
+            "last_weave_at": st.last_weave,
+            "last_result": st.last_weave_result,
         },
         "maintenance": {
             "enabled": bool(maintenance_enabled),
             "interval": int(maintenance_interval),
-            "runs": maintenance_runs,
-            "failures": maintenance_failures,
-            "last_run_at": last_maintenance,
-            "last_result": last_maintenance_result,
+            "runs": st.maintenance_runs,
+            "failures": st.maintenance_failures,
+            "last_run_at": st.last_maintenance,
+            "last_result": st.last_maintenance_result,
         },
-        "last_error_kind": last_error_kind,
-        "remediation_hint": sync_error_hint(last_error_kind),
+        "last_error_kind": st.last_error_kind,
+        "remediation_hint": sync_error_hint(st.last_error_kind),
         "retry": {
             "max_attempts": max(1, int(retry_max_attempts)),
             "initial_backoff": max(1, int(retry_initial_backoff)),
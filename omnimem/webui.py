@@ -27,6 +27,7 @@ import urllib.request
 from . import __version__ as OMNIMEM_VERSION
 from .core import (
     LAYER_SET,
+    _sqlite_connect,
     analyze_profile_drift,
     apply_decay,
     apply_memory_feedback,
@@ -1211,7 +1212,7 @@ def _filter_items_by_route(paths, items: list[dict[str, Any]], route: str) -> li
     tag = _route_tag(route)
     keep: set[str] = set()
     placeholders = ",".join(["?"] * len(ids))
-    with sqlite3.connect(paths.sqlite_path, timeout=2.0) as conn:
+    with _sqlite_connect(paths.sqlite_path, timeout=2.0) as conn:
         conn.row_factory = sqlite3.Row
         rows = conn.execute(
             f"SELECT id, tags_json FROM memories WHERE id IN ({placeholders})",
@@ -1824,7 +1825,7 @@ def _run_health_check(paths, daemon_state: dict[str, Any]) -> dict[str, Any]:
     db_error = ""
     db_exists = bool(paths.sqlite_path.exists())
     try:
-        with sqlite3.connect(paths.sqlite_path, timeout=2.0) as conn:
+        with _sqlite_connect(paths.sqlite_path, timeout=2.0) as conn:
             conn.execute("SELECT 1").fetchone()
         db_ok = True
     except Exception as exc:
@@ -2462,19 +2463,9 @@ def run_webui(
     def _db_connect():
         # Keep DB waits short so the WebUI stays responsive even if the daemon is doing a heavy write
         # (reindex/weave). Longer waits can cause request threads to pile up.
-        conn = sqlite3.connect(paths.sqlite_path, timeout=1.2)
-        try:
-            conn.execute('PRAGMA busy_timeout = 1200')
-        except Exception:
-            pass
-        conn.row_factory = sqlite3.Row
-        try:
+        with _sqlite_connect(paths.sqlite_path, timeout=1.2) as conn:
+            conn.row_factory = sqlite3.Row
             yield conn
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
     # Micro-cache for expensive aggregations (ThreadingHTTPServer may call handlers concurrently).
     event_stats_cache: dict[tuple[str, str, int], tuple[float, dict[str, Any]]] = {}
@@ -1,20 +1,193 @@
 from __future__ import annotations
 
+import inspect
+import os
+import tempfile
 import unittest
+from contextlib import nullcontext
 from pathlib import Path
+from unittest.mock import patch
 
-from omnimem.daemon import _daemon_should_attempt_push, run_sync_daemon
+from omnimem.daemon import (
+    _ContentProbe,
+    _ContentWatcher,
+    _content_sentinel,
+    _daemon_idle_timeout,
+    _daemon_should_attempt_push,
+    run_sync_daemon,
+)
 from omnimem.core import (
     MemoryPaths,
 
     classify_sync_error,
+    latest_content_mtime,
+    run_sync_daemon as core_run_sync_daemon,
     run_sync_with_retry,
     should_retry_sync_error,
     sync_error_hint,
 )
 
 
+class _StopDaemon(Exception):
+    pass
+
+
+class _StubObserver:
+    """Just enough of watchdog's Observer for _ContentWatcher.start/stop."""
+
+    def __init__(self) -> None:
+        self.scheduled: list[str] = []
+        self.daemon = False
+
+    def schedule(self, handler: object, path: str, recursive: bool = False) -> None:
+        self.scheduled.append(path)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def join(self, timeout: float | None = None) -> None:
+        pass
+
+
 class SyncRetryTest(unittest.TestCase):
+    def test_latest_content_mtime_sees_appends_and_new_files(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="omnimem-mtime-test.") as td:
+            root = Path(td)
+            paths = MemoryPaths(
+                root=root,
+                markdown_root=root / "data" / "markdown",
+                jsonl_root=root / "data" / "jsonl",
+                sqlite_path=root / "data" / "omnimem.db",
+            )
+            md_dir = paths.markdown_root / "short" / "2026" / "02"
+            md_dir.mkdir(parents=True)
+            paths.jsonl_root.mkdir(parents=True)
+            jsonl = paths.jsonl_root / "events-2026-02.jsonl"
+            jsonl.write_text("{}\n", encoding="utf-8")
+            (md_dir / "a.md").write_text("a\n", encoding="utf-8")
+            for p in [jsonl, md_dir / "a.md", md_dir, paths.jsonl_root]:
+                os.utime(p, (1000.0, 1000.0))
+            self.assertEqual(latest_content_mtime(paths), 1000.0)
+
+            # In-place append does not move the directory mtime, but must still be seen.
+            os.utime(jsonl, (2000.0, 2000.0))
+            self.assertEqual(latest_content_mtime(paths), 2000.0)
+
+            (md_dir / "b.md").write_text("b\n", encoding="utf-8")
+            os.utime(md_dir / "b.md", (3000.0, 3000.0))
+            self.assertEqual(latest_content_mtime(paths), 3000.0)
+
+    def test_content_probe_skips_walk_until_sentinel_moves(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="omnimem-probe-test.") as td:
+            root = Path(td)
+            paths = MemoryPaths(
+                root=root,
+                markdown_root=root / "data" / "markdown",
+                jsonl_root=root / "data" / "jsonl",
+                sqlite_path=root / "data" / "omnimem.db",
+            )
+            md_dir = paths.markdown_root / "short"
+            md_dir.mkdir(parents=True)
+            paths.jsonl_root.mkdir(parents=True)
+            jsonl = paths.jsonl_root / "events-2026-02.jsonl"
+            jsonl.write_text("{}\n", encoding="utf-8")
+            (md_dir / "a.md").write_text("a\n", encoding="utf-8")
+            for p in [jsonl, md_dir / "a.md", md_dir, paths.markdown_root, paths.jsonl_root]:
+                os.utime(p, (1000.0, 1000.0))
+            probe = _ContentProbe(paths)
+            self.assertEqual(probe.scan(5000.0), 1000.0)
+
+            # A hand edit to Markdown alone is not seen until a forced or periodic walk.
+            os.utime(md_dir / "a.md", (2000.0, 2000.0))
+            self.assertEqual(probe.scan(5001.0), 1000.0)
+            self.assertEqual(probe.scan(5002.0, force=True), 2000.0)
+
+            # JSONL appends move the sentinel and trigger a walk.
+            os.utime(jsonl, (3000.0, 3000.0))
+            self.assertEqual(probe.scan(5003.0), 3000.0)
+
+            # A quiet live watcher vouches for the tree until the periodic walk is due.
+            os.utime(jsonl, (4000.0, 4000.0))
+            self.assertEqual(probe.scan(5004.0, quiet=True), 3000.0)
+            self.assertEqual(probe.scan(5003.0 + 60.0, quiet=True), 4000.0)
+            # An idle daemon never sleeps past the next periodic walk, however far off its jobs are.
+            self.assertEqual(probe.next_full_walk, 5003.0 + 120.0)
+            self.assertEqual(_daemon_idle_timeout(5063.0, 8, [9000.0, probe.next_full_walk]), 60.0)
+
+    def test_content_watcher_wakes_early_and_times_out(self) -> None:
+        watcher = _ContentWatcher([])
+        self.assertFalse(watcher.wait(0.01))
+        watcher.wake.set()
+        self.assertTrue(watcher.wait(30.0))
+        self.assertFalse(watcher.wake.is_set())
+        watcher.stop()
+
+    def test_content_watcher_is_live_only_when_every_root_is_watched(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="omnimem-watch-test.") as td:
+            roots = [Path(td) / "markdown", Path(td) / "jsonl"]
+            roots[0].mkdir()
+            with patch("omnimem.daemon.Observer", _StubObserver):
+                watcher = _ContentWatcher(roots)
+                self.assertTrue(watcher.start())
+                self.assertFalse(watcher.live)
+                watcher.stop()
+                roots[1].mkdir()
+                self.assertTrue(watcher.start())
+                self.assertTrue(watcher.live)
+                self.assertEqual(watcher._observer.scheduled, [str(r) for r in roots])
+                watcher.stop()
+                self.assertFalse(watcher.live)
+
+    def test_live_watcher_skips_quiet_probes_and_sleeps_to_the_next_deadline(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="omnimem-watch-daemon.") as td:
+            root = Path(td)
+            paths = MemoryPaths(
+                root=root,
+                markdown_root=root / "data" / "markdown",
+                jsonl_root=root / "data" / "jsonl",
+                sqlite_path=root / "data" / "omnimem.db",
+            )
+            schema = Path(__file__).resolve().parent.parent / "db" / "schema.sql"
+            timeouts: list[float] = []
+            probes: list[int] = []
+
+            def wait(self: _ContentWatcher, timeout: float) -> bool:
+                timeouts.append(timeout)
+                probes.append(sentinel.call_count)
+                if len(timeouts) > 1:
+                    raise _StopDaemon
+                return False
+
+            with (
+                patch("omnimem.daemon.Observer", _StubObserver),
+                patch.object(_ContentWatcher, "wait", wait),
+                patch("omnimem.daemon._git_cat_file_session", return_value=nullcontext()),
+                patch("omnimem.daemon._repo_has_pending_sync_changes", return_value=False),
+                patch("omnimem.daemon.run_sync_with_retry", return_value={"ok": True, "changed_paths": []}) as sync,
+                patch("omnimem.daemon._content_sentinel", wraps=_content_sentinel) as sentinel,
+            ):
+                with self.assertRaises(_StopDaemon):
+                    run_sync_daemon(
+                        paths=paths,
+                        schema_sql_path=schema,
+                        remote_name="origin",
+                        branch="main",
+                        remote_url=None,
+                        scan_interval=8,
+                        pull_interval=300,
+                        weave_enabled=False,
+                        maintenance_enabled=False,
+                    )
+            # The second cycle has no pull to rescan after, and trusts the quiet watcher: no probe.
+            self.assertEqual(sync.call_count, 1)
+            self.assertEqual(probes[1], probes[0])
+            # Nothing pending, so the idle wait runs to the periodic full walk, not the scan interval.
+            self.assertGreater(timeouts[0], 50.0)
+            self.assertLessEqual(timeouts[0], 60.0)
+
     def test_daemon_push_trigger_on_repo_dirty(self) -> None:
         self.assertTrue(
             _daemon_should_attempt_push(
@@ -39,6 +212,17 @@ class SyncRetryTest(unittest.TestCase):
             )
         )
 
+    def test_core_run_sync_daemon_keeps_the_daemon_signature(self) -> None:
+        self.assertEqual(inspect.signature(core_run_sync_daemon), inspect.signature(run_sync_daemon))
+        with self.assertRaises(TypeError):
+            core_run_sync_daemon(paths=None, schema_sql_path=None, remote_name="origin", branch="main", remote_url=None, onse=True)
+
+    def test_idle_timeout_sleeps_until_next_timed_job(self) -> None:
+        self.assertEqual(_daemon_idle_timeout(100.0, 8, [130.0, 400.0]), 30.0)
+        # Overdue jobs (e.g. a failed maintenance run) fall back to the scan interval.
+        self.assertEqual(_daemon_idle_timeout(100.0, 8, [130.0, 90.0]), 8.0)
+        self.assertEqual(_daemon_idle_timeout(100.0, 8, []), 8.0)
+
     def test_retry_succeeds_after_transient_failures(self) -> None:
         calls = {"n": 0}
 
@@ -89,6 +273,22 @@ class SyncRetryTest(unittest.TestCase):
         self.assertEqual(out["attempts"], 2)
         self.assertEqual(out["message"], "persistent failure")
 
+    def test_retry_forwards_include_detail_only_when_disabled(self) -> None:
+        seen: list[bool] = []
+
+        def legacy_runner(paths, schema_sql_path, mode, *, remote_name, branch, remote_url, oauth_token_file, sync_include_layers, sync_include_jsonl, log_event):  # noqa: ANN001
+            return {"ok": True, "mode": mode, "message": "ok"}
+
+        def quiet_runner(*args, include_detail: bool = True, **kwargs):  # noqa: ANN002, ANN003
+            seen.append(include_detail)
+            return {"ok": True, "mode": "github-push", "message": "ok"}
+
+        paths = MemoryPaths(Path("."), Path("."), Path("."), Path("tmp.db"))
+        kw = {"paths": paths, "schema_sql_path": Path("db/schema.sql"), "mode": "github-push", "remote_name": "origin", "branch": "main", "remote_url": None}
+        self.assertTrue(run_sync_with_retry(runner=legacy_runner, **kw)["ok"])
+        self.assertTrue(run_sync_with_retry(runner=quiet_runner, include_detail=False, **kw)["ok"])
+        self.assertEqual(seen, [False])
+
     def test_auth_error_should_not_retry(self) -> None:
         calls = {"n": 0}
 
@@ -122,6 +322,9 @@ class SyncRetryTest(unittest.TestCase):
         self.assertEqual(classify_sync_error("could not resolve host: github.com"), "network")
         self.assertEqual(classify_sync_error("non-fast-forward update rejected"), "conflict")
         self.assertEqual(classify_sync_error("unexpected failure"), "unknown")
+        # Class priority wins over match position in the text.
+        self.assertEqual(classify_sync_error("rebase aborted", "fatal: Authentication failed"), "auth")
+        self.assertEqual(classify_sync_error("merge conflict", "SSL certificate problem"), "network")
         self.assertFalse(should_retry_sync_error("auth"))
         self.assertFalse(should_retry_sync_error("conflict"))
         self.assertTrue(should_retry_sync_error("network"))
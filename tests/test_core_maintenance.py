@@ -7,12 +7,16 @@ from pathlib import Path
 
 from omnimem.core import (
     MemoryPaths,
+    apply_decay,
     build_temporal_memory_tree,
+    bump_reuse_counts,
     compress_session_context,
     consolidate_memories,
     distill_session_memory,
     infer_adaptive_governance_thresholds,
+    move_memory_layer,
     prune_memories,
+    reindex_from_jsonl,
     rehearse_memory_traces,
     retrieve_thread,
     trigger_reflective_summaries,
@@ -446,6 +450,26 @@ class CoreMaintenanceTest(unittest.TestCase):
         self.assertLessEqual(len(out.get("items") or []), 6)
         self.assertTrue(any("score=" in " | ".join(x.get("why_recalled") or []) for x in (out.get("items") or [])))
 
+    def test_portable_weave_links_survive_reindex(self) -> None:
+        kw = {"layer": "short", "session_id": "s-weave", "importance": 0.7, "confidence": 0.7, "stability": 0.7, "reuse_count": 1, "volatility": 0.2}
+        for summary in ("weave shared alpha", "weave shared beta", "weave shared gamma"):
+            self._write(summary=summary, **kw)
+        out = weave_links(paths=self.paths, schema_sql_path=self.schema, project_id="OM", portable=True)
+        self.assertTrue(out["ok"])
+        self.assertGreater(out["made"], 1)
+
+        def edges() -> list[tuple]:
+            with sqlite3.connect(self.paths.sqlite_path) as conn:
+                return conn.execute("SELECT src_id, dst_id, link_type, weight FROM memory_links ORDER BY src_id, dst_id").fetchall()
+
+        woven = edges()
+        self.assertEqual(len(woven), out["made"])
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            n_events = conn.execute("SELECT count(*) FROM memory_events WHERE event_type = 'memory.link'").fetchone()[0]
+        self.assertEqual(n_events, out["made"])
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(edges(), woven)
+
     def test_trigger_reflective_summaries_preview_and_apply(self) -> None:
         for i in range(4):
             write_memory(
@@ -601,6 +625,62 @@ class CoreMaintenanceTest(unittest.TestCase):
         self.assertLessEqual(float(low_th.get("p_imp", 1.0)), float(high_th.get("p_imp", 0.0)))
         self.assertLessEqual(float(low_th.get("p_conf", 1.0)), float(high_th.get("p_conf", 0.0)))
 
+    def test_bump_reuse_counts_counts_each_mention(self) -> None:
+        a = self._write(layer="short", summary="reuse a", session_id="s1", importance=0.5, confidence=0.5, stability=0.5, reuse_count=0, volatility=0.5)
+        b = self._write(layer="short", summary="reuse b", session_id="s1", importance=0.5, confidence=0.5, stability=0.5, reuse_count=2, volatility=0.5)
+        out = bump_reuse_counts(paths=self.paths, schema_sql_path=self.schema, ids=[a, b, a, "missing"])
+        self.assertTrue(out["ok"])
+        self.assertEqual(out["updated"], 3)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            counts = dict(conn.execute("SELECT id, reuse_count FROM memories WHERE id IN (?, ?)", (a, b)).fetchall())
+        self.assertEqual(counts, {a: 2, b: 3})
+
+    def test_apply_decay_filters_project_and_records_last_decay(self) -> None:
+        om = self._write(layer="short", summary="decay om", session_id="s1", importance=0.5, confidence=0.8, stability=0.8, reuse_count=0, volatility=0.2)
+        other = self._write(layer="short", summary="decay other", session_id="s1", importance=0.5, confidence=0.8, stability=0.8, reuse_count=0, volatility=0.2)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.execute("UPDATE memories SET updated_at = '2000-01-01T00:00:00+00:00' WHERE id IN (?, ?)", (om, other))
+            conn.execute("UPDATE memories SET scope_json = json_set(scope_json, '$.project_id', 'X') WHERE id = ?", (other,))
+            conn.commit()
+
+        preview = apply_decay(paths=self.paths, schema_sql_path=self.schema, project_id="OM", dry_run=True)
+        self.assertEqual([x["id"] for x in preview["items"]], [om])
+        preview_all = apply_decay(paths=self.paths, schema_sql_path=self.schema, dry_run=True)
+        self.assertEqual({x["id"] for x in preview_all["items"]}, {om, other})
+
+        applied = apply_decay(paths=self.paths, schema_sql_path=self.schema, project_id="OM", dry_run=False)
+        self.assertEqual(applied["count"], 1)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conf, sha, decayed_at = conn.execute(
+                "SELECT confidence_score, json_extract(integrity_json, '$.content_sha256'), json_extract(integrity_json, '$.last_decay_at') FROM memories WHERE id = ?",
+                (om,),
+            ).fetchone()
+        self.assertLess(conf, 0.8)
+        self.assertTrue(sha)
+        self.assertTrue(decayed_at)
+        # last_decay_at now guards the row until `days` pass again.
+        again = apply_decay(paths=self.paths, schema_sql_path=self.schema, project_id="OM", dry_run=True)
+        self.assertEqual(again["count"], 0)
+
+    def test_move_memory_layer_moves_markdown_file(self) -> None:
+        mid = self._write(layer="short", summary="move me", session_id="s1", importance=0.5, confidence=0.5, stability=0.5, reuse_count=0, volatility=0.5)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            old_rel, old_sha = conn.execute(
+                "SELECT body_md_path, json_extract(integrity_json, '$.content_sha256') FROM memories WHERE id = ?", (mid,)
+            ).fetchone()
+        old_md = self.paths.markdown_root / old_rel
+        old_ino = old_md.stat().st_ino
+        out = move_memory_layer(paths=self.paths, schema_sql_path=self.schema, memory_id=mid, new_layer="long")
+        self.assertTrue(out["ok"])
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            new_rel, new_sha, layer = conn.execute(
+                "SELECT body_md_path, json_extract(integrity_json, '$.content_sha256'), layer FROM memories WHERE id = ?", (mid,)
+            ).fetchone()
+        self.assertEqual(layer, "long")
+        self.assertFalse(old_md.exists())
+        self.assertEqual((self.paths.markdown_root / new_rel).stat().st_ino, old_ino)
+        self.assertEqual(new_sha, old_sha)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,424 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+from omnimem.core import (
+    MemoryPaths,
+    _STORAGE_READY,
+    _insert_memory_rows,
+    _read_text_fast,
+    _sqlite_connect,
+    close_cached_connections,
+    ensure_storage,
+    reindex_from_jsonl,
+    reindex_from_jsonl_partial,
+    update_memory_content,
+    verify_storage,
+    write_memory,
+)
+
+
+def _schema_sql_path() -> Path:
+    return Path(__file__).resolve().parent.parent / "db" / "schema.sql"
+
+
+class CoreReindexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory(prefix="omnimem-reindex-test.")
+        self.root = Path(self.tmp.name)
+        self.paths = MemoryPaths(
+            root=self.root,
+            markdown_root=self.root / "data" / "markdown",
+            jsonl_root=self.root / "data" / "jsonl",
+            sqlite_path=self.root / "data" / "omnimem.db",
+        )
+        self.schema = _schema_sql_path()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _write(self, summary: str, refs: list[dict[str, str]] | None = None) -> str:
+        out = write_memory(
+            paths=self.paths,
+            schema_sql_path=self.schema,
+            layer="short",
+            kind="note",
+            summary=summary,
+            body=f"body for {summary}",
+            tags=["reindex"],
+            refs=refs or [],
+            cred_refs=[],
+            tool="test",
+            account="test",
+            device="local",
+            session_id="s-reindex",
+            project_id="OM",
+            workspace=str(self.root),
+            importance=0.6,
+            confidence=0.6,
+            stability=0.6,
+            reuse_count=0,
+            volatility=0.4,
+            event_type="memory.write",
+        )
+        return str(out["memory"]["id"])
+
+    def _snapshot(self) -> dict[str, list[tuple]]:
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            return {
+                "memories": conn.execute(
+                    "SELECT id, layer, summary, body_text, tags_json, integrity_json FROM memories ORDER BY id"
+                ).fetchall(),
+                "events": conn.execute(
+                    "SELECT event_id, event_type, memory_id FROM memory_events WHERE memory_id != 'system000' ORDER BY event_id"
+                ).fetchall(),
+                "refs": conn.execute("SELECT memory_id, ref_type, target FROM memory_refs ORDER BY memory_id, target").fetchall(),
+                "fts": conn.execute("SELECT id, summary FROM memories_fts ORDER BY id, summary").fetchall(),
+            }
+
+    def _seed(self) -> str:
+        a = self._write("alpha")
+        b = self._write("beta", refs=[{"type": "memory", "target": a}])
+        self._write("gamma")
+        update_memory_content(
+            paths=self.paths,
+            schema_sql_path=self.schema,
+            memory_id=b,
+            summary="beta v2",
+            body="updated beta body",
+        )
+        return b
+
+    def test_full_reindex_is_idempotent(self) -> None:
+        self._seed()
+        first = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertTrue(first["ok"])
+        self.assertGreaterEqual(first["memories_indexed"], 4)
+        snap = self._snapshot()
+        self.assertEqual(len([m for m in snap["memories"] if m[0] != "system000"]), 3)
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(self._snapshot(), snap)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        self.assertTrue({"memories_ai", "memories_ad", "memories_au"} <= triggers)
+
+    def test_partial_reindex_matches_full_reindex(self) -> None:
+        self.maxDiff = None
+        self._seed()
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        expected = self._snapshot()
+
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("DELETE FROM memories WHERE summary = 'gamma'")
+            conn.commit()
+
+        changed = [f"data/jsonl/{fp.name}" for fp in sorted(self.paths.jsonl_root.glob("events-*.jsonl"))]
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=["README.md", *changed])
+        self.assertTrue(out["ok"])
+        self.assertTrue(out["partial"])
+        self.assertFalse(out["reset"])
+        self.assertEqual(self._snapshot(), expected)
+
+    def test_partial_reindex_takes_pulled_memory_with_its_markdown(self) -> None:
+        self.maxDiff = None
+        self._seed()
+        mid = self._write("pulled from another device")
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        expected = self._snapshot()
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            rel = conn.execute("SELECT body_md_path FROM memories WHERE id = ?", (mid,)).fetchone()[0]
+            conn.execute("DELETE FROM memories WHERE id = ?", (mid,))
+            conn.commit()
+
+        # A pull of a new memory changes its body file and an events file in one go.
+        changed = [f"data/markdown/{rel}", *(f"data/jsonl/{fp.name}" for fp in self.paths.jsonl_root.glob("events-*.jsonl"))]
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=changed)
+        self.assertTrue(out["partial"])
+        self.assertFalse(out["reset"])
+        self.assertEqual(self._snapshot(), expected)
+        # A body no replayed event names (a hand edit) still needs the full reindex.
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=[*changed, "data/markdown/short/hand-edit.md"])
+        self.assertTrue(out["reset"])
+
+    def _move_events(self, memory_id: str, name: str) -> None:
+        """Move a memory's events into the month file `name`, as if written back then."""
+        moved: list[str] = []
+        for fp in self.paths.jsonl_root.glob("events-*.jsonl"):
+            kept = []
+            for line in fp.read_text(encoding="utf-8").splitlines(keepends=True):
+                (moved if json.loads(line).get("memory_id") == memory_id else kept).append(line)
+            fp.write_text("".join(kept), encoding="utf-8")
+        with (self.paths.jsonl_root / name).open("a", encoding="utf-8") as f:
+            f.write("".join(moved))
+
+    def test_partial_reindex_replays_from_the_earliest_changed_month(self) -> None:
+        self.maxDiff = None
+        b = self._seed()
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            ids = dict(conn.execute("SELECT summary, id FROM memories"))
+        self._move_events(ids["alpha"], "events-2025-11.jsonl")
+        self._move_events(b, "events-2025-12.jsonl")
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        expected = self._snapshot()
+
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("UPDATE memories SET summary = 'stale' WHERE id = ?", (b,))
+            conn.execute("DELETE FROM memories WHERE summary = 'gamma'")
+            conn.commit()
+
+        # A pull touching December replays December and every later month, but not November.
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=["data/jsonl/events-2025-12.jsonl"])
+        self.assertTrue(out["partial"])
+        self.assertFalse(out["reset"])
+        self.assertEqual(out["jsonl_files"], len(list(self.paths.jsonl_root.glob("events-*.jsonl"))) - 1)
+        self.assertEqual(self._snapshot(), expected)
+
+    def test_partial_reindex_resets_when_a_pull_deletes_an_events_file(self) -> None:
+        self.maxDiff = None
+        self._seed()
+        dropped = self._write("only in an old month")
+        self._move_events(dropped, "events-2025-11.jsonl")
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+
+        (self.paths.jsonl_root / "events-2025-11.jsonl").unlink()
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=["data/jsonl/events-2025-11.jsonl"])
+        self.assertTrue(out["reset"])
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            self.assertIsNone(conn.execute("SELECT 1 FROM memories WHERE id = ?", (dropped,)).fetchone())
+        snap = self._snapshot()
+        reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(self._snapshot(), snap)
+
+    def test_partial_reindex_noop_and_markdown_fallback(self) -> None:
+        self._seed()
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=[])
+        self.assertEqual(out["jsonl_files"], 0)
+        out = reindex_from_jsonl_partial(self.paths, self.schema, only=["data/markdown/short/x.md"])
+        self.assertTrue(out["reset"])
+
+    def test_reindex_keeps_records_with_unicode_line_separators(self) -> None:
+        self._write("line\u2028separator")
+        out = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(out["events_skipped"], 0)
+        summaries = [m[2] for m in self._snapshot()["memories"]]
+        self.assertIn("line\u2028separator", summaries)
+
+    def test_reindex_skips_undecodable_lines_and_accepts_crlf(self) -> None:
+        self._write("crlf")
+        fp = sorted(self.paths.jsonl_root.glob("events-*.jsonl"))[-1]
+        raw = fp.read_bytes().replace(b"\n", b"\r\n")
+        fp.write_bytes(raw + b'{"event_type": "memory.write", "bad": "\xff"}\n[1, 2]\n')
+        out = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertTrue(out["ok"])
+        self.assertEqual(out["events_skipped"], 2)
+        self.assertIn("crlf", [m[2] for m in self._snapshot()["memories"]])
+
+    def test_reindex_batches_events_but_skips_bad_rows_individually(self) -> None:
+        self._seed()
+        fp = sorted(self.paths.jsonl_root.glob("events-*.jsonl"))[-1]
+        lines = fp.read_text(encoding="utf-8").splitlines()
+        first = json.loads(lines[0])
+        orphan = dict(first, event_id="orphan-evt", event_type="memory.update", memory_id="ghost", payload={})
+        unbindable = dict(first, event_id="list-evt", event_type="memory.update", memory_id=["x"], payload={})
+        # An event that precedes its memory's first write still fails its foreign key.
+        early = dict(first, event_id="early-evt", event_type="memory.update", payload={})
+        fp.write_text("\n".join([json.dumps(early), *lines, json.dumps(orphan), json.dumps(unbindable)]) + "\n", encoding="utf-8")
+        out = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(out["events_skipped"], 3)
+        event_ids = {e[0] for e in self._snapshot()["events"]}
+        self.assertIn(first["event_id"], event_ids)
+        self.assertFalse({"orphan-evt", "list-evt", "early-evt"} & event_ids)
+
+    def test_reindex_batches_fresh_memories_but_skips_bad_envelopes(self) -> None:
+        self._seed()
+        fp = sorted(self.paths.jsonl_root.glob("events-*.jsonl"))[-1]
+        lines = fp.read_text(encoding="utf-8").splitlines()
+        first = json.loads(lines[0])
+        env = dict(first["payload"]["envelope"], id="bad-layer", layer="nowhere")
+        bad = dict(first, event_id="bad-layer-evt", memory_id="bad-layer", payload={**first["payload"], "envelope": env})
+        fp.write_text("\n".join([*lines, json.dumps(bad)]) + "\n", encoding="utf-8")
+        # One memory per batch against one batch for the whole file: same rows, same counts.
+        with patch("omnimem.core._REINDEX_EVENT_BATCH", 1):
+            baseline = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        snap = self._snapshot()
+        with patch("omnimem.core._insert_memory_rows", wraps=_insert_memory_rows) as batched:
+            out = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertGreater(max(len(c.args[1]) for c in batched.call_args_list), 1)
+        self.assertEqual(out["memories_indexed"], baseline["memories_indexed"])
+        self.assertEqual(out["events_skipped"], baseline["events_skipped"])
+        self.assertEqual(out["events_skipped"], 1)
+        self.assertEqual(self._snapshot(), snap)
+        self.assertTrue(snap["refs"])
+        self.assertNotIn("bad-layer-evt", {e[0] for e in snap["events"]})
+        self.assertIn(first["memory_id"], {m[0] for m in snap["memories"]})
+
+    def test_verify_storage_streams_jsonl_and_counts_bad_lines(self) -> None:
+        self._write("verify\u2028me")
+        fp = sorted(self.paths.jsonl_root.glob("events-*.jsonl"))[-1]
+        with fp.open("ab") as f:
+            f.write(b'{"event_type": "memory.write", "bad": "\xff"}\n[1, 2]\n\n')
+        out = verify_storage(self.paths, self.schema)
+        self.assertIn("jsonl_invalid_lines:2", out["issues"])
+        self.assertGreaterEqual(out["jsonl_events_checked"], 3)
+
+    def test_verify_storage_reports_markdown_issues_in_row_order(self) -> None:
+        ids = [self._write(f"verify {i}") for i in range(4)]
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            rels = dict(conn.execute("SELECT id, body_md_path FROM memories").fetchall())
+        (self.paths.markdown_root / rels[ids[1]]).write_text("tampered\n", encoding="utf-8")
+        (self.paths.markdown_root / rels[ids[2]]).unlink()
+        serial = verify_storage(self.paths, self.schema)["issues"]
+        with patch("omnimem.core._VERIFY_PARALLEL_MIN_ROWS", 1):
+            parallel = verify_storage(self.paths, self.schema)["issues"]
+        self.assertEqual(parallel, serial)
+        self.assertEqual(set(serial), {f"missing_markdown:{ids[2]}:{rels[ids[2]]}", f"hash_mismatch:{ids[1]}"})
+
+    def test_verify_storage_hashes_markdown_bytes_like_text(self) -> None:
+        ids = [self._write(f"bytes {i}\nline two") for i in range(3)]
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            rels = dict(conn.execute("SELECT id, body_md_path FROM memories").fetchall())
+        self.assertEqual(verify_storage(self.paths, self.schema)["issues"], [])
+        # CRLF endings verify as the text they decode to; undecodable bytes are a mismatch, not a crash.
+        crlf = self.paths.markdown_root / rels[ids[0]]
+        crlf.write_bytes(crlf.read_bytes().replace(b"\n", b"\r\n"))
+        bad = self.paths.markdown_root / rels[ids[1]]
+        bad.write_bytes(bad.read_bytes() + b"\r\xff")
+        self.assertEqual(verify_storage(self.paths, self.schema)["issues"], [f"hash_mismatch:{ids[1]}"])
+
+    def test_read_text_fast_matches_read_text(self) -> None:
+        fp = self.root / "body.md"
+        for raw in (b"", b"a\r\nb\rc\n", "caf\u00e9\r".encode("utf-8"), b"\xef\xbb\xbfbom\n"):
+            fp.write_bytes(raw)
+            self.assertEqual(_read_text_fast(fp), fp.read_text(encoding="utf-8"))
+        fp.write_bytes(b"\xff")
+        with self.assertRaises(UnicodeDecodeError):
+            _read_text_fast(fp)
+
+    def test_update_memory_content_skips_identical_retry(self) -> None:
+        mid = self._write("retry")
+        kw = {"paths": self.paths, "schema_sql_path": self.schema, "memory_id": mid, "summary": "retry v2", "body": "new body", "tags": ["reindex"]}
+        first = update_memory_content(**kw)
+        self.assertTrue(first["changed"])
+        before = self._snapshot()
+        again = update_memory_content(**kw)
+        self.assertFalse(again["changed"])
+        self.assertEqual(again["updated_at"], first["updated_at"])
+        self.assertEqual(self._snapshot(), before)
+        # Different tags, or a markdown file that drifted from the row, still rewrite.
+        self.assertTrue(update_memory_content(**{**kw, "tags": ["other"]})["changed"])
+        md = self.paths.markdown_root / again["body_md_path"]
+        md.write_text("drifted\n", encoding="utf-8")
+        self.assertTrue(update_memory_content(**{**kw, "tags": ["other"]})["changed"])
+        self.assertEqual(md.read_text(encoding="utf-8"), "# retry v2\n\nnew body\n")
+
+    def test_reindex_prefetched_bodies_match_inline_reads(self) -> None:
+        for i in range(10):
+            self._write(f"prefetch {i}")
+        with patch("omnimem.core._REINDEX_PREFETCH_MIN", 10_000):
+            reindex_from_jsonl(self.paths, self.schema, reset=True)
+        inline = self._snapshot()
+        with patch("omnimem.core._REINDEX_PREFETCH_MIN", 1), patch("omnimem.core._REINDEX_BLOCK_LINES", 3):
+            out = reindex_from_jsonl(self.paths, self.schema, reset=True)
+        self.assertEqual(out["events_skipped"], 0)
+        self.assertEqual(self._snapshot(), inline)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            bodies = [r[0] for r in conn.execute("SELECT body_text FROM memories WHERE summary LIKE 'prefetch %'")]
+        self.assertEqual(len(bodies), 10)
+        self.assertTrue(all("body for prefetch" in b for b in bodies))
+
+    def test_legacy_kind_check_is_migrated_with_fts(self) -> None:
+        legacy = self.schema.read_text(encoding="utf-8").replace(", 'retrieve'", "")
+        self.paths.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.executescript(legacy)
+            conn.execute(
+                """
+                INSERT INTO memories(id, schema_version, created_at, updated_at, layer, kind, summary, body_md_path,
+                                     body_text, source_json, scope_json, integrity_json)
+                VALUES ('legacy1', '0.1.0', 't', 't', 'short', 'note', 'legacy summary', 'short/x.md', 'legacy body', '{}', '{}', '{}')
+                """
+            )
+        ensure_storage(self.paths, self.schema)
+        with _sqlite_connect(self.paths.sqlite_path) as conn:
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'memories'").fetchone()[0]
+            hits = conn.execute("SELECT id FROM memories_fts WHERE memories_fts MATCH 'legacy'").fetchall()
+            sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.assertIn("'retrieve'", sql)
+        self.assertEqual(hits, [("legacy1",)])
+        self.assertEqual(sync, 1)
+
+    def test_fts_update_trigger_is_narrowed_and_scores_skip_fts(self) -> None:
+        legacy = self.schema.read_text(encoding="utf-8").replace(
+            "AFTER UPDATE OF id, summary, body_text, tags_json ON memories", "AFTER UPDATE ON memories"
+        )
+        self.paths.sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            conn.executescript(legacy)
+        mid = self._write("trigger check")
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'memories_au'").fetchone()[0]
+            self.assertIn("AFTER UPDATE OF", sql)
+            # Marker row: a score-only update must not delete and re-insert the FTS entry.
+            conn.execute("UPDATE memories_fts SET tags = 'marker' WHERE id = ?", (mid,))
+            conn.execute("UPDATE memories SET reuse_count = reuse_count + 1 WHERE id = ?", (mid,))
+            self.assertEqual(conn.execute("SELECT tags FROM memories_fts WHERE id = ?", (mid,)).fetchone()[0], "marker")
+            conn.execute("UPDATE memories SET summary = 'trigger renamed' WHERE id = ?", (mid,))
+            self.assertEqual(
+                conn.execute("SELECT summary FROM memories_fts WHERE id = ?", (mid,)).fetchall(), [("trigger renamed",)]
+            )
+
+    def test_newest_by_project_and_kind_skip_the_sort(self) -> None:
+        self._write("plan")
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            for where in ("json_extract(scope_json, '$.project_id') = 'OM'", "kind = 'checkpoint'"):
+                plan = " ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM memories WHERE {where} ORDER BY updated_at DESC LIMIT 3"))
+                self.assertIn("USING INDEX", plan)
+                self.assertNotIn("TEMP B-TREE", plan)
+            # (kind, updated_at) supersedes the plain kind index, which older databases lose.
+            conn.execute("CREATE INDEX idx_memories_kind ON memories(kind)")
+        close_cached_connections()
+        _STORAGE_READY.clear()
+        ensure_storage(self.paths, self.schema)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_memories_kind_updated", names)
+        self.assertNotIn("idx_memories_kind", names)
+
+    def test_ensure_storage_rebuilds_replaced_database(self) -> None:
+        ensure_storage(self.paths, self.schema)
+        self.paths.sqlite_path.unlink()
+        ensure_storage(self.paths, self.schema)
+        with sqlite3.connect(self.paths.sqlite_path) as conn:
+            names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertIn("memories", names)
+        self._write("after reset")
+
+    def test_cached_connection_is_reset_between_uses(self) -> None:
+        self._write("kept")
+        with _sqlite_connect(self.paths.sqlite_path) as conn:
+            before = conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+            self.assertGreater(before, 0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            with _sqlite_connect(self.paths.sqlite_path) as inner:
+                self.assertIsNot(inner, conn)
+            first = conn
+        with _sqlite_connect(self.paths.sqlite_path) as conn:
+            self.assertIs(conn, first)
+            self.assertIsNone(conn.row_factory)
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 0)
+            conn.execute("DELETE FROM memories")
+        with _sqlite_connect(self.paths.sqlite_path) as conn:
+            # Uncommitted work from the previous use was rolled back, as with close-per-call.
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0], before)
+
+if __name__ == "__main__":
+    unittest.main()
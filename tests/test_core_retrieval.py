@@ -1,10 +1,22 @@
 from __future__ import annotations
 
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
 
-from omnimem.core import MemoryPaths, find_memories_ex, write_memory
+from omnimem.core import (
+    MemoryPaths,
+    _fts_rows,
+    _item_from_row,
+    _like_rows,
+    _like_tokens,
+    _query_terms,
+    _signals_from_row,
+    _sqlite_connect,
+    find_memories_ex,
+    write_memory,
+)
 
 
 def _schema_sql_path() -> Path:
@@ -26,7 +38,17 @@ class RetrievalRankingTest(unittest.TestCase):
     def tearDown(self) -> None:
         self.tmp.cleanup()
 
-    def _write(self, summary: str, *, importance: float, stability: float, confidence: float, reuse_count: int) -> None:
+    def _write(
+        self,
+        summary: str,
+        *,
+        importance: float,
+        stability: float,
+        confidence: float,
+        reuse_count: int,
+        project_id: str = "OM",
+        session_id: str = "s1",
+    ) -> None:
         write_memory(
             paths=self.paths,
             schema_sql_path=self.schema,
@@ -40,8 +62,8 @@ class RetrievalRankingTest(unittest.TestCase):
             tool="test",
             account="test",
             device="local",
-            session_id="s1",
-            project_id="OM",
+            session_id=session_id,
+            project_id=project_id,
             workspace=str(self.root),
             importance=importance,
             confidence=confidence,
@@ -127,6 +149,55 @@ class RetrievalRankingTest(unittest.TestCase):
         self.assertGreater(float(c0["lexical_overlap"]), float(c1["lexical_overlap"]))
         self.assertGreater(float(items[0]["retrieval"]["score"]), float(items[1]["retrieval"]["score"]))
 
+    def test_recent_and_lexical_filters_by_project_and_session(self) -> None:
+        self._write("scoped om s1", importance=0.5, stability=0.5, confidence=0.5, reuse_count=0)
+        self._write("scoped om s2", importance=0.5, stability=0.5, confidence=0.5, reuse_count=0, session_id="s2")
+        self._write("scoped other s1", importance=0.5, stability=0.5, confidence=0.5, reuse_count=0, project_id="X")
+
+        def summaries(query: str, **kw: str) -> set[str]:
+            out = find_memories_ex(paths=self.paths, schema_sql_path=self.schema, query=query, layer=None, limit=10, **kw)
+            return {str(x["summary"]) for x in out["items"] if str(x["summary"]).startswith("scoped")}
+
+        for query in ("", "scoped"):
+            self.assertEqual(summaries(query), {"scoped om s1", "scoped om s2", "scoped other s1"})
+            self.assertEqual(summaries(query, project_id="OM"), {"scoped om s1", "scoped om s2"})
+            self.assertEqual(summaries(query, session_id="s1"), {"scoped om s1", "scoped other s1"})
+            self.assertEqual(summaries(query, project_id="OM", session_id="s2"), {"scoped om s2"})
+
+    def test_like_tokens_drop_subsumed_patterns(self) -> None:
+        self.assertEqual(_like_tokens(["Deploy", "deployment", "plan", "DEPLOY", "Émile", "émile"]), ["Deploy", "plan", "Émile", "émile"])
+        self._write("zqxdeploymentzq", importance=0.5, stability=0.5, confidence=0.5, reuse_count=0)
+        out = find_memories_ex(paths=self.paths, schema_sql_path=self.schema, query="eploy eployment", layer=None, limit=5)
+        self.assertEqual(out["strategy"], "like_fallback")
+        self.assertEqual([x["summary"] for x in out["items"]], ["zqxdeploymentzq"])
+
+    def test_query_terms_tokenizes_and_normalizes_in_one_pass(self) -> None:
+        tokens, normalized = _query_terms("  deploy v1.2 -- OR 中文检索, and notes!  ")
+        self.assertEqual(tokens, ["deploy", "v1", "2", "中文检索", "notes"])
+        self.assertEqual(normalized, "deploy v1 2 OR 中文检索 and notes")
+        self.assertEqual(_query_terms(""), ([], ""))
+
+    def test_item_from_row_matches_dict_projection(self) -> None:
+        self._write("projection check", importance=0.7, stability=0.6, confidence=0.5, reuse_count=2)
+        with _sqlite_connect(self.paths.sqlite_path) as conn:
+            conn.row_factory = sqlite3.Row
+            kw = {"layer": None, "limit": 5, "project_id": "OM", "session_id": ""}
+            rows = _fts_rows(conn, match_query="projection", **kw) + _like_rows(conn, tokens=["rojectio"], **kw)
+        self.assertEqual(len(rows), 2)
+        for r in rows:
+            fast = _item_from_row(r)
+            slow = _signals_from_row(dict(r))
+            self.assertEqual(fast, slow)
+            self.assertEqual(list(fast), list(slow))
+
+    def test_fts_candidates_do_not_repeat_the_same_match(self) -> None:
+        self._write("candidate dedupe", importance=0.5, stability=0.5, confidence=0.5, reuse_count=0)
+        out = find_memories_ex(paths=self.paths, schema_sql_path=self.schema, query="zzzunmatched", layer=None, limit=5)
+        self.assertEqual(
+            [(t["strategy"], t["query_used"]) for t in out["tried"]],
+            [("fts_raw", "zzzunmatched"), ("fts_or_prefix", "zzzunmatched*"), ("like_fallback", "zzzunmatched")],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
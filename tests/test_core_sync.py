@@ -1,13 +1,36 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
 import subprocess
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from omnimem.core import MemoryPaths, sync_git, sync_placeholder
+from omnimem.core import (
+    MemoryPaths,
+    _encode_event,
+    _git_run_proc,
+    _ensure_remote,
+    _ensure_sync_gitignore,
+    _git_unmerged_paths,
+    _json_dumps,
+    _json_loads,
+    _parse_jsonl_union,
+    _parse_porcelain_v2,
+    _repo_busy,
+    _repo_has_pending_sync_changes,
+    _run_git,
+    _untrack_sync_ignored,
+    default_config_path,
+    repo_lock,
+    resolve_paths,
+    sync_git,
+    sync_placeholder,
+)
 
 
 def _schema_sql_path() -> Path:
@@ -57,6 +80,110 @@ class SyncCoreTest(unittest.TestCase):
         self.assertEqual(out["mode"], "github-push")
         self.assertIn("github-push", self._sync_modes())
 
+    def test_push_skips_add_and_commit_when_tree_is_clean(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        subprocess.run(["git", "-C", str(self.root), "config", "user.email", "sync@test.local"], check=True)
+        subprocess.run(["git", "-C", str(self.root), "config", "user.name", "Sync Test"], check=True)
+        self.assertTrue(sync_git(self.paths, self.schema, "github-push", log_event=False)["ok"])
+
+        with patch("omnimem.core._git_run_proc", wraps=_git_run_proc) as run_git:
+            out = sync_git(self.paths, self.schema, "github-push", log_event=False)
+        self.assertTrue(out["ok"])
+        self.assertEqual(out["message"], "local commit ok; remote not configured")
+        verbs = [c.args[1][0] for c in run_git.call_args_list]
+        self.assertNotIn("add", verbs)
+        self.assertNotIn("commit", verbs)
+        # The remote check was settled by the first push and nothing rewrote .git/config.
+        self.assertNotIn("remote", verbs)
+        self.assertEqual(verbs.count("status"), 2)
+
+        with patch("omnimem.core._git_run_proc", wraps=_git_run_proc) as run_git:
+            out = sync_git(self.paths, self.schema, "github-push", log_event=False, include_detail=False)
+        self.assertTrue(out["ok"])
+        self.assertEqual(out["detail"], "")
+        # The index is unchanged since the previous untrack pass, so no `git rm` either.
+        self.assertEqual([c.args[1][0] for c in run_git.call_args_list], ["status"])
+
+    def test_ensure_remote_rechecks_after_config_rewrite(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        self.assertFalse(_ensure_remote(self.paths, "origin", None))
+        with patch("omnimem.core._git_run_proc", wraps=_git_run_proc) as run_git:
+            self.assertFalse(_ensure_remote(self.paths, "origin", None))
+        run_git.assert_not_called()
+        subprocess.run(["git", "-C", str(self.root), "remote", "add", "origin", "https://example.invalid/r.git"], check=True)
+        self.assertTrue(_ensure_remote(self.paths, "origin", None))
+
+    def test_untrack_falls_back_per_path_when_one_path_fails(self) -> None:
+        def git(*args: str) -> subprocess.CompletedProcess:
+            return subprocess.run(["git", "-C", str(self.root), *args], check=True, capture_output=True, text=True)
+
+        git("init")
+        git("config", "user.email", "sync@test.local")
+        git("config", "user.name", "Sync Test")
+        (self.root / "runtime").mkdir()
+        runtime = self.root / "runtime" / "state.txt"
+        runtime.write_text("v1\n", encoding="utf-8")
+        self.paths.sqlite_path.parent.mkdir(parents=True)
+        self.paths.sqlite_path.write_bytes(b"db")
+        git("add", "-f", "runtime", "data/omnimem.db")
+        git("commit", "-m", "tracked")
+        # Staged content that differs from both HEAD and the file makes `git rm --cached` refuse it.
+        runtime.write_text("v2\n", encoding="utf-8")
+        git("add", "runtime")
+        runtime.write_text("v3\n", encoding="utf-8")
+        _untrack_sync_ignored(self.paths, sync_include_layers=None, sync_include_jsonl=True)
+        tracked = git("ls-files").stdout.split()
+        self.assertNotIn("data/omnimem.db", tracked)
+        self.assertIn("runtime/state.txt", tracked)
+
+    def test_pending_changes_probe_handles_non_utf8_paths(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        self.assertFalse(_repo_has_pending_sync_changes(self.paths))
+        try:
+            with open(os.path.join(os.fsencode(self.root), b"caf\xe9.md"), "wb") as f:
+                f.write(b"x\n")
+        except OSError:
+            self.skipTest("filesystem rejects non-UTF-8 names")
+        self.assertTrue(_repo_has_pending_sync_changes(self.paths))
+
+    def test_run_git_without_capture_keeps_stderr_for_errors(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        self.assertIsNone(_run_git(self.paths, ["rev-parse", "--git-dir"], capture=False).stdout)
+        with self.assertRaises(RuntimeError) as ctx:
+            _run_git(self.paths, ["checkout", "no-such-branch"], capture=False)
+        self.assertIn("no-such-branch", str(ctx.exception))
+
+    def test_run_git_status_skips_optional_locks(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        with patch("omnimem.core.subprocess.run", wraps=subprocess.run) as run:
+            _run_git(self.paths, ["status", "--porcelain=v2"])
+            _run_git(self.paths, ["rev-parse", "--git-dir"])
+        status_argv, other_argv = run.call_args_list[0].args[0], run.call_args_list[1].args[0]
+        self.assertEqual(status_argv[3:5], ["--no-optional-locks", "status"])
+        self.assertNotIn("--no-optional-locks", other_argv)
+
+    def test_sync_gitignore_is_rewritten_only_when_the_block_drifts(self) -> None:
+        ignore = self.root / ".gitignore"
+        ignore.write_text("node_modules/\n", encoding="utf-8")
+        kwargs = {"sync_include_layers": ["long"], "sync_include_jsonl": False}
+        _ensure_sync_gitignore(self.paths, **kwargs)
+        txt = ignore.read_text(encoding="utf-8")
+        self.assertTrue(txt.startswith("node_modules/\n# OMNIMEM:SYNC:START\n"))
+        self.assertIn("data/jsonl/\n", txt)
+        self.assertIn("data/markdown/short/\n", txt)
+
+        os.utime(ignore, (1000, 1000))
+        _ensure_sync_gitignore(self.paths, **kwargs)
+        with patch("omnimem.core.open", create=True, side_effect=AssertionError("re-read")):
+            _ensure_sync_gitignore(self.paths, **kwargs)
+        self.assertEqual(ignore.read_text(encoding="utf-8"), txt)
+
+        ignore.write_text("node_modules/\n", encoding="utf-8")
+        _ensure_sync_gitignore(self.paths, **kwargs)
+        self.assertEqual(ignore.read_text(encoding="utf-8"), txt)
+        _ensure_sync_gitignore(self.paths, sync_include_layers=["long"], sync_include_jsonl=True)
+        self.assertNotIn("data/jsonl/", ignore.read_text(encoding="utf-8"))
+
     def test_placeholder_alias_is_backward_compatible(self) -> None:
         out = sync_placeholder(self.paths, self.schema, "noop")
         self.assertTrue(out["ok"])
@@ -96,6 +223,103 @@ class SyncCoreTest(unittest.TestCase):
         self.assertNotIn("data/markdown/short/2026/02/s1.md", tracked_set)
         self.assertNotIn("data/jsonl/events-2026-02.jsonl", tracked_set)
 
+    def test_json_dumps_is_compact_and_roundtrips(self) -> None:
+        payload = {"mode": "github-pull", "ok": True, "detail": "café", "nested": {"n": [1, 2.5, None]}}
+        text = _json_dumps(payload)
+        self.assertNotIn(", ", text)
+        self.assertIn("café", text)
+        self.assertEqual(json.loads(text), payload)
+        self.assertEqual(_json_loads(text), payload)
+        # NaN (rejected by orjson) still parses the way the stdlib always did.
+        self.assertNotEqual(_json_loads('{"x": NaN}')["x"], 0)
+
+    def test_encode_event_matches_json_dumps_record(self) -> None:
+        evt = {"event_id": "e1", "event_type": "memory.write", "memory_id": "m", "payload": {"envelope": {"s": "café", "n": [1, None]}}}
+        record, payload_json = _encode_event(evt)
+        self.assertEqual(record, json.dumps(evt, ensure_ascii=False))
+        self.assertEqual(json.loads(payload_json), evt["payload"])
+        reordered = {"payload": {"a": 1}, "event_id": "e2"}
+        self.assertEqual(_encode_event(reordered)[0], json.dumps(reordered, ensure_ascii=False))
+
+    def test_parse_jsonl_union_merges_stages_in_event_order(self) -> None:
+        def line(eid: str, t: str, **extra: str) -> str:
+            return json.dumps({"event_id": eid, "event_time": t, **extra}, ensure_ascii=False)
+
+        ours = "\n".join([line("a", "t1"), line("c", "t3", who="ours"), "not json", line("x", "t9", s="a\u2028b")]) + "\n"
+        # Out of order on purpose; the duplicate "c" must lose to stage 2.
+        theirs = "\r\n".join([line("d", "t4"), line("b", "t2"), line("c", "t0", who="theirs"), "[1]"])
+        merged = _parse_jsonl_union(ours.encode("utf-8"), theirs.encode("utf-8") + b'\n{"event_id": "\xff"}\n')
+        rows = [json.loads(x) for x in merged.split(b"\n") if x]
+        self.assertEqual([r["event_id"] for r in rows], ["a", "b", "c", "d", "x"])
+        self.assertEqual(rows[2]["who"], "ours")
+        self.assertEqual(rows[4]["s"], "a\u2028b")
+        self.assertTrue(merged.endswith(b"\n"))
+        self.assertEqual(_parse_jsonl_union(b"", b""), b"")
+        # One-sided conflicts keep the other side as-is.
+        self.assertEqual(_parse_jsonl_union(ours, ""), ours.encode("utf-8"))
+        self.assertEqual(_parse_jsonl_union(b" \n", theirs.encode("utf-8")), theirs.encode("utf-8") + b"\n")
+        self.assertEqual(_parse_jsonl_union(theirs, theirs), theirs.encode("utf-8") + b"\n")
+        # Shared history is identical text in both stages and only parsed once.
+        with patch("omnimem.core._json_loads", wraps=json.loads) as loads:
+            self.assertEqual(_parse_jsonl_union(ours, ours + line("y", "t10") + "\n").count(b"\n"), 4)
+        self.assertEqual(loads.call_count, 5)
+
+    def test_cached_path_resolution_follows_env_changes(self) -> None:
+        a, b = self.root / "a", self.root / "b"
+        a.mkdir()
+        (self.root / "link").symlink_to(a)
+        with patch.dict(os.environ, {"OMNIMEM_HOME": str(self.root / "link")}):
+            self.assertEqual(default_config_path(), a.resolve() / "omnimem.config.json")
+        with patch.dict(os.environ, {"HOME": str(b)}):
+            os.environ.pop("OMNIMEM_HOME", None)
+            self.assertEqual(default_config_path(), b.resolve() / ".omnimem" / "omnimem.config.json")
+            self.assertEqual(resolve_paths({"home": "~/mem"}).sqlite_path, b.resolve() / "mem" / "data" / "omnimem.db")
+        with patch.dict(os.environ, {"HOME": str(a)}):
+            self.assertEqual(resolve_paths({"home": "~/mem"}).root, a.resolve() / "mem")
+
+    def test_repo_lock_times_out_then_acquires_after_release(self) -> None:
+        held = threading.Event()
+        release = threading.Event()
+
+        def holder() -> None:
+            with repo_lock(self.root):
+                held.set()
+                release.wait(5)
+
+        t = threading.Thread(target=holder)
+        t.start()
+        try:
+            self.assertTrue(held.wait(5))
+            with self.assertRaises(TimeoutError):
+                with repo_lock(self.root, timeout_s=0.05):
+                    pass
+        finally:
+            release.set()
+            t.join(5)
+        with repo_lock(self.root, timeout_s=1.0):
+            with repo_lock(self.root, timeout_s=0.0):
+                pass
+
+    def test_porcelain_v2_parser_renders_short_detail(self) -> None:
+        raw = (
+            "1 .M N... 100644 100644 100644 aaa bbb data/a b.md\x00"
+            "u UU N... 100644 100644 100644 100644 h1 h2 h3 data/jsonl/events-2026-02.jsonl\x00"
+            "? new.txt\x00"
+        )
+        has_changes, detail = _parse_porcelain_v2(raw)
+        self.assertTrue(has_changes)
+        self.assertEqual(detail.splitlines(), ["M data/a b.md", "UU data/jsonl/events-2026-02.jsonl", "?? new.txt"])
+        self.assertEqual(_git_unmerged_paths(self.paths, raw), ["data/jsonl/events-2026-02.jsonl"])
+        self.assertEqual(_parse_porcelain_v2(""), (False, ""))
+
+    def test_repo_busy_reads_git_dir_markers(self) -> None:
+        subprocess.run(["git", "-C", str(self.root), "init"], check=True, capture_output=True, text=True)
+        self.assertEqual(_repo_busy(self.paths, ""), (False, ""))
+        (self.root / ".git" / "MERGE_HEAD").write_text("0" * 40 + "\n", encoding="utf-8")
+        self.assertEqual(_repo_busy(self.paths, ""), (True, "merge"))
+        (self.root / ".git" / "rebase-merge").mkdir()
+        self.assertEqual(_repo_busy(self.paths, ""), (True, "rebase"))
+
 
 if __name__ == "__main__":
     unittest.main()
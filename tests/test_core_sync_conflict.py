@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+import json
+import sqlite3
 import subprocess
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
-from omnimem.core import MemoryPaths, run_sync_with_retry, sync_git, sync_error_hint
+from omnimem.core import (
+    MemoryPaths,
+    _SHARED_GIT_CAT_FILES,
+    _auto_resolve_jsonl_conflicts,
+    _git_cat_file_session,
+    reindex_from_jsonl_partial,
+    repo_lock,
+    run_sync_with_retry,
+    sync_error_hint,
+    sync_git,
+)
+from omnimem.daemon import _ContentWatcher, run_sync_daemon
 
 
 def _schema_sql_path() -> Path:
@@ -88,6 +103,213 @@ class SyncConflictTest(unittest.TestCase):
         self.assertEqual(out.get("attempts"), 1)
         self.assertIn("Sync conflict detected", sync_error_hint("conflict"))
 
+    def test_auto_resolve_unions_both_stages_of_jsonl_conflicts(self) -> None:
+        repo = self.repo_a
+        rels = ["data/jsonl/events-2026-01.jsonl", "data/jsonl/events-2026-02.jsonl"]
+        for rel in rels:
+            (repo / rel).parent.mkdir(parents=True, exist_ok=True)
+            (repo / rel).write_text('{"event_id":"e0","event_time":"t0"}\n', encoding="utf-8")
+        _git("add", "-A", cwd=repo)
+        _git("commit", "-m", "base", cwd=repo)
+        _git("checkout", "-b", "other", cwd=repo)
+        for rel in rels:
+            with (repo / rel).open("a", encoding="utf-8") as f:
+                f.write('{"event_id":"e2","event_time":"t2","s":"café"}\n')
+        _git("commit", "-am", "other", cwd=repo)
+        _git("checkout", "main", cwd=repo)
+        for rel in rels:
+            with (repo / rel).open("a", encoding="utf-8") as f:
+                f.write('{"event_id":"e1","event_time":"t1"}\n')
+        _git("commit", "-am", "main", cwd=repo)
+        self.assertNotEqual(subprocess.run(["git", "merge", "other"], cwd=repo, capture_output=True).returncode, 0)
+
+        paths = MemoryPaths(
+            root=repo,
+            markdown_root=repo / "data" / "markdown",
+            jsonl_root=repo / "data" / "jsonl",
+            sqlite_path=repo / "data" / "omnimem.db",
+        )
+        modes = {rel: (repo / rel).stat().st_mode for rel in rels}
+        self.assertTrue(_auto_resolve_jsonl_conflicts(paths, rels))
+        self.assertEqual({rel: (repo / rel).stat().st_mode for rel in rels}, modes)
+        self.assertEqual(sorted(p.name for p in (repo / "data" / "jsonl").iterdir()), ["events-2026-01.jsonl", "events-2026-02.jsonl"])
+        self.assertEqual(_git("diff", "--name-only", "--diff-filter=U", cwd=repo).stdout.strip(), "")
+        for rel in rels:
+            rows = [json.loads(x) for x in (repo / rel).read_text(encoding="utf-8").splitlines()]
+            self.assertEqual([r["event_id"] for r in rows], ["e0", "e1", "e2"])
+            self.assertEqual(rows[2]["s"], "café")
+
+    def test_pull_rebases_divergent_local_commit(self) -> None:
+        (self.repo_a / "seed.txt").write_text("seed\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_a)
+        _git("commit", "-m", "seed", cwd=self.repo_a)
+        _git("push", "-u", "origin", "main", cwd=self.repo_a)
+        _git("fetch", "origin", "main", cwd=self.repo_b)
+        _git("reset", "--hard", "origin/main", cwd=self.repo_b)
+
+        (self.repo_a / "a.txt").write_text("from a\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_a)
+        _git("commit", "-m", "a-commit", cwd=self.repo_a)
+        _git("push", "origin", "main", cwd=self.repo_a)
+        (self.repo_b / "b.txt").write_text("from b\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_b)
+        _git("commit", "-m", "b-commit", cwd=self.repo_b)
+
+        paths = MemoryPaths(
+            root=self.repo_b,
+            markdown_root=self.repo_b / "data" / "markdown",
+            jsonl_root=self.repo_b / "data" / "jsonl",
+            sqlite_path=self.repo_b / "data" / "omnimem.db",
+        )
+        out = sync_git(paths, self.schema, "github-pull", remote_name="origin", branch="main")
+        self.assertTrue(out["ok"], out)
+        self.assertTrue((self.repo_b / "a.txt").exists())
+        self.assertTrue((self.repo_b / "b.txt").exists())
+        self.assertEqual(out["changed_paths"], ["a.txt"])
+        log = _git("log", "--format=%s", cwd=self.repo_b).stdout.splitlines()
+        self.assertEqual(log[:3], ["b-commit", "a-commit", "seed"])
+
+        _git("push", "origin", "main", cwd=self.repo_b)
+        again = sync_git(paths, self.schema, "github-pull", remote_name="origin", branch="main")
+        self.assertTrue(again["ok"], again)
+        self.assertEqual(again["message"], "github pull ok (up-to-date)")
+        self.assertEqual(again["changed_paths"], [])
+
+    def test_cat_file_session_serves_every_pull(self) -> None:
+        (self.repo_a / "seed.txt").write_text("seed\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_a)
+        _git("commit", "-m", "seed", cwd=self.repo_a)
+        _git("push", "-u", "origin", "main", cwd=self.repo_a)
+        paths = MemoryPaths(
+            root=self.repo_b,
+            markdown_root=self.repo_b / "data" / "markdown",
+            jsonl_root=self.repo_b / "data" / "jsonl",
+            sqlite_path=self.repo_b / "data" / "omnimem.db",
+        )
+        self.assertTrue(sync_git(paths, self.schema, "github-pull", remote_name="origin", branch="main")["ok"])
+
+        with patch("omnimem.core.subprocess.Popen", wraps=subprocess.Popen) as popen:
+            with _git_cat_file_session(paths):
+                for i in range(2):
+                    (self.repo_a / f"a{i}.txt").write_text("a\n", encoding="utf-8")
+                    _git("add", "-A", cwd=self.repo_a)
+                    _git("commit", "-m", f"a{i}", cwd=self.repo_a)
+                    _git("push", "origin", "main", cwd=self.repo_a)
+                    out = sync_git(paths, self.schema, "github-pull", remote_name="origin", branch="main")
+                    self.assertTrue(out["ok"], out)
+                    self.assertEqual(out["changed_paths"], [f"a{i}.txt"])
+        cat_spawns = [c for c in popen.call_args_list if "cat-file" in c.args[0]]
+        self.assertEqual(len(cat_spawns), 1)
+
+    def test_daemon_tears_down_plumbing_when_the_loop_raises(self) -> None:
+        paths = MemoryPaths(
+            root=self.repo_b,
+            markdown_root=self.repo_b / "data" / "markdown",
+            jsonl_root=self.repo_b / "data" / "jsonl",
+            sqlite_path=self.repo_b / "data" / "omnimem.db",
+        )
+        with (
+            patch("omnimem.daemon.run_sync_with_retry", side_effect=RuntimeError("boom")),
+            patch.object(_ContentWatcher, "stop", autospec=True) as stop,
+        ):
+            with self.assertRaises(RuntimeError):
+                run_sync_daemon(paths=paths, schema_sql_path=self.schema, remote_name="origin", branch="main", remote_url=None, once=True)
+        stop.assert_called_once()
+        self.assertNotIn(str(paths.root), _SHARED_GIT_CAT_FILES)
+
+    def _stage_pull_and_push(self) -> MemoryPaths:
+        """Leave repo-b one remote events file behind and one local markdown file ahead."""
+        (self.repo_a / "seed.txt").write_text("seed\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_a)
+        _git("commit", "-m", "seed", cwd=self.repo_a)
+        _git("push", "-u", "origin", "main", cwd=self.repo_a)
+        _git("fetch", "origin", "main", cwd=self.repo_b)
+        _git("reset", "--hard", "origin/main", cwd=self.repo_b)
+        local_md = self.repo_b / "data" / "markdown" / "short" / "local.md"
+        local_md.parent.mkdir(parents=True, exist_ok=True)
+        local_md.write_text("# local\n", encoding="utf-8")
+        # The pull brings an events file, so the daemon's reindex has work to do (and logs it).
+        remote_events = self.repo_a / "data" / "jsonl" / "events-2026-01.jsonl"
+        remote_events.parent.mkdir(parents=True, exist_ok=True)
+        evt = {"event_id": "remote-evt", "event_type": "memory.update", "event_time": "2026-01-01T00:00:00+00:00", "memory_id": "system000", "payload": {}}
+        remote_events.write_text(json.dumps(evt) + "\n", encoding="utf-8")
+        _git("add", "-A", cwd=self.repo_a)
+        _git("commit", "-m", "remote-events", cwd=self.repo_a)
+        _git("push", "origin", "main", cwd=self.repo_a)
+        return MemoryPaths(
+            root=self.repo_b,
+            markdown_root=self.repo_b / "data" / "markdown",
+            jsonl_root=self.repo_b / "data" / "jsonl",
+            sqlite_path=self.repo_b / "data" / "omnimem.db",
+        )
+
+    def test_daemon_once_pulls_reindexes_and_pushes(self) -> None:
+        paths = self._stage_pull_and_push()
+        out = run_sync_daemon(
+            paths=paths,
+            schema_sql_path=self.schema,
+            remote_name="origin",
+            branch="main",
+            remote_url=None,
+            scan_interval=1,
+            weave_enabled=False,
+            maintenance_enabled=False,
+            once=True,
+        )
+        self.assertTrue(out["ok"], out)
+        self.assertTrue(out["last_pull"].get("ok"))
+        self.assertTrue(out["last_reindex"].get("ok"))
+        self.assertTrue(out["last_push"].get("ok"))
+        remote_files = _git("ls-tree", "-r", "--name-only", "main", cwd=self.remote).stdout.splitlines()
+        self.assertIn("data/markdown/short/local.md", remote_files)
+        # The reindex overlaps the push, so its event stays out of JSONL instead of landing after the commit.
+        self.assertEqual(_git("status", "--porcelain", "--", "data/jsonl", cwd=self.repo_b).stdout, "")
+        jsonl = "".join(fp.read_text(encoding="utf-8") for fp in paths.jsonl_root.glob("events-*.jsonl"))
+        self.assertNotIn('"action": "reindex"', jsonl)
+
+    def test_overlapped_reindex_finishes_while_push_holds_the_repo_lock(self) -> None:
+        paths = self._stage_pull_and_push()
+        reindexed = threading.Event()
+        waits: list[bool] = []
+
+        def reindex(*args: object, **kwargs: object) -> dict[str, object]:
+            out = reindex_from_jsonl_partial(*args, **kwargs)
+            reindexed.set()
+            return out
+
+        def slow_push(paths: MemoryPaths, schema_sql_path: Path, mode: str, **kwargs: object) -> dict[str, object]:
+            if mode != "github-push":
+                return sync_git(paths, schema_sql_path, mode, **kwargs)
+            # Like a slow push: hold the repo lock until the overlapped reindex is done with it.
+            with repo_lock(paths.root):
+                waits.append(reindexed.wait(5.0))
+                return sync_git(paths, schema_sql_path, mode, **kwargs)
+
+        with (
+            patch("omnimem.daemon.reindex_from_jsonl_partial", side_effect=reindex),
+            patch("omnimem.daemon.sync_git", side_effect=slow_push),
+        ):
+            out = run_sync_daemon(
+                paths=paths,
+                schema_sql_path=self.schema,
+                remote_name="origin",
+                branch="main",
+                remote_url=None,
+                scan_interval=1,
+                weave_enabled=False,
+                maintenance_enabled=False,
+                once=True,
+            )
+        self.assertEqual(waits, [True])
+        self.assertTrue(out["last_reindex"].get("ok"), out)
+        self.assertTrue(out["last_push"].get("ok"), out)
+        self.assertEqual(out["reindex_failures"], 0)
+        with sqlite3.connect(paths.sqlite_path) as conn:
+            logged = conn.execute(
+                "SELECT COUNT(*) FROM memory_events WHERE json_extract(payload_json, '$.action') = 'reindex'"
+            ).fetchone()[0]
+        self.assertEqual(logged, 1)
+
 
 if __name__ == "__main__":
     unittest.main()